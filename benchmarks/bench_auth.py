@@ -0,0 +1,71 @@
+"""
+Auth overhead per request, with and without the verified-JWT cache.
+
+Calls require_authentication() directly, so the numbers are the
+dependency's own cost without HTTP or routing. Run from the repository
+root:
+
+    python -m benchmarks.bench_auth
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt
+
+from omnibridge.auth import dependencies
+from omnibridge.auth.config import JWT_ALGORITHM, JWT_SECRET_KEY
+
+
+def issue(user_id: str) -> str:
+    payload = {
+        "user_id": user_id,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def per_call_us(headers: list[str], rounds: int, cached: bool) -> float:
+    cache = dependencies.verified_tokens
+    cache.clear()
+    get, put = cache.get, cache.put
+
+    if not cached:
+        cache.get = lambda token: None
+        cache.put = lambda token, payload: None
+
+    try:
+        # Warm the cache (no-op when disabled)
+        for header in headers:
+            dependencies.require_authentication(header)
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for header in headers:
+                dependencies.require_authentication(header)
+        elapsed = time.perf_counter() - started
+    finally:
+        cache.get, cache.put = get, put
+
+    return elapsed / (rounds * len(headers)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    headers = [f"Bearer {issue(f'user{i}@example.com')}" for i in range(args.users)]
+
+    uncached = per_call_us(headers, args.rounds, cached=False)
+    cached = per_call_us(headers, args.rounds, cached=True)
+
+    print(f"jose.jwt.decode every request: {uncached:8.2f} µs/request")
+    print(f"verified-token cache hit:      {cached:8.2f} µs/request")
+    print(f"speedup:                       {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
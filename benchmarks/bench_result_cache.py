@@ -0,0 +1,87 @@
+"""
+Result cache benchmark: per-process cache vs. the shared SQLite tier.
+
+Fills one worker's cache with Gmail-sized snapshots, then measures
+lookups as every other worker on the node would see them: a local hit,
+a read-through from the shared tier, and a miss. Also reports how much
+the compact encoding saves. Run from the repository root:
+
+    python -m benchmarks.bench_result_cache
+    python -m benchmarks.bench_result_cache --users 1000 --messages 50
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from omnibridge.core.result_cache import ResultCache, SqliteResultStore, encode_results
+
+
+def snapshot(user: int, messages: int) -> list[dict]:
+    return [
+        {
+            "id": f"{user:04x}{i:012x}",
+            "source": "gmail",
+            "from": f"Sender {i} <sender{i}@example.com>",
+            "to": [f"user{user}@example.com"],
+            "subject": f"Quarterly report {i}",
+            "snippet": "Please find attached the figures we discussed on Monday",
+            "timestamp": "2024-01-15T12:34:56+00:00",
+        }
+        for i in range(messages)
+    ]
+
+
+def make_cache(shared=None, local_ttl: float = 5.0) -> ResultCache:
+    return ResultCache(
+        ttls={}, default_ttl=300.0, max_entries=100000,
+        shared=shared, local_ttl=local_ttl,
+    )
+
+
+def per_get_us(cache: ResultCache, users: int) -> float:
+    started = time.perf_counter()
+    for user in range(users):
+        cache.get(f"user{user}", None, "gmail")
+    return (time.perf_counter() - started) / users * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshots = [snapshot(user, args.messages) for user in range(args.users)]
+
+    plain = sum(len(json.dumps(s).encode()) for s in snapshots) / args.users
+    encoded = sum(len(encode_results(s)) for s in snapshots) / args.users
+    print(f"snapshot size: {plain:.0f} B as JSON, {encoded:.0f} B encoded")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        writer = make_cache(SqliteResultStore(path, max_entries=100000))
+
+        started = time.perf_counter()
+        for user, results in enumerate(snapshots):
+            writer.put(f"user{user}", None, "gmail", results)
+        put_us = (time.perf_counter() - started) / args.users * 1e6
+
+        # Another worker: first lookups read through, repeats hit locally
+        reader = make_cache(SqliteResultStore(path, max_entries=100000))
+        shared_us = per_get_us(reader, args.users)
+        local_us = per_get_us(reader, args.users)
+
+        memory = make_cache()
+        miss_us = per_get_us(memory, args.users)
+
+    print(f"put (local + shared):  {put_us:8.1f} us")
+    print(f"get, shared tier hit:  {shared_us:8.1f} us")
+    print(f"get, local tier hit:   {local_us:8.1f} us")
+    print(f"get, miss (memory):    {miss_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Search index benchmark: build time and query latency by corpus size.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search_index
+    python -m benchmarks.bench_search_index --sizes 10000 100000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from omnibridge.core.search_index import UserIndex
+
+WORDS = [
+    "invoice", "meeting", "report", "project", "lunch", "budget", "review",
+    "deadline", "contract", "update", "schedule", "launch", "design",
+    "release", "customer", "payment", "travel", "offer", "summary", "notes",
+]
+
+
+def make_records(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    # A long tail of rare words keeps posting lists realistic
+    vocabulary = WORDS + [f"term{i}" for i in range(5000)]
+
+    return [
+        {
+            "id": f"msg-{i}",
+            "source": "gmail",
+            "from": f"sender{rng.randrange(2000)}@example.com",
+            "to": ["user@example.com"],
+            "subject": " ".join(rng.choices(vocabulary, k=5)),
+            "snippet": " ".join(rng.choices(vocabulary, k=20)),
+            "timestamp": f"2024-01-01T00:00:{i % 60:02d}+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def bench(size: int, queries: int) -> dict:
+    records = make_records(size)
+
+    index = UserIndex()
+    started = time.perf_counter()
+    for record in records:
+        index.add(record)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(1)
+    latencies_us = []
+    for _ in range(queries):
+        query = " ".join(rng.choices(WORDS, k=rng.randint(1, 2)))
+        started = time.perf_counter()
+        index.search(query, limit=50)
+        latencies_us.append((time.perf_counter() - started) * 1e6)
+
+    tail_us = []
+    for i in range(queries):
+        started = time.perf_counter()
+        index.search(f"term{i % 5000}", limit=50)
+        tail_us.append((time.perf_counter() - started) * 1e6)
+
+    return {
+        "documents": size,
+        "build_seconds": round(build_seconds, 3),
+        "common_p50_us": round(statistics.median(latencies_us), 1),
+        "common_p99_us": round(percentile(latencies_us, 0.99), 1),
+        "tail_p50_us": round(statistics.median(tail_us), 1),
+        "tail_p99_us": round(percentile(tail_us, 0.99), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'docs':>10} {'build s':>9} {'common p50':>11} {'common p99':>11}"
+        f" {'tail p50':>9} {'tail p99':>9}   (latencies in µs)"
+    )
+    for size in args.sizes:
+        row = bench(size, args.queries)
+        print(
+            f"{row['documents']:>10} {row['build_seconds']:>9}"
+            f" {row['common_p50_us']:>11} {row['common_p99_us']:>11}"
+            f" {row['tail_p50_us']:>9} {row['tail_p99_us']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Token store benchmark: read/write throughput under concurrent threads.
+
+Compares InMemoryTokenStore with SqliteTokenStore (WAL, read cache).
+Run from the repository root:
+
+    python -m benchmarks.bench_token_store
+    python -m benchmarks.bench_token_store --threads 1 4 16 --ops 5000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from omnibridge.accounts.models import Account
+from omnibridge.accounts.store import InMemoryTokenStore, SqliteTokenStore
+
+USERS = 1000
+
+
+def make_account(user: int, token: str = "access-token") -> Account:
+    return Account(
+        user_id=f"user{user}@example.com",
+        provider="google",
+        provider_account_id=f"user{user}@gmail.com",
+        access_token=token,
+        refresh_token="refresh-token",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        scopes=["gmail.readonly"],
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def run(store, threads: int, ops: int, write_ratio: float) -> float:
+    """Returns operations per second across all threads."""
+    for user in range(USERS):
+        store.save_account(make_account(user))
+
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        barrier.wait()
+        for i in range(ops):
+            user = rng.randrange(USERS)
+            if rng.random() < write_ratio:
+                store.save_account(make_account(user, token=f"t{i}"))
+            else:
+                store.get_account(f"user{user}@example.com", "google")
+
+    workers = [
+        threading.Thread(target=worker, args=(seed,)) for seed in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+
+    return threads * ops / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument(
+        "--write-ratios", type=float, nargs="+", default=[0.0, 0.05, 0.5]
+    )
+    args = parser.parse_args()
+
+    print(f"{'store':>8} {'threads':>8} {'writes':>7} {'ops/s':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for write_ratio in args.write_ratios:
+            for threads in args.threads:
+                stores = {
+                    "memory": InMemoryTokenStore(),
+                    "sqlite": SqliteTokenStore(
+                        os.path.join(tmp, f"tokens-{write_ratio}-{threads}.db")
+                    ),
+                }
+                for name, store in stores.items():
+                    rate = run(store, threads, args.ops, write_ratio)
+                    print(
+                        f"{name:>8} {threads:>8} {write_ratio:>7.0%} {rate:>12,.0f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+End-to-end load test against a local fake Gmail server.
+
+Starts tests/fake_gmail.py's FakeGmailServer with the requested latency,
+error rate and mailbox size, runs the app under uvicorn pointed at it,
+links a Google account for every simulated user and then drives each
+scenario at the given concurrency. Reports throughput and p50/p95/p99
+latency per scenario and writes everything to a JSON file so runs can be
+compared between commits.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --latency-ms 200 --error-rate 0.05 \\
+        --concurrency 64 --requests 2000 --scenarios search sources
+    python -m benchmarks.load_test --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from tests.fake_gmail import FakeGmailServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+QUERY_WORDS = ["subject", "snippet", "sender", "example", "user"]
+
+SPAN_SAMPLE = re.compile(
+    r'^omnibridge_span_duration_seconds_(sum|count)\{span="([^"]+)"\} (\S+)$'
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def start_app(port: int, gmail_url: str, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "OMNIBRIDGE_GMAIL_API_ENDPOINT": gmail_url}
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "omnibridge.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("app did not start")
+
+
+async def link_users(client: httpx.AsyncClient, count: int) -> list[str]:
+    tokens = []
+    for i in range(count):
+        response = await client.post(
+            "/auth/token", params={"email": f"load{i}@example.com"}
+        )
+        token = response.json()["access_token"]
+        await client.post(
+            "/accounts/link",
+            json={
+                "provider": "google",
+                "provider_account_id": f"load{i}@gmail.com",
+                "access_token": f"fake-access-{i}",
+                "refresh_token": f"fake-refresh-{i}",
+                "expires_in": 3600,
+                "scopes": ["gmail.readonly"],
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        tokens.append(token)
+    return tokens
+
+
+def scenario_requests(name: str, tokens: list[str], rng: random.Random):
+    """
+    Infinite stream of (method, path, params, headers) for a scenario.
+    """
+    while True:
+        i = rng.randrange(len(tokens))
+        auth = {"Authorization": f"Bearer {tokens[i]}"}
+
+        if name == "search":
+            query = f"{rng.choice(QUERY_WORDS)} {rng.randrange(100)}"
+            yield "GET", "/search", {"q": query}, auth
+        elif name == "sources":
+            yield "GET", "/sources/gmail/messages", {}, auth
+        elif name == "accounts":
+            path = rng.choice(["/accounts", "/accounts/google"])
+            yield "GET", path, {}, auth
+        elif name == "auth":
+            yield "POST", "/auth/token", {"email": f"load{i}@example.com"}, {}
+        else:
+            raise ValueError(f"Unknown scenario: {name}")
+
+
+def summarize(latencies: list[float], statuses: dict, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    # 99 cut points: index 49 is p50, 94 is p95, 98 is p99
+    cuts = (
+        statistics.quantiles(ordered, n=100, method="inclusive")
+        if len(ordered) > 1 else ordered * 99
+    )
+    total = len(latencies)
+    errors = sum(count for code, count in statuses.items() if int(code) >= 400)
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "status_codes": dict(sorted(statuses.items())),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+            "p50": round(cuts[49], 2) if ordered else 0.0,
+            "p95": round(cuts[94], 2) if ordered else 0.0,
+            "p99": round(cuts[98], 2) if ordered else 0.0,
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+        },
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    tokens: list[str],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    stream = scenario_requests(name, tokens, random.Random(seed))
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, path, params, headers = next(stream)
+
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, params=params, headers=headers
+                )
+                code = str(response.status_code)
+            except httpx.HTTPError:
+                code = "599"  # client-side failure (timeout, reset)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> tuple[dict, dict]:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        tokens = await link_users(client, args.users)
+
+        results = {}
+        for name in args.scenarios:
+            if args.warmup:
+                await run_scenario(
+                    client, name, tokens, args.warmup, args.concurrency, args.seed
+                )
+            results[name] = await run_scenario(
+                client, name, tokens, args.requests, args.concurrency, args.seed
+            )
+            print_row(name, results[name])
+
+        return results, await span_summary(client)
+
+
+async def span_summary(client: httpx.AsyncClient) -> dict:
+    """
+    Mean time per instrumented stage, scraped from /metrics (with several
+    workers this covers only the worker that answered the scrape).
+    """
+    response = await client.get("/metrics")
+    totals: dict[str, dict[str, float]] = {}
+
+    for line in response.text.splitlines():
+        match = SPAN_SAMPLE.match(line)
+        if match:
+            kind, name, value = match.groups()
+            totals.setdefault(name, {})[kind] = float(value)
+
+    return {
+        name: {
+            "count": int(total["count"]),
+            "mean_ms": round(total["sum"] / total["count"] * 1000, 3),
+        }
+        for name, total in sorted(totals.items())
+        if total.get("count")
+    }
+
+
+def print_row(name: str, result: dict) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{name:>10} {result['requests']:>8} {result['throughput_rps']:>9}"
+        f" {latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8}"
+        f" {result['error_rate']:>7}"
+    )
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path} (commit {baseline['meta']['commit']}):")
+
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+
+        def change(after: float, was: float) -> str:
+            return f"{(after - was) / was * 100:+.1f}%" if was else "n/a"
+
+        print(
+            f"{name:>10} rps {change(result['throughput_rps'], before['throughput_rps'])}"
+            f"  p50 {change(result['latency_ms']['p50'], before['latency_ms']['p50'])}"
+            f"  p95 {change(result['latency_ms']['p95'], before['latency_ms']['p95'])}"
+            f"  p99 {change(result['latency_ms']['p99'], before['latency_ms']['p99'])}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mailbox-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="per scenario")
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["auth", "accounts", "sources", "search"],
+        choices=["auth", "accounts", "sources", "search"],
+    )
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="JSON results file")
+    parser.add_argument("--compare", type=Path, help="earlier JSON results file")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Linked accounts must be visible to every worker
+        os.environ.setdefault("OMNIBRIDGE_TOKEN_STORE", "sqlite")
+
+    commit = git_commit()
+    started_at = datetime.now(timezone.utc)
+
+    fake = FakeGmailServer(
+        message_count=args.mailbox_size,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ).start()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    app = start_app(port, fake.url, args.workers)
+
+    try:
+        wait_until_ready(base_url)
+        print(
+            f"{'scenario':>10} {'requests':>8} {'req/s':>9}"
+            f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        results, spans = asyncio.run(drive(base_url, args))
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+        fake.stop()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "upstream_requests": len(fake.requests),
+        },
+        "config": {
+            "mailbox_size": args.mailbox_size,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "workers": args.workers,
+            "seed": args.seed,
+        },
+        "results": results,
+        "spans": spans,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f"load_test-{started_at:%Y%m%dT%H%M%SZ}-{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cost of the request instrumentation.
+
+Times a bare span() and Histogram.observe() call, then compares a tiny
+ASGI app called directly against the same app wrapped in
+RequestMetricsMiddleware, so the per-request overhead can be checked
+against the latencies the load test reports.
+
+    python -m benchmarks.metrics_overhead
+"""
+
+import argparse
+import asyncio
+import time
+
+from omnibridge.api.metrics import RequestMetricsMiddleware
+from omnibridge.core.metrics import Histogram, span
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - started) / iterations
+
+
+async def per_request_ns(app, iterations: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench"}
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def empty_span() -> None:
+    with span("bench"):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    histogram = Histogram("bench_seconds", "benchmark", labelnames=("label",))
+
+    observe = per_call_ns(lambda: histogram.observe(0.01, "x"), args.iterations)
+    span_cost = per_call_ns(empty_span, args.iterations)
+    bare = asyncio.run(per_request_ns(bare_app, args.iterations))
+    wrapped = asyncio.run(
+        per_request_ns(RequestMetricsMiddleware(bare_app), args.iterations)
+    )
+
+    print(f"Histogram.observe   {observe:8.0f} ns/call")
+    print(f"span()              {span_cost:8.0f} ns/call")
+    print(f"ASGI app            {bare:8.0f} ns/request")
+    print(f"ASGI app + metrics  {wrapped:8.0f} ns/request"
+          f"  (+{wrapped - bare:.0f} ns)")
+
+
+if __name__ == "__main__":
+    main()
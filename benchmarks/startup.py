@@ -0,0 +1,144 @@
+"""
+Worker cold start: import cost of the app and time to its first requests.
+
+Every measurement runs in a fresh interpreter, as a new worker would:
+
+- `python -X importtime -c "import omnibridge.main"`, reporting the total
+  and the heaviest packages, and whether any provider SDK was imported;
+- time from interpreter start to the first GET /health response, and to
+  the first /search that has to load the Gmail connector (answered by
+  tests/fake_gmail.py's FakeGmailServer).
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --top 15
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Packages that should only be imported once a connector needs them
+PROVIDER_SDKS = ("google", "googleapiclient", "httplib2")
+
+FIRST_REQUEST_SCRIPT = r"""
+import json, os, sys, time
+started = time.perf_counter()
+
+from fastapi.testclient import TestClient
+from tests.fake_gmail import FakeGmailServer
+
+with FakeGmailServer(message_count=5) as server:
+    os.environ["OMNIBRIDGE_GMAIL_API_ENDPOINT"] = server.url
+
+    from omnibridge.main import app
+    imported = time.perf_counter()
+
+    client = TestClient(app)
+    client.get("/health").raise_for_status()
+    health = time.perf_counter()
+
+    token = client.post("/auth/token", params={"email": "cold@example.com"})
+    headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+    client.post(
+        "/accounts/link",
+        json={
+            "provider": "google",
+            "provider_account_id": "cold@gmail.com",
+            "access_token": "fake",
+            "expires_in": 3600,
+        },
+        headers=headers,
+    ).raise_for_status()
+
+    search_started = time.perf_counter()
+    client.get("/search?q=subject", headers=headers).raise_for_status()
+    search = time.perf_counter()
+
+json.dump(
+    {
+        "import_s": imported - started,
+        "first_health_s": health - started,
+        "first_search_s": search - search_started,
+        "sdk_loaded": sorted(
+            name for name in sys.modules if name.split(".")[0] in %r
+        ),
+    },
+    sys.stdout,
+)
+""" % (PROVIDER_SDKS,)
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in µs per module, from -X importtime."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    ).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def first_request() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SCRIPT],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="omnibridge.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # Import profile of one run; totals are the median over all runs
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    profile = runs[0]
+    total_ms = statistics.median(run[args.module] for run in runs) / 1000
+
+    # Roll modules up to their top-level package: its outermost (largest)
+    # cumulative time includes everything it pulled in
+    packages = defaultdict(int)
+    for name, cumulative in profile.items():
+        package = name.split(".")[0]
+        packages[package] = max(packages[package], cumulative)
+
+    print(f"import {args.module}: {total_ms:.1f} ms (median of {args.runs})")
+    print("\nheaviest top-level imports (ms, cumulative):")
+    for name, cumulative in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[: args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    sdks = sorted({name.split(".")[0] for name in profile} & set(PROVIDER_SDKS))
+    print(f"\nprovider SDKs imported at startup: {', '.join(sdks) or 'none'}")
+
+    timings = [first_request() for _ in range(args.runs)]
+    print("\ncold start (ms, median):")
+    for key, label in (
+        ("import_s", "import app"),
+        ("first_health_s", "first GET /health"),
+        ("first_search_s", "first GET /search (loads connector)"),
+    ):
+        value = statistics.median(timing[key] for timing in timings) * 1000
+        print(f"  {value:8.1f}  {label}")
+    sdks = sorted({name.split(".")[0] for name in timings[0]["sdk_loaded"]})
+    print(f"provider SDKs imported after first /search: {', '.join(sdks)}")
+
+
+if __name__ == "__main__":
+    main()
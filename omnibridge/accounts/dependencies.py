@@ -1,4 +1,68 @@
-from omnibridge.accounts.store import InMemoryTokenStore
+from datetime import timedelta
+from typing import Callable, Dict
+
+from omnibridge.accounts.refresh import OAuthTokenClient, TokenRefresher
+from omnibridge.accounts.store import InMemoryTokenStore, SqliteTokenStore
+from omnibridge.core.config import (
+    GOOGLE_OAUTH_CLIENT_ID,
+    GOOGLE_OAUTH_CLIENT_SECRET,
+    GOOGLE_OAUTH_TOKEN_URI,
+    TOKEN_REFRESH_LEAD_SECONDS,
+    TOKEN_REFRESH_RETRY_SECONDS,
+    TOKEN_STORE_BACKEND,
+    TOKEN_STORE_SQLITE_PATH,
+)
+
+# Backend name -> factory; other backends can register themselves here
+TOKEN_STORE_BACKENDS: Dict[str, Callable[[], object]] = {
+    "memory": InMemoryTokenStore,
+    "sqlite": lambda: SqliteTokenStore(TOKEN_STORE_SQLITE_PATH),
+}
+
+
+def register_token_store_backend(name: str, factory: Callable[[], object]) -> None:
+    TOKEN_STORE_BACKENDS[name] = factory
+
+
+def create_token_store(backend: str = TOKEN_STORE_BACKEND):
+    try:
+        factory = TOKEN_STORE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown token store backend: {backend}")
+
+    return factory()
+
 
 # SINGLE shared token store for the whole app
-token_store = InMemoryTokenStore()
+token_store = create_token_store()
+
+# Token clients for the providers whose OAuth app is configured; accounts of
+# other providers are used as stored, without refreshing
+oauth_clients: Dict[str, OAuthTokenClient] = {}
+
+if GOOGLE_OAUTH_CLIENT_ID and GOOGLE_OAUTH_CLIENT_SECRET:
+    oauth_clients["google"] = OAuthTokenClient(
+        token_uri=GOOGLE_OAUTH_TOKEN_URI,
+        client_id=GOOGLE_OAUTH_CLIENT_ID,
+        client_secret=GOOGLE_OAUTH_CLIENT_SECRET,
+    )
+
+# Refreshes access tokens before they expire (started in the app lifespan)
+token_refresher = TokenRefresher(
+    token_store,
+    clients=oauth_clients,
+    lead_time=timedelta(seconds=TOKEN_REFRESH_LEAD_SECONDS),
+    retry_after=timedelta(seconds=TOKEN_REFRESH_RETRY_SECONDS),
+)
+
+
+def get_token_store():
+    """
+    FastAPI dependency resolving the shared token store.
+
+    Routers take the store through Depends(get_token_store) and connectors
+    are constructed with the same instance, so everything built on top of
+    it (client caches, result caches, the search index) sees one set of
+    linked accounts.
+    """
+    return token_store
@@ -0,0 +1,287 @@
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from omnibridge.accounts.models import Account
+from omnibridge.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+AccountKey = Tuple[str, str]  # (user_id, provider)
+
+
+class TokenRefreshError(Exception):
+    """
+    Raised when an access token cannot be refreshed. permanent is True
+    when the provider rejected the grant itself (revoked refresh token,
+    bad client credentials): retrying cannot help until the user relinks.
+    """
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+def _is_permanent(exc: Exception) -> bool:
+    return isinstance(exc, TokenRefreshError) and exc.permanent
+
+
+class OAuthTokenClient:
+    """
+    Refresh-token grant against one provider's OAuth token endpoint.
+    """
+
+    def __init__(
+        self,
+        token_uri: str,
+        client_id: str,
+        client_secret: str,
+        http: httpx.Client | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.token_uri = token_uri
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._http = http or httpx.Client(timeout=10.0)
+        self._clock = clock
+
+    def refresh(self, account: Account) -> Account:
+        response = self._http.post(
+            self.token_uri,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": account.refresh_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            },
+        )
+
+        if response.status_code != 200:
+            status = response.status_code
+            raise TokenRefreshError(
+                f"{account.provider} token refresh failed: {status}",
+                # invalid_grant, invalid_client, ...; 408 and 429 are transient
+                permanent=400 <= status < 500 and status not in (408, 429),
+            )
+
+        body = response.json()
+
+        return replace(
+            account,
+            access_token=body["access_token"],
+            # Providers may rotate the refresh token
+            refresh_token=body.get("refresh_token", account.refresh_token),
+            expires_at=self._clock() + timedelta(seconds=body["expires_in"]),
+        )
+
+
+class TokenRefresher:
+    """
+    Keeps linked accounts' access tokens fresh.
+
+    Accounts are queued in a heap ordered by when they need refreshing
+    (expires_at minus a lead time) and a background thread refreshes
+    them as they come due. Requests that find a token about to expire
+    call ensure_fresh(); concurrent callers for the same account share
+    one refresh through a single-flight guard.
+
+    A failed inline refresh of a token that has not expired yet is
+    logged and the current token is used; the account is then not tried
+    inline again for retry_after. Only an expired token raises.
+    """
+
+    def __init__(
+        self,
+        token_store,
+        clients: Dict[str, OAuthTokenClient],
+        lead_time: timedelta = timedelta(minutes=5),
+        retry_after: timedelta = timedelta(minutes=1),
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.token_store = token_store
+        self.clients = clients
+        self.lead_time = lead_time
+        self.retry_after = retry_after
+        self._clock = clock
+
+        # (refresh_at, sequence, key)
+        self._heap: List[Tuple[datetime, int, AccountKey]] = []
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._flights = SingleFlight()
+        # Accounts whose inline refresh failed -> when to try again
+        self._backoff: Dict[AccountKey, datetime] = {}
+
+        token_store.subscribe(self._on_account_saved)
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def ensure_fresh(self, account: Account) -> Account:
+        if not self._needs_refresh(account):
+            return account
+
+        key = (account.user_id, account.provider)
+        now = self._clock()
+        expired = account.expires_at <= now
+
+        retry_at = self._backoff.get(key)
+        if retry_at is not None and now < retry_at and not expired:
+            return account
+
+        try:
+            return self._flights.do(key, lambda: self._refresh(key))
+        except Exception as exc:
+            if expired:
+                raise
+
+            # Still valid for a while: use it, retry in the background
+            logger.warning(
+                "Token refresh failed for %s, using current token", key,
+                exc_info=True,
+            )
+            self._backoff[key] = now + self.retry_after
+            if not _is_permanent(exc):
+                self.schedule(account, at=now + self.retry_after)
+            return account
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def schedule(self, account: Account, at: datetime | None = None) -> None:
+        if not account.refresh_token or account.provider not in self.clients:
+            return
+
+        refresh_at = at or account.expires_at - self.lead_time
+        key = (account.user_id, account.provider)
+
+        with self._wakeup:
+            heapq.heappush(self._heap, (refresh_at, next(self._sequence), key))
+            self._wakeup.notify()
+
+    def next_due(self) -> datetime | None:
+        with self._wakeup:
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self) -> int:
+        """
+        Refresh every account whose refresh time has passed.
+        Returns the number of accounts refreshed.
+        """
+        refreshed = 0
+
+        for key in self._pop_due():
+            account = self.token_store.get_account(*key)
+
+            # Superseded entry: the account was saved again since
+            if account is None or not self._needs_refresh(account):
+                continue
+
+            try:
+                self._flights.do(key, lambda key=key: self._refresh(key))
+                refreshed += 1
+            except Exception as exc:
+                logger.exception("Background token refresh failed for %s", key)
+                # A rejected grant stays rejected until the account is relinked
+                # (saving it schedules it again)
+                if not _is_permanent(exc):
+                    self.schedule(account, at=self._clock() + self.retry_after)
+
+        return refreshed
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        # Accounts saved before a restart only reach us through the store
+        list_all = getattr(self.token_store, "list_all", None)
+        if list_all is not None:
+            for account in list_all():
+                self.schedule(account)
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="token-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _needs_refresh(self, account: Account) -> bool:
+        return account.expires_at - self.lead_time <= self._clock()
+
+    def _refresh(self, key: AccountKey) -> Account:
+        # Another caller (or worker) may have refreshed it already
+        account = self.token_store.get_account(*key)
+
+        if account is None:
+            raise TokenRefreshError(f"No linked {key[1]} account for {key[0]}")
+
+        if not self._needs_refresh(account) or not account.refresh_token:
+            return account
+
+        client = self.clients.get(account.provider)
+        if client is None:
+            return account
+
+        refreshed = client.refresh(account)
+        self.token_store.save_account(refreshed)
+        self._backoff.pop(key, None)
+        return refreshed
+
+    def _on_account_saved(
+        self,
+        previous: Optional[Account],
+        account: Account,
+    ) -> None:
+        self.schedule(account)
+
+    def _pop_due(self) -> List[AccountKey]:
+        now = self._clock()
+        due: List[AccountKey] = []
+
+        with self._wakeup:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, key = heapq.heappop(self._heap)
+                if key not in due:
+                    due.append(key)
+
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+
+                if self._heap:
+                    delay = (self._heap[0][0] - self._clock()).total_seconds()
+                else:
+                    delay = None
+
+                if delay is None or delay > 0:
+                    self._wakeup.wait(timeout=delay)
+                    continue
+
+            self.run_due()
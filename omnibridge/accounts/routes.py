@@ -3,7 +3,7 @@ from datetime import datetime, timedelta, timezone
 
 from omnibridge.auth.dependencies import require_authentication
 from omnibridge.accounts.models import Account
-from omnibridge.accounts.dependencies import token_store  # ✅ SHARED STORE
+from omnibridge.accounts.dependencies import get_token_store  # ✅ SHARED STORE
 
 router = APIRouter(prefix="/accounts")
 
@@ -12,6 +12,7 @@ router = APIRouter(prefix="/accounts")
 def link_account(
     data: dict,
     payload: dict = Depends(require_authentication),
+    token_store=Depends(get_token_store),
 ):
     user_id = payload["user_id"]
 
@@ -38,6 +39,7 @@ def link_account(
 @router.get("")
 def list_accounts(
     payload: dict = Depends(require_authentication),
+    token_store=Depends(get_token_store),
 ):
     user_id = payload["user_id"]
 
@@ -59,6 +61,7 @@ def list_accounts(
 def get_account(
     provider: str,
     payload: dict = Depends(require_authentication),
+    token_store=Depends(get_token_store),
 ):
     user_id = payload["user_id"]
 
@@ -1,5 +1,13 @@
-from typing import Dict, List, Optional
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 from omnibridge.accounts.models import Account
+from omnibridge.core.metrics import span
+
+# Called as listener(previous, account) whenever an account is saved
+AccountListener = Callable[[Optional[Account], Account], None]
 
 
 class InMemoryTokenStore:
@@ -7,15 +15,258 @@ class InMemoryTokenStore:
         # Structure:
         # { user_id: { provider: Account } }
         self._store: Dict[str, Dict[str, Account]] = {}
+        # (provider, provider_account_id) -> user_ids that linked it
+        self._linked_by: Dict[Tuple[str, str], set] = {}
+        self._listeners: List[AccountListener] = []
+
+    def subscribe(self, listener: AccountListener) -> None:
+        self._listeners.append(listener)
 
     def save_account(self, account: Account) -> None:
-        if account.user_id not in self._store:
-            self._store[account.user_id] = {}
+        with span("token_store.save_account"):
+            if account.user_id not in self._store:
+                self._store[account.user_id] = {}
+
+            previous = self._store[account.user_id].get(account.provider)
+            self._store[account.user_id][account.provider] = account
 
-        self._store[account.user_id][account.provider] = account
+            if previous is not None:
+                self._linked_by.get(
+                    (previous.provider, previous.provider_account_id), set()
+                ).discard(previous.user_id)
+            self._linked_by.setdefault(
+                (account.provider, account.provider_account_id), set()
+            ).add(account.user_id)
+
+        for listener in self._listeners:
+            listener(previous, account)
 
     def get_account(self, user_id: str, provider: str) -> Optional[Account]:
-        return self._store.get(user_id, {}).get(provider)
+        with span("token_store.get_account"):
+            return self._store.get(user_id, {}).get(provider)
 
     def list_accounts(self, user_id: str) -> List[Account]:
-        return list(self._store.get(user_id, {}).values())
+        with span("token_store.list_accounts"):
+            return list(self._store.get(user_id, {}).values())
+
+    def list_all(self) -> List[Account]:
+        """Every linked account, for all users."""
+        with span("token_store.list_all"):
+            return [
+                account
+                for accounts in self._store.values()
+                for account in accounts.values()
+            ]
+
+    def find_accounts(self, provider: str, provider_account_id: str) -> List[Account]:
+        """Accounts of every user who linked this provider identity."""
+        with span("token_store.find_accounts"):
+            user_ids = self._linked_by.get((provider, provider_account_id), ())
+            return [self._store[user_id][provider] for user_id in sorted(user_ids)]
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    user_id             TEXT NOT NULL,
+    provider            TEXT NOT NULL,
+    provider_account_id TEXT NOT NULL,
+    access_token        TEXT NOT NULL,
+    refresh_token       TEXT,
+    expires_at          TEXT NOT NULL,
+    scopes              TEXT NOT NULL,
+    created_at          TEXT NOT NULL,
+    PRIMARY KEY (user_id, provider)
+) WITHOUT ROWID
+"""
+
+# Push notifications name the mailbox, not the user
+PROVIDER_ACCOUNT_INDEX = """
+CREATE INDEX IF NOT EXISTS accounts_by_provider_account
+ON accounts (provider, provider_account_id)
+"""
+
+COLUMNS = (
+    "user_id, provider, provider_account_id, access_token, "
+    "refresh_token, expires_at, scopes, created_at"
+)
+
+SELECT_ACCOUNT = (
+    f"SELECT {COLUMNS} FROM accounts WHERE user_id = ? AND provider = ?"
+)
+SELECT_USER_ACCOUNTS = f"SELECT {COLUMNS} FROM accounts WHERE user_id = ?"
+SELECT_ALL_ACCOUNTS = f"SELECT {COLUMNS} FROM accounts"
+SELECT_PROVIDER_ACCOUNTS = (
+    f"SELECT {COLUMNS} FROM accounts "
+    "WHERE provider = ? AND provider_account_id = ? ORDER BY user_id"
+)
+UPSERT_ACCOUNT = f"""
+INSERT INTO accounts ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id, provider) DO UPDATE SET
+    provider_account_id = excluded.provider_account_id,
+    access_token        = excluded.access_token,
+    refresh_token       = excluded.refresh_token,
+    expires_at          = excluded.expires_at,
+    scopes              = excluded.scopes,
+    created_at          = excluded.created_at
+"""
+
+
+def _account_to_row(account: Account) -> Tuple:
+    return (
+        account.user_id,
+        account.provider,
+        account.provider_account_id,
+        account.access_token,
+        account.refresh_token,
+        account.expires_at.isoformat(),
+        json.dumps(account.scopes),
+        account.created_at.isoformat(),
+    )
+
+
+def _row_to_account(row: Tuple) -> Account:
+    return Account(
+        user_id=row[0],
+        provider=row[1],
+        provider_account_id=row[2],
+        access_token=row[3],
+        refresh_token=row[4],
+        expires_at=datetime.fromisoformat(row[5]),
+        scopes=json.loads(row[6]),
+        created_at=datetime.fromisoformat(row[7]),
+    )
+
+
+class SqliteTokenStore:
+    """
+    Token store backed by a SQLite database in WAL mode.
+
+    Several worker processes can open the same file: WAL lets readers
+    proceed while one writer commits. Each thread gets its own
+    connection (sqlite3 caches the prepared statements per connection).
+
+    Reads go through a small in-process cache. It is dropped whenever
+    `PRAGMA data_version` reports a commit from another connection, so
+    a token saved by one worker is seen by the others on their next read.
+    Subscribers are only notified of saves made through this instance.
+    """
+
+    def __init__(self, path: str, cache_size: int = 1024):
+        self.path = path
+        self._cache_size = cache_size
+        self._cache: Dict[Tuple[str, str], Account] = {}
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        self._local = threading.local()
+        self._listeners: List[AccountListener] = []
+
+        with self._connection() as conn:
+            conn.execute(SCHEMA)
+            conn.execute(PROVIDER_ACCOUNT_INDEX)
+
+    def subscribe(self, listener: AccountListener) -> None:
+        self._listeners.append(listener)
+
+    def save_account(self, account: Account) -> None:
+        conn = self._connection()
+
+        with span("token_store.save_account"), conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                SELECT_ACCOUNT, (account.user_id, account.provider)
+            ).fetchone()
+            conn.execute(UPSERT_ACCOUNT, _account_to_row(account))
+
+        # Our own commit does not bump data_version on this connection
+        self._invalidate()
+
+        previous = _row_to_account(row) if row else None
+        for listener in self._listeners:
+            listener(previous, account)
+
+    def get_account(self, user_id: str, provider: str) -> Optional[Account]:
+        with span("token_store.get_account"):
+            return self._get_account(user_id, provider)
+
+    def list_accounts(self, user_id: str) -> List[Account]:
+        with span("token_store.list_accounts"):
+            rows = self._connection().execute(SELECT_USER_ACCOUNTS, (user_id,))
+            return [_row_to_account(row) for row in rows]
+
+    def list_all(self) -> List[Account]:
+        """Every linked account, for all users."""
+        with span("token_store.list_all"):
+            rows = self._connection().execute(SELECT_ALL_ACCOUNTS)
+            return [_row_to_account(row) for row in rows]
+
+    def find_accounts(self, provider: str, provider_account_id: str) -> List[Account]:
+        """Accounts of every user who linked this provider identity."""
+        with span("token_store.find_accounts"):
+            rows = self._connection().execute(
+                SELECT_PROVIDER_ACCOUNTS, (provider, provider_account_id)
+            )
+            return [_row_to_account(row) for row in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _get_account(self, user_id: str, provider: str) -> Optional[Account]:
+        conn = self._connection()
+        self._check_external_writes(conn)
+
+        key = (user_id, provider)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            generation = self._generation
+
+        if cached is not None:
+            return cached
+
+        row = conn.execute(SELECT_ACCOUNT, key).fetchone()
+        if row is None:
+            return None
+
+        account = _row_to_account(row)
+
+        with self._cache_lock:
+            # Skip if a write landed while we were reading
+            if generation == self._generation:
+                if len(self._cache) >= self._cache_size:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = account
+
+        return account
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,
+                cached_statements=64,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.data_version = None
+
+        return conn
+
+    def _check_external_writes(self, conn: sqlite3.Connection) -> None:
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+
+        # A new connection has no baseline yet, so it invalidates too
+        if version != self._local.data_version:
+            self._invalidate()
+            self._local.data_version = version
+
+    def _invalidate(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+            self._generation += 1
@@ -0,0 +1,74 @@
+import math
+import time
+from typing import AsyncIterator, Callable
+
+from fastapi import Depends, Header, HTTPException, status
+
+from omnibridge.auth.dependencies import require_authentication
+from omnibridge.core.admission import AdmissionController, AdmissionRejected, Deadline
+from omnibridge.core.config import (
+    ADMISSION_DEFAULT_TIMEOUT_SECONDS,
+    ADMISSION_LIMITS,
+    ADMISSION_MAX_PER_USER,
+    ADMISSION_MAX_TIMEOUT_SECONDS,
+)
+
+# Client's remaining patience for the request, in seconds
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+# One controller per admission-controlled route
+admission_controllers = {
+    route: AdmissionController(route, max_per_user=ADMISSION_MAX_PER_USER, **limits)
+    for route, limits in ADMISSION_LIMITS.items()
+}
+
+
+def request_timeout(value: str | None) -> float:
+    try:
+        timeout = float(value) if value else ADMISSION_DEFAULT_TIMEOUT_SECONDS
+    except ValueError:
+        timeout = ADMISSION_DEFAULT_TIMEOUT_SECONDS
+
+    if not math.isfinite(timeout):
+        timeout = ADMISSION_DEFAULT_TIMEOUT_SECONDS
+
+    return min(max(timeout, 0.0), ADMISSION_MAX_TIMEOUT_SECONDS)
+
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After value: whole seconds, at least 1."""
+    if not math.isfinite(seconds):
+        return "1"
+    return str(max(1, math.ceil(seconds)))
+
+
+def admit(route: str) -> Callable[..., AsyncIterator[Deadline]]:
+    """
+    FastAPI dependency holding one of the route's admission slots for the
+    whole request (streamed responses included). Resolves to the
+    request's Deadline, or answers 503 + Retry-After if it is shed.
+    """
+    async def admission(
+        payload: dict = Depends(require_authentication),
+        timeout: str | None = Header(default=None, alias=REQUEST_TIMEOUT_HEADER),
+    ) -> AsyncIterator[Deadline]:
+        controller = admission_controllers[route]
+        user_id = payload["user_id"]
+        deadline = Deadline(request_timeout(timeout))
+
+        try:
+            await controller.acquire(user_id, deadline)
+        except AdmissionRejected as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": retry_after_header(exc.retry_after)},
+            )
+
+        admitted_at = time.monotonic()
+        try:
+            yield deadline
+        finally:
+            controller.release(user_id, time.monotonic() - admitted_at)
+
+    return admission
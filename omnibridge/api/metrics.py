@@ -0,0 +1,299 @@
+import time
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from omnibridge.api import search
+from omnibridge.api.admission import admission_controllers
+from omnibridge.auth.dependencies import verified_tokens
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connector_bridge,
+    connectors,
+    fetch_flights,
+    http_transport,
+    rate_limiter,
+)
+from omnibridge.core.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from omnibridge.core.metrics import MetricFamily, registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+REQUEST_SECONDS = registry.histogram(
+    "omnibridge_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    labelnames=("method", "route", "status"),
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording every HTTP request's latency by
+    method, route template (not the raw path, to keep label counts
+    bounded) and status code. Requests that match no route are
+    recorded as route "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def collect_http_pool() -> List[MetricFamily]:
+    connections = MetricFamily(
+        "omnibridge_http_pool_connections",
+        "gauge",
+        "Provider connections in the shared HTTP transport.",
+    )
+    requests = MetricFamily(
+        "omnibridge_http_pool_requests_total",
+        "counter",
+        "Requests sent through the shared HTTP transport.",
+    )
+    waits = MetricFamily(
+        "omnibridge_http_pool_wait_seconds_total",
+        "counter",
+        "Time requests spent waiting for a free pooled connection.",
+    )
+
+    for host, stats in http_transport.stats().items():
+        for state in ("open", "idle", "in_use"):
+            connections.add(stats[state], host=host, state=state)
+        requests.add(stats["requests"], host=host)
+        waits.add(stats["wait_seconds"], host=host)
+
+    return [connections, requests, waits]
+
+
+def collect_rate_limiter() -> List[MetricFamily]:
+    stats = rate_limiter.stats()
+
+    buckets = MetricFamily(
+        "omnibridge_rate_limit_buckets",
+        "gauge",
+        "Token buckets tracked, and how many are paused by a backoff.",
+    )
+    buckets.add(stats["buckets"], state="tracked")
+    buckets.add(stats["blocked_buckets"], state="blocked")
+
+    families = [buckets]
+    for name, help in (
+        ("acquired", "Provider calls admitted by the rate limiter."),
+        ("queued", "Admitted calls that had to wait for tokens."),
+        ("wait_seconds", "Time admitted calls waited for tokens."),
+        ("rejected", "Calls refused because the wait exceeded the limit."),
+        ("backoffs", "Backoffs applied after provider rate-limit responses."),
+    ):
+        family = MetricFamily(f"omnibridge_rate_limit_{name}_total", "counter", help)
+        for provider, provider_stats in stats["providers"].items():
+            family.add(provider_stats[name], provider=provider)
+        families.append(family)
+
+    return families
+
+
+def collect_circuit_breakers() -> List[MetricFamily]:
+    state = MetricFamily(
+        "omnibridge_circuit_state",
+        "gauge",
+        "1 for the current state of each provider's circuit breaker.",
+    )
+    rejected = MetricFamily(
+        "omnibridge_circuit_rejected_total",
+        "counter",
+        "Calls rejected by an open circuit.",
+    )
+    opened = MetricFamily(
+        "omnibridge_circuit_opened_total",
+        "counter",
+        "Times the circuit opened.",
+    )
+
+    for provider, stats in circuit_breakers.stats().items():
+        for name in (STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN):
+            state.add(int(stats["state"] == name), provider=provider, state=name)
+        rejected.add(stats["rejected"], provider=provider)
+        opened.add(stats["opened"], provider=provider)
+
+    return [state, rejected, opened]
+
+
+def collect_coalescing() -> List[MetricFamily]:
+    calls = MetricFamily(
+        "omnibridge_fetch_calls_total",
+        "counter",
+        "Connector fetches requested, before coalescing.",
+    )
+    executions = MetricFamily(
+        "omnibridge_fetch_executions_total",
+        "counter",
+        "Connector fetches actually sent upstream.",
+    )
+    in_flight = MetricFamily(
+        "omnibridge_fetch_in_flight",
+        "gauge",
+        "Distinct connector fetches currently in flight.",
+    )
+
+    for provider, stats in fetch_flights.stats().items():
+        calls.add(stats["calls"], provider=provider)
+        executions.add(stats["executions"], provider=provider)
+        in_flight.add(stats["in_flight"], provider=provider)
+
+    return [calls, executions, in_flight]
+
+
+def collect_bridge() -> List[MetricFamily]:
+    stats = connector_bridge.stats()
+
+    threads = MetricFamily(
+        "omnibridge_connector_bridge_calls",
+        "gauge",
+        "Sync connector calls running on, or queued for, the bridge pool.",
+    )
+    threads.add(stats["active"], state="active")
+    threads.add(stats["queued"], state="queued")
+
+    workers = MetricFamily(
+        "omnibridge_connector_bridge_max_workers",
+        "gauge",
+        "Size of the bridge thread pool.",
+    )
+    workers.add(stats["max_workers"])
+
+    completed = MetricFamily(
+        "omnibridge_connector_bridge_completed_total",
+        "counter",
+        "Sync connector calls completed on the bridge pool.",
+    )
+    completed.add(stats["completed"])
+
+    return [threads, workers, completed]
+
+
+def collect_admission() -> List[MetricFamily]:
+    in_flight = MetricFamily(
+        "omnibridge_admission_in_flight",
+        "gauge",
+        "Admitted requests running, per route.",
+    )
+    queued = MetricFamily(
+        "omnibridge_admission_queue_depth",
+        "gauge",
+        "Requests waiting for an admission slot, per route.",
+    )
+    admitted = MetricFamily(
+        "omnibridge_admission_admitted_total",
+        "counter",
+        "Requests admitted, per route.",
+    )
+    shed = MetricFamily(
+        "omnibridge_admission_shed_total",
+        "counter",
+        "Requests answered 503 by admission control, by route and reason.",
+    )
+
+    for route, controller in admission_controllers.items():
+        stats = controller.stats()
+        in_flight.add(stats["active"], route=route)
+        queued.add(stats["queued"], route=route)
+        admitted.add(stats["admitted"], route=route)
+        for reason, count in stats["shed"].items():
+            shed.add(count, route=route, reason=reason)
+
+    return [in_flight, queued, admitted, shed]
+
+
+def collect_prefetch() -> List[MetricFamily]:
+    stats = search.prefetcher.stats()
+
+    users = MetricFamily(
+        "omnibridge_prefetch_tracked_users",
+        "gauge",
+        "Recently active users the prefetcher ranks.",
+    )
+    users.add(stats["tracked_users"])
+
+    fetches = MetricFamily(
+        "omnibridge_prefetch_fetches_total",
+        "counter",
+        "Background source fetches, and those deferred by the budget.",
+    )
+    for result in ("warmed", "failed", "deferred"):
+        fetches.add(stats[result], result=result)
+
+    return [users, fetches]
+
+
+def collect_caches() -> List[MetricFamily]:
+    caches = {
+        "jwt": verified_tokens.stats(),
+        "search_results": search.result_cache.stats(),
+    }
+    for name, connector in connectors.loaded().items():
+        services = getattr(connector, "services", None)
+        if services is not None:
+            caches[f"{name}_clients"] = services.stats()
+
+    size = MetricFamily(
+        "omnibridge_cache_entries", "gauge", "Entries held by each cache."
+    )
+    hits = MetricFamily(
+        "omnibridge_cache_hits_total", "counter", "Cache lookups that hit."
+    )
+    misses = MetricFamily(
+        "omnibridge_cache_misses_total", "counter", "Cache lookups that missed."
+    )
+
+    for cache, stats in caches.items():
+        size.add(stats["size"], cache=cache)
+        hits.add(stats["hits"], cache=cache)
+        misses.add(stats["misses"], cache=cache)
+
+    return [size, hits, misses]
+
+
+for collector in (
+    collect_http_pool,
+    collect_rate_limiter,
+    collect_circuit_breakers,
+    collect_coalescing,
+    collect_bridge,
+    collect_admission,
+    collect_prefetch,
+    collect_caches,
+):
+    registry.register(collector)
@@ -0,0 +1,126 @@
+import base64
+import hmac
+import json
+import logging
+from typing import Any, Dict, Tuple
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Response, status
+
+from omnibridge.accounts.dependencies import get_token_store  # ✅ SHARED STORE
+from omnibridge.api import search
+from omnibridge.connectors.dependencies import connector_bridge, connectors
+from omnibridge.core.config import GMAIL_PUSH_VERIFICATION_TOKEN
+from omnibridge.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/notifications")
+
+NOTIFICATIONS = registry.counter(
+    "omnibridge_gmail_notifications_total",
+    "Gmail push notifications received, by what they led to.",
+    labelnames=("result",),
+)
+
+
+def parse_push_notification(envelope: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    (emailAddress, historyId) from a Gmail notification in Pub/Sub push
+    format: {"message": {"data": base64(JSON), ...}, "subscription": ...}.
+    Raises ValueError if the envelope is malformed.
+    """
+    try:
+        data = base64.b64decode(envelope["message"]["data"], validate=True)
+        payload = json.loads(data)
+        email, history_id = payload["emailAddress"], payload["historyId"]
+        int(history_id)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Malformed Gmail push notification") from exc
+
+    return str(email), str(history_id)
+
+
+async def sync_gmail_user(user_id: str, history_id: str) -> str:
+    """
+    Apply a notification to the user's Gmail snapshot, then refresh that
+    user's search results (only them, only the gmail source). Returns
+    "synced", "failed" or "ignored" (nothing newer than what we hold).
+    """
+    connector = connectors.get("gmail")
+
+    try:
+        changed = await connector_bridge.run(
+            connector.apply_notification, user_id, history_id
+        )
+    except Exception as exc:
+        # The connector falls back to polling on its next fetch
+        logger.warning("Gmail sync for %s failed: %s", user_id, exc)
+        return "failed"
+
+    if not changed:
+        return "ignored"
+
+    snapshot = connector.cached(user_id)
+    if snapshot is not None:
+        await search.store_snapshot(user_id, "gmail", snapshot)
+    return "synced"
+
+
+@router.post("/gmail", status_code=status.HTTP_204_NO_CONTENT)
+async def gmail_notification(
+    envelope: dict,
+    token: str | None = None,
+    token_store=Depends(get_token_store),
+):
+    """
+    Pub/Sub push endpoint for Gmail watch notifications.
+
+    Every 2xx acknowledges the message, so notifications for mailboxes
+    nobody linked (or that are not newer than our snapshot) are acked
+    too; Pub/Sub only redelivers after an error status.
+    """
+    expected = GMAIL_PUSH_VERIFICATION_TOKEN
+    # Bytes: compare_digest raises TypeError on non-ASCII str
+    if not expected or not hmac.compare_digest(
+        (token or "").encode(), expected.encode()
+    ):
+        NOTIFICATIONS.inc("rejected")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid push token",
+        )
+
+    try:
+        email, history_id = parse_push_notification(envelope)
+    except ValueError as exc:
+        NOTIFICATIONS.inc("malformed")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    # The store may be backed by a database: keep the lookup off the loop
+    accounts = await connector_bridge.run(token_store.find_accounts, "google", email)
+    if not accounts:
+        NOTIFICATIONS.inc("unknown_account")
+
+    for account in accounts:
+        NOTIFICATIONS.inc(await sync_gmail_user(account.user_id, history_id))
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def include_push_routes(app: FastAPI) -> bool:
+    """
+    Mount the push endpoint, but only with a verification token set:
+    without one, anyone could make us call Gmail for any linked mailbox.
+    """
+    if not GMAIL_PUSH_VERIFICATION_TOKEN:
+        logger.warning(
+            "OMNIBRIDGE_GMAIL_PUSH_VERIFICATION_TOKEN is not set: "
+            "Gmail push notifications are disabled"
+        )
+        return False
+
+    app.include_router(router)
+    return True
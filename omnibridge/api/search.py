@@ -1,54 +1,559 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from collections import Counter
+from typing import AsyncIterator, Callable, Dict
 
-from omnibridge.auth.dependencies import require_authentication
-from omnibridge.accounts.store import InMemoryTokenStore
-from omnibridge.connectors.gmail import GmailConnector
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+
+from omnibridge.api.admission import admit
+from omnibridge.auth.dependencies import require_authentication, user_activity
+from omnibridge.accounts.dependencies import get_token_store  # ✅ SHARED STORE
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.core.config import (
+    PREFETCH_CALLS_PER_MINUTE,
+    PREFETCH_INTERVAL_SECONDS,
+    PREFETCH_MAX_CONCURRENCY,
+    PREFETCH_MAX_USERS_PER_ROUND,
+    SOURCES_DEFAULT_PAGE_SIZE,
+    SEARCH_CACHE_BACKEND,
+    SEARCH_CACHE_DEFAULT_TTL_SECONDS,
+    SEARCH_CACHE_LOCAL_TTL_SECONDS,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_SHARED_MAX_ENTRIES,
+    SEARCH_CACHE_SQLITE_PATH,
+    SEARCH_CACHE_TTL_SECONDS,
+    SEARCH_CONNECTOR_DEADLINES,
+    SEARCH_DEFAULT_DEADLINE_SECONDS,
+    SEARCH_INDEX_MAX_USERS,
+    SEARCH_RESULT_LIMIT,
+)
+from omnibridge.core.admission import Deadline
+from omnibridge.core.circuit_breaker import STATE_OPEN
+from omnibridge.core.fanout import (
+    STATUS_DEGRADED,
+    STATUS_OK,
+    fan_out,
+    fan_out_as_completed,
+    run_source,
+)
+from omnibridge.core.cursors import InvalidCursorError, decode_cursor, encode_cursor
+from omnibridge.core.prefetch import Prefetcher
+from omnibridge.core.result_cache import (
+    ResultCache,
+    SqliteResultStore,
+    normalize_query,
+)
+from omnibridge.core.search_index import SearchIndex
+from omnibridge.core.streaming import MEDIA_TYPES, encode_frame, negotiate_stream_format
 
 router = APIRouter()
 
-# Shared store (Phase 3 v1)
-token_store = InMemoryTokenStore()
+# Backend name -> shared tier behind each worker's in-process result cache
+# (None: the cache is per process); other backends can be added here
+RESULT_CACHE_BACKENDS: Dict[str, Callable[[], SqliteResultStore | None]] = {
+    "memory": lambda: None,
+    "sqlite": lambda: SqliteResultStore(
+        SEARCH_CACHE_SQLITE_PATH,
+        max_entries=SEARCH_CACHE_SHARED_MAX_ENTRIES,
+    ),
+}
 
-# Available connectors (extendable)
-gmail_connector = GmailConnector(token_store=token_store)
 
-CONNECTORS = {
-    "gmail": gmail_connector,
-    # "drive": drive_connector,  # future
-}
+def create_result_cache(backend: str = SEARCH_CACHE_BACKEND) -> ResultCache:
+    try:
+        shared = RESULT_CACHE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown result cache backend: {backend}")
+
+    return ResultCache(
+        ttls=SEARCH_CACHE_TTL_SECONDS,
+        default_ttl=SEARCH_CACHE_DEFAULT_TTL_SECONDS,
+        max_entries=SEARCH_CACHE_MAX_ENTRIES,
+        shared=shared(),
+        local_ttl=SEARCH_CACHE_LOCAL_TTL_SECONDS,
+    )
+
+
+# Latest connector snapshot per (user, source); its TTL decides freshness
+result_cache = create_result_cache()
+
+# Queries are answered from here; connectors only keep it up to date
+search_index = SearchIndex(max_users=SEARCH_INDEX_MAX_USERS)
+
+# Background refreshes in flight, one per (user_id, source)
+_refreshing: set[tuple[str, str]] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _invalidate_on_link(previous, account) -> None:
+    # Token refreshes keep the same linked identity; anything else
+    # (new link, different mailbox, changed scopes) drops cached results
+    if (
+        previous is None
+        or previous.provider_account_id != account.provider_account_id
+        or previous.scopes != account.scopes
+    ):
+        result_cache.invalidate_user(account.user_id)
+        search_index.drop_user(account.user_id)
+
+
+get_token_store().subscribe(_invalidate_on_link)
+
+
+def connector_deadline(name: str, deadline: Deadline | None = None) -> float:
+    """The source's own deadline, cut to what is left of the request's."""
+    seconds = SEARCH_CONNECTOR_DEADLINES.get(name, SEARCH_DEFAULT_DEADLINE_SECONDS)
+    if deadline is not None:
+        seconds = min(seconds, deadline.time_left())
+    return seconds
+
+
+def guarded_fetch(name: str, connector, user_id: str, **kwargs):
+    # Identical concurrent fetches share one upstream call, which goes
+    # through the source's circuit breaker; an open circuit fails fast
+    # with CircuitOpenError (reported as "degraded")
+    breaker = circuit_breakers.for_provider(name)
+
+    async def call():
+        return await fetch_flights.ado(
+            name,
+            user_id,
+            kwargs.get("query"),
+            kwargs.get("options"),
+            lambda: breaker.acall(
+                lambda: connector.afetch(user_id=user_id, **kwargs)
+            ),
+        )
+
+    return call
+
+
+def serve_stale(user_id: str, name: str, connector) -> bool:
+    """
+    Make the last known data for a degraded source searchable.
+    Returns False if there is none.
+    """
+    index = search_index.for_user(user_id)
+    if index.has_source(name):
+        return True
+
+    snapshot = connector.cached(user_id)
+    if snapshot is None:
+        return False
+
+    index.replace_source(
+        name,
+        snapshot,
+        next_page_token=getattr(snapshot, "next_page_token", None),
+    )
+    return True
+
+
+def degraded_summary(user_id: str, name: str, summary: dict) -> dict:
+    stale = serve_stale(user_id, name, connectors.get(name))
+    return {**summary, "cached": stale, "stale": stale}
+
+
+async def store_snapshot(user_id: str, source: str, results: list[dict]) -> None:
+    await result_cache.aput(user_id, None, source, results)
+    search_index.for_user(user_id).replace_source(
+        source,
+        results,
+        next_page_token=getattr(results, "next_page_token", None),
+    )
+
+
+async def refresh_source(user_id: str, source: str, connector) -> bool:
+    """
+    Fetch the source's first page into the cache and index.
+    Returns False if the fetch failed or missed its deadline.
+    """
+    outcome = await run_source(
+        source,
+        guarded_fetch(source, connector, user_id=user_id),
+        connector_deadline(source),
+    )
+    if outcome.status != STATUS_OK:
+        return False
+
+    await store_snapshot(user_id, source, outcome.results)
+    return True
+
+
+def schedule_refresh(user_id: str, source: str, connector) -> None:
+    key = (user_id, source)
+    if key in _refreshing:
+        return
+
+    _refreshing.add(key)
+
+    async def refresh() -> None:
+        try:
+            await refresh_source(user_id, source, connector)
+        finally:
+            _refreshing.discard(key)
+
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+def prefetch_targets(user_id: str) -> list[str]:
+    """
+    The user's sources worth fetching ahead of their next search: linked,
+    circuit not open, not already refreshing, and with no snapshot that
+    will still be fresh at the next prefetch round.
+    """
+    accounts = get_token_store().list_accounts(user_id)
+    providers = {account.provider for account in accounts}
+    if not providers:
+        return []
+
+    targets = []
+    for name in connectors.names():
+        if (user_id, name) in _refreshing:
+            continue
+        if circuit_breakers.for_provider(name).state == STATE_OPEN:
+            continue
+
+        remaining = result_cache.expires_in(user_id, None, name)
+        if remaining is not None and remaining > PREFETCH_INTERVAL_SECONDS:
+            continue
+
+        if connectors.get(name).provider in providers:
+            targets.append(name)
+
+    return targets
+
+
+async def prefetch_source(user_id: str, source: str) -> bool:
+    return await refresh_source(user_id, source, connectors.get(source))
+
+
+# Warms recently active users' sources (started in the app lifespan)
+prefetcher = Prefetcher(
+    user_activity,
+    targets=prefetch_targets,
+    warm=prefetch_source,
+    interval=PREFETCH_INTERVAL_SECONDS,
+    calls_per_minute=PREFETCH_CALLS_PER_MINUTE,
+    max_concurrency=PREFETCH_MAX_CONCURRENCY,
+    max_users_per_round=PREFETCH_MAX_USERS_PER_ROUND,
+)
+
+
+def select_connectors(sources: str | None) -> dict:
+    names = connectors.names()
+
+    if sources:
+        requested = {s.strip() for s in sources.split(",")}
+        names = [name for name in names if name in requested]
+
+    return {name: connectors.get(name) for name in names}
+
+
+async def plan_sources(user_id: str, selected: dict) -> tuple[dict, dict]:
+    """
+    Split the selected sources into those the index can answer now
+    (returned as statuses) and cold ones that must be fetched first.
+    """
+    index = search_index.for_user(user_id)
+    statuses: dict[str, dict] = {}
+    cold = {}
+
+    for name, connector in selected.items():
+        found = await result_cache.aget_entry(user_id, None, name)
+        breaker = circuit_breakers.for_provider(name)
+
+        if found is not None:
+            snapshot, stored_at = found
+            # Another worker may have stored a newer snapshot since ours
+            if index.indexed_at.get(name, float("-inf")) < stored_at:
+                index.replace_source(
+                    name,
+                    snapshot,
+                    now=stored_at,
+                    next_page_token=getattr(snapshot, "next_page_token", None),
+                )
+            statuses[name] = {
+                "status": STATUS_OK,
+                "elapsed_ms": 0.0,
+                "cached": True,
+            }
+        elif breaker.state == STATE_OPEN:
+            # Provider is failing: don't wait on it, serve what we have
+            statuses[name] = degraded_summary(user_id, name, {
+                "status": STATUS_DEGRADED,
+                "elapsed_ms": 0.0,
+                "retry_after": round(breaker.retry_after(), 3),
+            })
+        elif index.has_source(name):
+            # Answer from the last snapshot now, refresh it for next time
+            schedule_refresh(user_id, name, connector)
+            statuses[name] = {
+                "status": STATUS_OK,
+                "elapsed_ms": 0.0,
+                "cached": True,
+                "refreshing": True,
+            }
+        else:
+            cold[name] = connector
+
+    return statuses, cold
+
+
+def fetch_calls(user_id: str, cold: dict, deadline: Deadline | None = None) -> dict:
+    return {
+        "calls": {
+            name: guarded_fetch(name, connector, user_id=user_id)
+            for name, connector in cold.items()
+        },
+        "deadlines": {name: connector_deadline(name, deadline) for name in cold},
+    }
+
+
+def decode_search_cursor(cursor: str, user_id: str, q: str) -> dict:
+    try:
+        data = decode_cursor(cursor)
+    except InvalidCursorError:
+        data = {}
+
+    # Cursors are bound to the user and query they were issued for
+    if data.get("u") != user_id or data.get("q") != normalize_query(q):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    return data
+
+
+async def fetch_deeper_pages(
+    user_id: str,
+    page_tokens: dict[str, str],
+    deadline: Deadline | None = None,
+) -> dict[str, str]:
+    """
+    Fetch one more provider page per source into the index.
+    Returns the page tokens to continue from next time.
+    """
+    outcomes = await fan_out(
+        calls={
+            name: guarded_fetch(
+                name,
+                connectors.get(name),
+                user_id=user_id,
+                options={
+                    "page_size": SOURCES_DEFAULT_PAGE_SIZE,
+                    "page_token": token,
+                },
+            )
+            for name, token in page_tokens.items()
+            if name in connectors.names()
+        },
+        deadlines={
+            name: connector_deadline(name, deadline) for name in page_tokens
+        },
+    )
+
+    remaining = {}
+    index = search_index.for_user(user_id)
+
+    for outcome in outcomes:
+        if outcome.status != STATUS_OK:
+            # Keep the token so a later call can retry this page
+            remaining[outcome.source] = page_tokens[outcome.source]
+            continue
+
+        index.extend_source(outcome.source, outcome.results)
+
+        next_page_token = getattr(outcome.results, "next_page_token", None)
+        if next_page_token:
+            remaining[outcome.source] = next_page_token
+
+    return remaining
+
+
+def unseen_matches(
+    index,
+    q: str,
+    sources: list[str],
+    seen: set[tuple[str, str]],
+    limit: int,
+) -> list[dict]:
+    """
+    The best limit matches not returned on an earlier page. Ranks shift
+    whenever the index changes (a deeper page, a background refresh), so
+    pages skip what was already returned instead of counting an offset.
+    """
+    hits = index.search(q, sources=sources, limit=len(seen) + limit)
+    return [
+        record for record in hits
+        if (record["source"], str(record["id"])) not in seen
+    ][:limit]
+
+
+def searchable_sources(statuses: dict) -> list[str]:
+    # Healthy sources, plus degraded ones we still have stale data for
+    return [
+        name for name, summary in statuses.items()
+        if summary["status"] == STATUS_OK or summary.get("stale")
+    ]
+
+
+async def source_summary(user_id: str, outcome) -> dict:
+    """
+    Record a cold source's fetch outcome and describe it for the response.
+    """
+    if outcome.status == STATUS_OK:
+        await store_snapshot(user_id, outcome.source, outcome.results)
+    elif outcome.status == STATUS_DEGRADED:
+        return degraded_summary(user_id, outcome.source, outcome.summary())
+
+    return outcome.summary()
+
+
+async def stream_search(
+    user_id: str,
+    q: str,
+    limit: int,
+    statuses: dict,
+    cold: dict,
+    stream_format: str,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[str]:
+    """
+    Emit matches from the index right away, then each cold source's
+    matches as its fetch completes, then one summary frame.
+    """
+    counts: Counter = Counter()
+
+    def frames(sources: list[str]):
+        remaining = limit - sum(counts.values())
+        if remaining <= 0 or not sources:
+            return
+
+        index = search_index.for_user(user_id)
+        for record in index.search(q, sources=sources, limit=remaining):
+            counts[record["source"]] += 1
+            yield encode_frame(stream_format, "result", record)
+
+    for frame in frames(searchable_sources(statuses)):
+        yield frame
+
+    calls = fetch_calls(user_id, cold, deadline)
+    async for outcome in fan_out_as_completed(**calls):
+        statuses[outcome.source] = summary = await source_summary(user_id, outcome)
+
+        if outcome.status == STATUS_OK or summary.get("stale"):
+            for frame in frames([outcome.source]):
+                yield frame
+
+    for name, summary in statuses.items():
+        summary["count"] = counts.get(name, 0)
+
+    yield encode_frame(
+        stream_format,
+        "summary",
+        {"count": sum(counts.values()), "sources": statuses},
+    )
 
 
 @router.get("/search")
-def unified_search(
+async def unified_search(
+    request: Request,
     q: str = Query(..., description="Search query"),
     sources: str | None = Query(
         default=None,
         description="Comma-separated list of sources (e.g., gmail,drive)",
     ),
+    limit: int = Query(default=SEARCH_RESULT_LIMIT, ge=1, le=500),
+    cursor: str | None = Query(
+        default=None,
+        description="next_cursor from a previous response",
+    ),
     payload: dict = Depends(require_authentication),
+    deadline: Deadline = Depends(admit("search")),
 ):
     user_id = payload["user_id"]
+    stream_format = negotiate_stream_format(request.headers.get("accept"))
 
-    # Decide which connectors to use
-    if sources:
-        requested = {s.strip() for s in sources.split(",")}
-        connectors = [
-            CONNECTORS[name]
-            for name in requested
-            if name in CONNECTORS
-        ]
+    if cursor and stream_format:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursors are only supported for JSON responses",
+        )
+
+    page = decode_search_cursor(cursor, user_id, q) if cursor else {}
+    # source -> ids of the records returned on earlier pages
+    returned: dict[str, list[str]] = page.get("s", {})
+    seen = {(name, record_id) for name, ids in returned.items() for record_id in ids}
+
+    statuses, cold = await plan_sources(user_id, select_connectors(sources))
+
+    # Accept: application/x-ndjson or text/event-stream streams results
+    # as each source completes instead of waiting for the slowest one
+    if stream_format:
+        return StreamingResponse(
+            stream_search(
+                user_id, q, limit, statuses, cold, stream_format, deadline
+            ),
+            media_type=MEDIA_TYPES[stream_format],
+        )
+
+    # Sources never seen for this user are fetched now, all at once;
+    # a slow or failing source only affects its own entry in the response
+    outcomes = await fan_out(**fetch_calls(user_id, cold, deadline))
+
+    for outcome in outcomes:
+        statuses[outcome.source] = await source_summary(user_id, outcome)
+
+    searchable = searchable_sources(statuses)
+    index = search_index.for_user(user_id)
+
+    if "p" in page:
+        page_tokens = page["p"]
     else:
-        connectors = list(CONNECTORS.values())
+        page_tokens = {
+            name: index.next_page_tokens[name]
+            for name in searchable
+            if index.next_page_tokens.get(name)
+        }
 
-    results: list[dict] = []
+    # One extra hit tells whether another indexed page exists
+    results = unseen_matches(index, q, searchable, seen, limit + 1)
 
-    for connector in connectors:
-        try:
-            data = connector.fetch(user_id=user_id, query=q)
-            results.extend(data)
-        except Exception:
-            # If a connector fails (e.g., not linked),
-            # we skip it instead of failing the whole search
-            continue
+    # Scrolled past what is indexed: pull one more provider page
+    if len(results) < limit and page_tokens and cursor:
+        page_tokens = await fetch_deeper_pages(user_id, page_tokens, deadline)
+        results = unseen_matches(
+            search_index.for_user(user_id), q, searchable, seen, limit + 1
+        )
+
+    has_more = len(results) > limit
+    results = results[:limit]
+
+    next_cursor = None
+    if has_more or page_tokens:
+        for record in results:
+            returned.setdefault(record["source"], []).append(str(record["id"]))
+        next_cursor = encode_cursor({
+            "u": user_id,
+            "q": normalize_query(q),
+            "s": returned,
+            "p": page_tokens,
+        })
+
+    counts = Counter(record["source"] for record in results)
+    for name, summary in statuses.items():
+        summary["count"] = counts.get(name, 0)
 
-    return results
+    return {
+        "results": results,
+        "sources": statuses,
+        "next_cursor": next_cursor,
+    }
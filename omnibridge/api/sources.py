@@ -1,26 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
 
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+
+from omnibridge.api.admission import admit, retry_after_header
 from omnibridge.auth.dependencies import require_authentication
-from omnibridge.accounts.dependencies import token_store  # ✅ SHARED STORE
-from omnibridge.connectors.gmail import GmailConnector
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.connectors.rate_limit import RateLimitExceeded
+from omnibridge.core.admission import Deadline
+from omnibridge.core.circuit_breaker import CircuitOpenError
+from omnibridge.core.config import SOURCES_DEFAULT_PAGE_SIZE, SOURCES_MAX_PAGE_SIZE
+from omnibridge.core.cursors import InvalidCursorError, decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/sources")
 
-# Connector uses the SAME shared store
-gmail_connector = GmailConnector(token_store=token_store)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Set to "degraded" when the provider's circuit is open and the body is
+# the last page we fetched for the user rather than live data
+SOURCE_STATUS_HEADER = "X-Source-Status"
+
+
+def page_options(user_id: str, page_size: int, cursor: str | None) -> dict:
+    options = {"page_size": page_size}
+
+    if cursor:
+        try:
+            data = decode_cursor(cursor)
+        except InvalidCursorError:
+            data = {}
+
+        if data.get("u") != user_id or "t" not in data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        options["page_token"] = data["t"]
+
+    return options
 
 
 @router.get("/gmail/messages")
-def fetch_gmail_messages(
+async def fetch_gmail_messages(
+    response: Response,
+    page_size: int = Query(
+        default=SOURCES_DEFAULT_PAGE_SIZE, ge=1, le=SOURCES_MAX_PAGE_SIZE
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description=f"Continuation cursor from the {NEXT_CURSOR_HEADER} header",
+    ),
     payload: dict = Depends(require_authentication),
+    deadline: Deadline = Depends(admit("sources")),
 ):
     user_id = payload["user_id"]
+    options = page_options(user_id, page_size, cursor)
+    # The same instance /search uses (shared mailbox snapshot and clients)
+    gmail_connector = connectors.get("gmail")
 
     try:
-        results = gmail_connector.fetch(user_id=user_id)
-        return results
+        # Identical concurrent requests share one upstream fetch, run on
+        # the connector bridge rather than FastAPI's threadpool. Giving up
+        # at the deadline leaves the shared fetch running for the others.
+        results = await asyncio.wait_for(
+            fetch_flights.ado(
+                "gmail",
+                user_id,
+                None,
+                options,
+                lambda: circuit_breakers.for_provider("gmail").acall(
+                    lambda: gmail_connector.afetch(user_id=user_id, options=options)
+                ),
+            ),
+            deadline.time_left(),
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Gmail did not answer before the request deadline",
+        )
+    except CircuitOpenError as exc:
+        stale = None if cursor else gmail_connector.cached(user_id)
+        if stale is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": retry_after_header(exc.retry_after)},
+            )
+        response.headers[SOURCE_STATUS_HEADER] = "degraded"
+        results = stale
+    except RateLimitExceeded as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": retry_after_header(exc.retry_after)},
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc),
         )
+
+    next_page_token = getattr(results, "next_page_token", None)
+    if next_page_token:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            {"u": user_id, "t": next_page_token}
+        )
+
+    return results
@@ -1,2 +1,10 @@
 JWT_SECRET_KEY = "DEV_ONLY_SECRET_CHANGE_LATER"
 JWT_ALGORITHM = "HS256"
+
+# Verified JWT cache: repeat requests with the same token skip signature
+# checks until the token's own exp (capped, so config changes take effect)
+JWT_CACHE_MAX_ENTRIES = 10000
+JWT_CACHE_MAX_TTL_SECONDS = 300
+
+# Signs the opaque pagination cursors handed to clients
+CURSOR_SECRET_KEY = "DEV_ONLY_CURSOR_SECRET_CHANGE_LATER"
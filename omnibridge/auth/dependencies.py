@@ -1,5 +1,26 @@
 from fastapi import Header, HTTPException, status
+from omnibridge.auth.config import JWT_CACHE_MAX_ENTRIES, JWT_CACHE_MAX_TTL_SECONDS
 from omnibridge.auth.jwt import verify_jwt
+from omnibridge.auth.token_cache import VerifiedTokenCache
+from omnibridge.core.config import (
+    PREFETCH_HALF_LIFE_SECONDS,
+    PREFETCH_IDLE_AFTER_SECONDS,
+    PREFETCH_MAX_USERS,
+)
+from omnibridge.core.metrics import span
+from omnibridge.core.prefetch import ActivityTracker
+
+verified_tokens = VerifiedTokenCache(
+    max_entries=JWT_CACHE_MAX_ENTRIES,
+    max_ttl=JWT_CACHE_MAX_TTL_SECONDS,
+)
+
+# Who made authenticated requests lately; the prefetcher warms their data
+user_activity = ActivityTracker(
+    max_users=PREFETCH_MAX_USERS,
+    half_life=PREFETCH_HALF_LIFE_SECONDS,
+    idle_after=PREFETCH_IDLE_AFTER_SECONDS,
+)
 
 
 def require_authentication(authorization: str | None = Header(default=None)):
@@ -23,12 +44,21 @@ def require_authentication(authorization: str | None = Header(default=None)):
             detail="Bearer token missing",
         )
 
-    try:
-        payload = verify_jwt(token)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
+    payload = verified_tokens.get(token)
+
+    if payload is None:
+        try:
+            with span("jwt.verify"):
+                payload = verify_jwt(token)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+
+        verified_tokens.put(token, payload)
+
+    if "user_id" in payload:
+        user_activity.touch(payload["user_id"])
 
     return payload
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of JWT payloads that already passed verification.
+
+    Keyed by a SHA-256 digest of the raw token, so tokens themselves are
+    not retained. An entry is only served until the token's `exp` (or
+    max_ttl, whichever comes first); tokens without `exp` are not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._max_entries = max_entries
+        self._max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict | None:
+        key = hashlib.sha256(token.encode()).digest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, valid_until = entry
+            if valid_until <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+
+        valid_until = min(float(exp), self._clock() + self._max_ttl)
+        key = hashlib.sha256(token.encode()).digest()
+
+        with self._lock:
+            self._entries[key] = (dict(payload), valid_until)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,12 +1,89 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 
+from omnibridge.connectors.rate_limit import RateLimiter
+from omnibridge.core.metrics import span
+
+
+class AccountNotLinkedError(Exception):
+    """Raised when the user has no linked account for the provider."""
+
+
+class Page(list):
+    """
+    Normalized records returned by fetch(), plus the provider's token for
+    the next page (None on the last page). Pass it back as
+    options["page_token"] to continue.
+    """
+
+    def __init__(self, records=(), next_page_token: str | None = None):
+        super().__init__(records)
+        self.next_page_token = next_page_token
+
 
 class BaseConnector(ABC):
     provider: str
 
-    def __init__(self, token_store):
+    def __init__(
+        self,
+        token_store,
+        token_refresher=None,
+        transport=None,
+        rate_limiter=None,
+        bridge=None,
+    ):
         self.token_store = token_store
+        self.token_refresher = token_refresher
+        # Shared HttpTransport for provider calls (None: connector's own HTTP)
+        self.transport = transport
+        # Shared RateLimiter; a private unlimited one still applies backoffs
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # SyncBridge that runs fetch() for afetch() (None: asyncio's default pool)
+        self.bridge = bridge
+
+    def get_account(self, user_id: str):
+        """
+        Linked account for this provider, with an access token that is
+        refreshed first if it is about to expire.
+        """
+        account = self.token_store.get_account(user_id, self.provider)
+
+        if account is not None and self.token_refresher is not None:
+            with span("token_refresher.ensure_fresh"):
+                account = self.token_refresher.ensure_fresh(account)
+
+        return account
+
+    def cached(self, user_id: str) -> List[Dict[str, Any]] | None:
+        """
+        Last first page fetched for the user, without calling the provider;
+        None if the connector keeps nothing. Used to serve stale data
+        while the provider is unavailable.
+        """
+        return None
+
+    async def afetch(
+        self,
+        user_id: str,
+        query: str | None = None,
+        options: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async entry point used by the API; same contract as fetch().
+
+        Connectors with an async client override this. Sync connectors
+        inherit it: fetch() runs on the bridge's dedicated thread pool,
+        so a blocking provider call never blocks the event loop.
+        """
+        if self.bridge is not None:
+            return await self.bridge.run(
+                self.fetch, user_id=user_id, query=query, options=options
+            )
+
+        return await asyncio.to_thread(
+            self.fetch, user_id=user_id, query=query, options=options
+        )
 
     @abstractmethod
     def fetch(
@@ -21,5 +98,9 @@ class BaseConnector(ABC):
         - Must use token_store internally
         - Must NOT expose tokens
         - Must return normalized data
+
+        Supported options:
+        - page_size: maximum number of records to return
+        - page_token: provider token from a previous Page.next_page_token
         """
         pass
@@ -0,0 +1,78 @@
+import copy
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from omnibridge.core.result_cache import normalize_query
+from omnibridge.core.singleflight import AsyncSingleFlight
+
+T = TypeVar("T")
+
+
+def fetch_key(
+    user_id: str,
+    query: str | None,
+    options: Dict[str, Any] | None,
+) -> Hashable:
+    # Options are canonicalized so {"a": 1, "b": 2} and {"b": 2, "a": 1} match
+    return (
+        user_id,
+        normalize_query(query),
+        json.dumps(options or {}, sort_keys=True, default=str),
+    )
+
+
+class FetchCoalescer:
+    """
+    Single-flight layer in front of connector fetches.
+
+    Concurrent fetches with the same (user_id, provider, query, options)
+    share one upstream call: the first caller runs it and everyone who
+    arrives while it is in flight gets the same result (or exception).
+    Each caller receives its own shallow copy of the result list, so one
+    request cannot mutate another's response.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, AsyncSingleFlight] = {}
+        self._lock = threading.Lock()
+
+    async def ado(
+        self,
+        provider: str,
+        user_id: str,
+        query: str | None,
+        options: Dict[str, Any] | None,
+        fn: Callable[[], Awaitable[T]],
+    ) -> T:
+        with self._lock:
+            flight = self._flights.get(provider)
+            if flight is None:
+                flight = self._flights[provider] = AsyncSingleFlight()
+
+        result = await flight.do(fetch_key(user_id, query, options), fn)
+        return copy.copy(result)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            flights = list(self._flights.items())
+
+        totals: Dict[str, Dict[str, Any]] = {}
+        for provider, flight in flights:
+            stats = flight.stats()
+            total = totals.setdefault(
+                provider, {"in_flight": 0, "calls": 0, "executions": 0, "shared": 0}
+            )
+            for name in total:
+                total[name] += stats[name]
+
+        for total in totals.values():
+            total["coalescing_ratio"] = (
+                round(total["shared"] / total["calls"], 4) if total["calls"] else 0.0
+            )
+
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self._flights.clear()
@@ -0,0 +1,116 @@
+import httpx
+
+from omnibridge.accounts.dependencies import get_token_store, token_refresher
+from omnibridge.accounts.refresh import TokenRefreshError
+from omnibridge.connectors.base import AccountNotLinkedError
+from omnibridge.connectors.bridge import SyncBridge
+from omnibridge.connectors.coalescing import FetchCoalescer
+from omnibridge.connectors.rate_limit import RateLimit, RateLimiter, RateLimitExceeded
+from omnibridge.connectors.registry import ConnectorRegistry
+from omnibridge.connectors.transport import HttpTransport
+from omnibridge.core.circuit_breaker import CircuitBreakers
+from omnibridge.core.config import (
+    CIRCUIT_FAILURE_RATE_THRESHOLD,
+    CIRCUIT_HALF_OPEN_CALLS,
+    CIRCUIT_MINIMUM_CALLS,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_OVERRIDES,
+    CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    CIRCUIT_WINDOW_SIZE,
+    CONNECTOR_BRIDGE_MAX_WORKERS,
+    HTTP_ENABLE_HTTP2,
+    HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_POOL_MAX_CONNECTIONS,
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_POOL_TIMEOUT_SECONDS,
+    HTTP_REQUEST_TIMEOUT_SECONDS,
+    RATE_LIMIT_BACKOFF_BASE_SECONDS,
+    RATE_LIMIT_BACKOFF_MAX_SECONDS,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    RATE_LIMITS_PER_ACCOUNT,
+    RATE_LIMITS_PER_PROVIDER,
+)
+
+# SINGLE shared HTTP transport for every connector (closed in the app lifespan)
+http_transport = HttpTransport(
+    max_connections=HTTP_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+    timeout=HTTP_REQUEST_TIMEOUT_SECONDS,
+    pool_timeout=HTTP_POOL_TIMEOUT_SECONDS,
+    http2=HTTP_ENABLE_HTTP2,
+)
+
+# SINGLE shared rate limiter, so quotas hold across every connector instance
+rate_limiter = RateLimiter(
+    account_limits={
+        provider: RateLimit(*limit)
+        for provider, limit in RATE_LIMITS_PER_ACCOUNT.items()
+    },
+    provider_limits={
+        provider: RateLimit(*limit)
+        for provider, limit in RATE_LIMITS_PER_PROVIDER.items()
+    },
+    max_wait=RATE_LIMIT_MAX_WAIT_SECONDS,
+    max_retries=RATE_LIMIT_MAX_RETRIES,
+    backoff_base=RATE_LIMIT_BACKOFF_BASE_SECONDS,
+    backoff_max=RATE_LIMIT_BACKOFF_MAX_SECONDS,
+)
+
+
+def is_provider_failure(exc: Exception) -> bool:
+    """
+    Whether a failed provider call says the provider is unhealthy: a 5xx
+    or 429 response, a timeout or a transport error. A missing link, an
+    exhausted quota, a failed token refresh or any other 4xx is about one
+    user's account and must not open the circuit for everyone.
+    """
+    if isinstance(exc, (AccountNotLinkedError, RateLimitExceeded, TokenRefreshError)):
+        return False
+
+    # googleapiclient's HttpError (not imported here: provider SDKs load
+    # lazily) and httpx's HTTPStatusError carry the response status
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    else:
+        status = getattr(exc, "status_code", None)
+    if not isinstance(status, int):
+        return True
+
+    return status == 429 or not 400 <= status < 500
+
+
+# SINGLE set of circuit breakers, keyed by source name ("gmail"), so
+# /search and /sources see the same provider health
+circuit_breakers = CircuitBreakers(
+    overrides=CIRCUIT_OVERRIDES,
+    failure_rate_threshold=CIRCUIT_FAILURE_RATE_THRESHOLD,
+    slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+    slow_call_rate_threshold=CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+    window_size=CIRCUIT_WINDOW_SIZE,
+    minimum_calls=CIRCUIT_MINIMUM_CALLS,
+    open_seconds=CIRCUIT_OPEN_SECONDS,
+    half_open_calls=CIRCUIT_HALF_OPEN_CALLS,
+    is_failure=is_provider_failure,
+)
+
+# SINGLE single-flight layer: identical concurrent fetches from /search and
+# /sources share one upstream call
+fetch_flights = FetchCoalescer()
+
+# SINGLE thread pool for sync connectors called through afetch()
+# (shut down in the app lifespan)
+connector_bridge = SyncBridge(max_workers=CONNECTOR_BRIDGE_MAX_WORKERS)
+
+# SINGLE connector registry: one lazily built instance per source, shared by
+# /search, /sources and push notifications. Built from the same store the
+# routers resolve through get_token_store, so they all see one set of accounts
+connectors = ConnectorRegistry(
+    token_store=get_token_store(),
+    token_refresher=token_refresher,
+    transport=http_transport,
+    rate_limiter=rate_limiter,
+    bridge=connector_bridge,
+)
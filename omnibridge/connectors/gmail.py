@@ -1,102 +1,752 @@
-from typing import Any, Dict, List
-from datetime import datetime, timezone
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 
-from omnibridge.connectors.base import BaseConnector
+from omnibridge.connectors.base import AccountNotLinkedError, BaseConnector, Page
+from omnibridge.connectors.rate_limit import RateLimitExceeded, parse_retry_after
+from omnibridge.connectors.service_cache import ServiceCache
 from omnibridge.accounts.models import Account
+from omnibridge.core.config import (
+    GMAIL_API_ENDPOINT,
+    GMAIL_PUSH_MAX_STALENESS_SECONDS,
+    GMAIL_PUSH_TOPIC,
+)
+from omnibridge.core.dates import normalize_timestamps
+from omnibridge.core.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Gmail rejects batches larger than 100 sub-requests
+GMAIL_BATCH_LIMIT = 100
+
+METADATA_HEADERS = ["From", "To", "Subject", "Date"]
+
+DEFAULT_PAGE_SIZE = 20
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted"]
+
+# Upper bound on mailboxes we keep incremental sync state for
+MAX_TRACKED_MAILBOXES = 1024
+
+# Gmail per-user quota units per method (rate limiter token cost)
+QUOTA_UNITS = {
+    "messages.list": 5,
+    "messages.get": 5,
+    "history.list": 2,
+    "getProfile": 1,
+    "watch": 100,
+}
+
+# Watches last 7 days; Google recommends renewing them daily
+WATCH_RENEW_BEFORE_SECONDS = 6 * 24 * 3600
+
+# 403 reasons Gmail uses for quota errors (as opposed to permission errors)
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+@dataclass
+class MailboxState:
+    """
+    Last synced view of one account's mailbox.
+
+    `messages` holds normalized records, newest first, capped at `limit`
+    (the largest page size asked for; smaller pages are slices of it).
+    `history_id` is the Gmail historyId the snapshot is current as of.
+    `next_page_token` continues the listing after the snapshot, and
+    `page_tokens` after the first n messages, by n, for smaller pages.
+    `synced_at`, `watch_expires_at` and `watch_retry_at` are clock
+    times: the last successful sync, the end of the Gmail push watch,
+    and the earliest time to retry a failed watch.
+    """
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    history_id: str | None = None
+    limit: int = 0
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    next_page_token: str | None = None
+    page_tokens: Dict[int, str | None] = field(default_factory=dict)
+    synced_at: float = 0.0
+    watch_expires_at: float = 0.0
+    watch_retry_at: float = 0.0
+
+
+@lru_cache(maxsize=None)
+def gmail_discovery_document() -> Dict[str, Any]:
+    """
+    Parsed Gmail discovery document, read once from the copy bundled
+    with google-api-python-client (no network fetch).
+    """
+    return json.loads(get_static_doc("gmail", "v1"))
+
+
+def create_connector(**shared: Any) -> "GmailConnector":
+    """
+    Connector registry factory: a GmailConnector on the app's shared
+    dependencies, configured from omnibridge.core.config.
+    """
+    return GmailConnector(
+        api_endpoint=GMAIL_API_ENDPOINT,
+        push_topic=GMAIL_PUSH_TOPIC,
+        push_max_staleness=GMAIL_PUSH_MAX_STALENESS_SECONDS,
+        **shared,
+    )
 
 
 class GmailConnector(BaseConnector):
     provider = "google"
 
+    def __init__(
+        self,
+        token_store,
+        token_refresher=None,
+        api_endpoint: str | None = None,
+        transport=None,
+        rate_limiter=None,
+        bridge=None,
+        push_topic: str | None = None,
+        push_max_staleness: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(
+            token_store, token_refresher, transport, rate_limiter, bridge
+        )
+        # Override for the Gmail REST root (e.g. a local fake in tests)
+        self.api_endpoint = api_endpoint
+        # Pub/Sub topic Gmail pushes mailbox changes to (None: poll on fetch)
+        self.push_topic = push_topic
+        self.push_max_staleness = push_max_staleness
+        self._clock = clock
+
+        # Built Gmail clients, reused across requests for the same account
+        self.services = ServiceCache(self._build_service)
+        token_store.subscribe(self._on_account_saved)
+
+        # Incremental sync state, keyed by (user_id, provider)
+        self._mailboxes: "OrderedDict[Tuple[str, str], MailboxState]" = OrderedDict()
+        self._mailboxes_lock = threading.Lock()
+
     def fetch(
         self,
         user_id: str,
         query: str | None = None,   # query intentionally ignored in v1
         options: Dict[str, Any] | None = None,
-    ) -> List[Dict[str, Any]]:
-        
+    ) -> Page:
+        options = options or {}
 
-        account = self.token_store.get_account(user_id, self.provider)
+        account = self.get_account(user_id)
 
         if not account:
-            raise Exception("Google account not linked")
+            raise AccountNotLinkedError("Google account not linked")
 
-        messages = self._fetch_from_gmail_api(account)
+        messages = self._fetch_from_gmail_api(
+            account,
+            max_results=int(options.get("page_size", DEFAULT_PAGE_SIZE)),
+            page_token=options.get("page_token"),
+        )
 
-        normalized: List[Dict[str, Any]] = []
+        normalized = Page(
+            next_page_token=getattr(messages, "next_page_token", None)
+        )
         for message in messages:
             message["source"] = "gmail"
             normalized.append(message)
 
         return normalized
 
+    def cached(self, user_id: str) -> Page | None:
+        with self._mailboxes_lock:
+            state = self._mailboxes.get((user_id, self.provider))
+
+        if state is None or state.history_id is None:
+            return None
+
+        with state.lock:
+            return Page(
+                [{**message, "source": "gmail"} for message in state.messages],
+                next_page_token=state.next_page_token,
+            )
+
+    def apply_notification(self, user_id: str, history_id: str) -> bool:
+        """
+        Bring the user's mailbox snapshot up to date after Gmail pushed a
+        change notification. Returns False without calling Gmail if the
+        snapshot is already as new, or there is none yet (the next fetch
+        will sync it).
+        """
+        with self._mailboxes_lock:
+            state = self._mailboxes.get((user_id, self.provider))
+
+        if state is None:
+            return False
+
+        account = self.get_account(user_id)
+        if not account:
+            return False
+
+        with state.lock:
+            if state.history_id is None or int(history_id) <= int(state.history_id):
+                return False
+
+            try:
+                with self.services.lease(account) as service:
+                    self._sync_changes(account, service, state)
+            except Exception:
+                # Don't trust the snapshot: the next fetch asks Gmail
+                state.synced_at = 0.0
+                raise
+
+        return True
+
     def _fetch_from_gmail_api(
         self,
         account: Account,
-        max_results: int = 20,
-    ) -> List[Dict[str, Any]]:
+        max_results: int = DEFAULT_PAGE_SIZE,
+        page_token: str | None = None,
+    ) -> Page:
         """
         Fetch recent Gmail messages using real Gmail API.
         Query is intentionally ignored in v1 for reliability.
+
+        The first page is kept per account: the first call lists the
+        newest messages, later calls only apply changes since the last
+        seen historyId. The snapshot only grows (full sync) for a larger
+        page size; smaller ones are served from it. Deeper pages
+        (page_token) are listed directly.
+        With a push topic, a watched mailbox is served from the snapshot
+        alone; apply_notification() keeps it current.
+        """
+        if page_token:
+            with self.services.lease(account) as service:
+                return self._list_page(account, service, max_results, page_token)
+
+        state = self._mailbox_state(account)
+
+        with state.lock:
+            if not self._push_fresh(state, max_results):
+                # 1️⃣ Reuse (or build) a Gmail API client for this account
+                with self.services.lease(account) as service:
+                    if self.push_topic:
+                        self._ensure_watch(account, service, state)
+
+                    if state.history_id is None or state.limit < max_results:
+                        self._full_sync(account, service, state, max_results)
+                    else:
+                        self._sync_changes(account, service, state)
+
+            return Page(
+                [dict(message) for message in state.messages[:max_results]],
+                next_page_token=self._page_token(account, state, max_results),
+            )
+
+    def _page_token(
+        self,
+        account: Account,
+        state: MailboxState,
+        max_results: int,
+    ) -> str | None:
+        """
+        Token continuing after the first max_results messages of the
+        snapshot. Gmail's page tokens are opaque, so a page smaller than
+        the snapshot asks for its own once (ids only, no metadata) and
+        keeps it until the head of the mailbox moves.
+        """
+        if max_results >= state.limit:
+            return state.next_page_token
+
+        if len(state.messages) <= max_results and not state.next_page_token:
+            # The snapshot holds the whole mailbox
+            return None
+
+        if max_results not in state.page_tokens:
+            with self.services.lease(account) as service:
+                response = self._execute(
+                    account,
+                    service.users().messages().list(
+                        userId="me",
+                        maxResults=max_results,
+                        includeSpamTrash=True,
+                    ),
+                    method="messages.list",
+                )
+            state.page_tokens[max_results] = response.get("nextPageToken")
+
+        return state.page_tokens[max_results]
+
+    def _push_fresh(self, state: MailboxState, max_results: int) -> bool:
+        """
+        True if Gmail is pushing this mailbox's changes and the snapshot
+        is recent enough to serve without asking Gmail. The staleness
+        bound covers notifications lost in transit.
         """
+        now = self._clock()
 
-        # 1️⃣ Build Google credentials from stored access token
-        creds = Credentials(token=account.access_token)
+        return (
+            self.push_topic is not None
+            and state.history_id is not None
+            and state.limit >= max_results
+            and state.watch_expires_at > now
+            and now - state.synced_at < self.push_max_staleness
+        )
 
-        # 2️⃣ Create Gmail API client
-        service = build("gmail", "v1", credentials=creds)
+    def _ensure_watch(self, account: Account, service, state: MailboxState) -> None:
+        now = self._clock()
+        if (
+            state.watch_expires_at - now > WATCH_RENEW_BEFORE_SECONDS
+            or now < state.watch_retry_at
+        ):
+            return
 
-        
+        try:
+            response = self._execute(
+                account,
+                service.users().watch(
+                    userId="me", body={"topicName": self.push_topic}
+                ),
+                method="watch",
+            )
+        except (HttpError, RateLimitExceeded) as exc:
+            # Without a watch the mailbox is simply polled, as before
+            logger.warning(
+                "Gmail watch failed for %s: %s", account.provider_account_id, exc
+            )
+            state.watch_retry_at = now + self.push_max_staleness
+            return
 
-        # 4️⃣ Fetch most recent messages (no Gmail search filter)
-        response = service.users().messages().list(
-            userId="me",
-            maxResults=max_results,
-            includeSpamTrash=True,
-        ).execute()
+        # Gmail reports the expiration in epoch milliseconds
+        state.watch_expires_at = int(response["expiration"]) / 1000
+
+    def _sync_changes(self, account: Account, service, state: MailboxState) -> None:
+        try:
+            self._incremental_sync(account, service, state)
+        except HttpError as exc:
+            # historyId too old for Gmail to replay: start over
+            if exc.resp.status != 404:
+                raise
+            self._full_sync(account, service, state, state.limit)
+
+    def _list_page(
+        self,
+        account: Account,
+        service,
+        max_results: int,
+        page_token: str,
+    ) -> Page:
+        response = self._execute(
+            account,
+            service.users().messages().list(
+                userId="me",
+                maxResults=max_results,
+                includeSpamTrash=True,
+                pageToken=page_token,
+            ),
+            method="messages.list",
+        )
 
-        
+        message_ids = [msg["id"] for msg in response.get("messages", [])]
+        details = self._get_metadata(account, service, message_ids)
 
-        messages = response.get("messages", [])
-        results: List[Dict[str, Any]] = []
+        return Page(
+            self._normalize_messages(details),
+            next_page_token=response.get("nextPageToken"),
+        )
 
-        for msg in messages:
-            msg_detail = service.users().messages().get(
+    def _full_sync(
+        self,
+        account: Account,
+        service,
+        state: MailboxState,
+        max_results: int,
+    ) -> None:
+        # 2️⃣ Fetch most recent messages (no Gmail search filter)
+        response = self._execute(
+            account,
+            service.users().messages().list(
                 userId="me",
-                id=msg["id"],
-                format="metadata",
-                metadataHeaders=["From", "To", "Subject", "Date"],
-            ).execute()
-
-            headers = {
-                h["name"]: h["value"]
-                for h in msg_detail.get("payload", {}).get("headers", [])
-            }
+                maxResults=max_results,
+                includeSpamTrash=True,
+            ),
+            method="messages.list",
+        )
+
+        message_ids = [msg["id"] for msg in response.get("messages", [])]
+
+        # 3️⃣ Fetch metadata for every message in one batched round trip
+        details = self._get_metadata(account, service, message_ids)
+
+        # Gmail's sync guide: resume from the newest message's historyId
+        if details:
+            newest = max(details, key=lambda detail: int(detail["historyId"]))
+            history_id = newest["historyId"]
+        else:
+            profile = self._execute(
+                account,
+                service.users().getProfile(userId="me"),
+                method="getProfile",
+            )
+            history_id = profile["historyId"]
+
+        state.history_id = str(history_id)
+        state.limit = max_results
+        state.messages = self._normalize_messages(details)
+        state.next_page_token = response.get("nextPageToken")
+        state.page_tokens = {}
+        state.synced_at = self._clock()
+
+    def _incremental_sync(
+        self,
+        account: Account,
+        service,
+        state: MailboxState,
+    ) -> None:
+        added: List[str] = []
+        deleted: set[str] = set()
+        page_token = None
+
+        while True:
+            response = self._execute(
+                account,
+                service.users().history().list(
+                    userId="me",
+                    startHistoryId=state.history_id,
+                    historyTypes=HISTORY_TYPES,
+                    pageToken=page_token,
+                ),
+                method="history.list",
+            )
+
+            for record in response.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    added.append(item["message"]["id"])
+                for item in record.get("messagesDeleted", []):
+                    deleted.add(item["message"]["id"])
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        known = {message["id"] for message in state.messages}
+        new_ids = [
+            message_id
+            for message_id in dict.fromkeys(reversed(added))
+            if message_id not in deleted and message_id not in known
+        ]
+
+        details = self._get_metadata(account, service, new_ids)
+
+        kept = [m for m in state.messages if m["id"] not in deleted]
+        messages = self._normalize_messages(details) + kept
+
+        # The head moved: the old page token no longer continues right
+        # after the snapshot, so list the first page again for a new one
+        if new_ids or len(kept) < len(state.messages):
+            state.page_tokens = {}
+            if state.next_page_token or len(messages) > state.limit:
+                messages, state.next_page_token = self._relist(
+                    account, service, state.limit, messages
+                )
+
+        state.messages = messages[:state.limit]
+        state.history_id = str(response["historyId"])
+        state.synced_at = self._clock()
+
+    def _relist(
+        self,
+        account: Account,
+        service,
+        max_results: int,
+        known: List[Dict[str, Any]],
+    ) -> tuple[List[Dict[str, Any]], str | None]:
+        response = self._execute(
+            account,
+            service.users().messages().list(
+                userId="me",
+                maxResults=max_results,
+                includeSpamTrash=True,
+            ),
+            method="messages.list",
+        )
+
+        message_ids = [msg["id"] for msg in response.get("messages", [])]
+        by_id = {message["id"]: message for message in known}
+
+        # Only messages moving up from the next page need their metadata
+        missing = [message_id for message_id in message_ids if message_id not in by_id]
+        for message in self._normalize_messages(
+            self._get_metadata(account, service, missing)
+        ):
+            by_id[message["id"]] = message
+
+        messages = [by_id[message_id] for message_id in message_ids if message_id in by_id]
+        return messages, response.get("nextPageToken")
 
-            results.append({
-                "id": msg_detail["id"],
-                "from": headers.get("From"),
-                "to": headers.get("To", "").split(",") if headers.get("To") else [],
-                "subject": headers.get("Subject"),
-                "snippet": msg_detail.get("snippet"),
-                "timestamp": self._parse_date(headers.get("Date")),
-            })
+    def _get_metadata(
+        self,
+        account: Account,
+        service,
+        message_ids: List[str],
+    ) -> List[Dict[str, Any]]:
+        details, errors = self._batch_get_metadata(account, service, message_ids)
 
-        return results
+        for error in errors:
+            logger.warning(
+                "Gmail metadata fetch failed for message %s: %s",
+                error["id"],
+                error["error"],
+            )
 
-    def _parse_date(self, date_str: str | None) -> str | None:
+        return details
+
+    def _execute(self, account: Account, request, method: str) -> Dict[str, Any]:
         """
-        Parse Gmail date header into ISO 8601 format.
+        Execute one API request (`method` is its QUOTA_UNITS key) within
+        the account's rate limit, backing off and retrying when Gmail
+        answers with a quota error.
         """
-        if not date_str:
-            return None
+        attempt = 0
+
+        while True:
+            with span("rate_limiter.acquire"):
+                self.rate_limiter.acquire(
+                    self.provider,
+                    account.provider_account_id,
+                    cost=QUOTA_UNITS[method],
+                )
+
+            try:
+                with span(f"gmail.{method}"):
+                    return request.execute()
+            except HttpError as exc:
+                retry_after = rate_limit_retry_after(exc)
+                if retry_after is None:
+                    raise
+
+                delay = self.rate_limiter.backoff(
+                    self.provider,
+                    account.provider_account_id,
+                    attempt,
+                    retry_after,
+                )
+
+                attempt += 1
+                if attempt > self.rate_limiter.max_retries:
+                    raise RateLimitExceeded(
+                        "Gmail rate limit exceeded", retry_after=delay
+                    ) from exc
+
+    def _mailbox_state(self, account: Account) -> MailboxState:
+        key = (account.user_id, account.provider)
+
+        with self._mailboxes_lock:
+            state = self._mailboxes.get(key)
+
+            if state is None:
+                state = MailboxState()
+                self._mailboxes[key] = state
+
+            self._mailboxes.move_to_end(key)
+
+            while len(self._mailboxes) > MAX_TRACKED_MAILBOXES:
+                self._mailboxes.popitem(last=False)
+
+            return state
+
+    def _build_service(self, account: Account):
+        client_options = (
+            {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+        )
+
+        with span("gmail.build_service"):
+            if self.transport is not None:
+                # Requests go through the shared keep-alive pools
+                return build_from_document(
+                    gmail_discovery_document(),
+                    http=self.transport.authorized(account.access_token),
+                    client_options=client_options,
+                )
 
+            creds = Credentials(token=account.access_token)
+
+            return build_from_document(
+                gmail_discovery_document(),
+                credentials=creds,
+                client_options=client_options,
+            )
+
+    def _on_account_saved(
+        self,
+        previous: Optional[Account],
+        account: Account,
+    ) -> None:
+        if account.provider != self.provider:
+            return
+
+        key = (account.user_id, account.provider)
+
+        if previous is None or (
+            previous.provider_account_id != account.provider_account_id
+        ):
+            # A different mailbox: its history is unrelated to ours
+            with self._mailboxes_lock:
+                self._mailboxes.pop(key, None)
+
+        if previous is not None and previous.access_token != account.access_token:
+            self.services.invalidate(account.user_id, account.provider)
+
+    def _new_batch(self, service, callback) -> BatchHttpRequest:
+        if self.api_endpoint:
+            # new_batch_http_request() always targets the discovery rootUrl
+            return BatchHttpRequest(
+                callback=callback,
+                batch_uri=urljoin(self.api_endpoint, "batch"),
+            )
+
+        return service.new_batch_http_request(callback=callback)
+
+    def _batch_get_metadata(
+        self,
+        account: Account,
+        service,
+        message_ids: List[str],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetch metadata for many messages using Gmail batch requests.
+
+        Sub-requests rejected by Gmail's rate limit are retried in a new
+        batch after backing off. Returns (details, errors). Details keep
+        the order of message_ids; each error is {"id": message_id, "error": str}.
+        """
+        responses: Dict[int, Dict[str, Any]] = {}
+        failures: Dict[int, Exception] = {}
+        pending = list(range(len(message_ids)))
+        attempt = 0
+
+        while pending:
+            throttled: List[int] = []
+            retry_after = [0.0]
+            can_retry = attempt < self.rate_limiter.max_retries
+
+            def on_response(request_id, response, exception):
+                index = int(request_id)
+                if exception is None:
+                    responses[index] = response
+                    return
+
+                delay = rate_limit_retry_after(exception)
+                if delay is not None and can_retry:
+                    throttled.append(index)
+                    retry_after[0] = max(retry_after[0], delay)
+                else:
+                    failures[index] = exception
+
+            for start in range(0, len(pending), GMAIL_BATCH_LIMIT):
+                chunk = pending[start:start + GMAIL_BATCH_LIMIT]
+                with span("rate_limiter.acquire"):
+                    self.rate_limiter.acquire(
+                        self.provider,
+                        account.provider_account_id,
+                        cost=QUOTA_UNITS["messages.get"] * len(chunk),
+                    )
+
+                batch = self._new_batch(service, on_response)
+                for index in chunk:
+                    batch.add(
+                        service.users().messages().get(
+                            userId="me",
+                            id=message_ids[index],
+                            format="metadata",
+                            metadataHeaders=METADATA_HEADERS,
+                        ),
+                        request_id=str(index),
+                    )
+
+                with span("gmail.messages.get.batch"):
+                    batch.execute()
+
+            if throttled:
+                self.rate_limiter.backoff(
+                    self.provider,
+                    account.provider_account_id,
+                    attempt,
+                    retry_after[0],
+                )
+
+            pending = sorted(throttled)
+            attempt += 1
+
+        details = [
+            responses[index]
+            for index in range(len(message_ids))
+            if index in responses
+        ]
+        errors = [
+            {"id": message_ids[index], "error": str(exc)}
+            for index, exc in sorted(failures.items())
+        ]
+
+        return details, errors
+
+    def _normalize_messages(
+        self,
+        details: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        headers = [
+            {h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])}
+            for detail in details
+        ]
+        # Date headers are parsed as one batch; internalDate (when Gmail
+        # received the message) stands in for missing or broken ones
+        timestamps = normalize_timestamps(
+            [message_headers.get("Date") for message_headers in headers],
+            [detail.get("internalDate") for detail in details],
+        )
+
+        return [
+            {
+                "id": detail["id"],
+                "from": message_headers.get("From"),
+                "to": (
+                    message_headers["To"].split(",")
+                    if message_headers.get("To")
+                    else []
+                ),
+                "subject": message_headers.get("Subject"),
+                "snippet": detail.get("snippet"),
+                "timestamp": timestamp,
+            }
+            for detail, message_headers, timestamp in zip(details, headers, timestamps)
+        ]
+
+
+def rate_limit_retry_after(exc: Exception) -> float | None:
+    """
+    Seconds to wait if exc is a Gmail quota error (429, or 403 with a
+    rate-limit reason), honouring Retry-After; None for any other error.
+    """
+    if not isinstance(exc, HttpError):
+        return None
+
+    status = exc.resp.status
+    if status == 403:
         try:
-            # Example: "Mon, 15 Jan 2024 12:34:56 +0530"
-            dt = datetime.strptime(date_str[:25], "%a, %d %b %Y %H:%M:%S")
-            return dt.replace(tzinfo=timezone.utc).isoformat()
-        except Exception:
+            error = json.loads(exc.content)["error"]
+            reasons = {item.get("reason") for item in error.get("errors", [])}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            reasons = set()
+        if not reasons & RATE_LIMIT_REASONS:
             return None
+    elif status != 429:
+        return None
+
+    return parse_retry_after(exc.resp.get("retry-after"))
@@ -0,0 +1,250 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Tuple
+
+BucketKey = Tuple[str, str]  # (provider, account id); account "*" is provider-wide
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a provider call cannot be made within the rate limit,
+    even after queueing and backing off. retry_after is in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float   # tokens added per second
+    burst: float  # bucket capacity
+
+
+class TokenBucket:
+    """
+    Token bucket that can go into debt: a caller reserves its tokens up
+    front and sleeps off the deficit, so queued callers are served in
+    arrival order. blocked_until pauses the bucket after a provider
+    rate-limit response. A bucket without a limit only applies pauses.
+    """
+
+    def __init__(self, limit: RateLimit | None, now: float):
+        self.limit = limit
+        self.tokens = limit.burst if limit else 0.0
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def wait_time(self, cost: float, now: float) -> float:
+        self._refill(now)
+
+        wait = 0.0
+        if self.limit is not None and self.tokens < cost:
+            wait = (cost - self.tokens) / self.limit.rate
+
+        return max(wait, self.blocked_until - now)
+
+    def take(self, cost: float) -> None:
+        if self.limit is not None:
+            self.tokens -= cost
+
+    def _refill(self, now: float) -> None:
+        if self.limit is not None:
+            elapsed = max(0.0, now - self.updated)
+            self.tokens = min(
+                self.limit.burst, self.tokens + elapsed * self.limit.rate
+            )
+        self.updated = now
+
+
+@dataclass
+class _ProviderStats:
+    acquired: int = 0
+    queued: int = 0
+    wait_seconds: float = 0.0
+    rejected: int = 0
+    backoffs: int = 0
+
+
+class RateLimiter:
+    """
+    Token buckets per (provider, account) and, optionally, per provider.
+
+    acquire() reserves quota for one call, queueing the caller for up to
+    max_wait seconds before giving up with RateLimitExceeded. When the
+    provider answers with a rate-limit error, backoff() pauses that
+    account's bucket for the provider's Retry-After or a jittered
+    exponential delay, whichever is longer, so every caller for the
+    account slows down instead of hammering the quota.
+    """
+
+    def __init__(
+        self,
+        account_limits: Dict[str, RateLimit] | None = None,
+        provider_limits: Dict[str, RateLimit] | None = None,
+        max_wait: float = 2.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_buckets: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        self.account_limits = account_limits or {}
+        self.provider_limits = provider_limits or {}
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._max_buckets = max_buckets
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+        self._buckets: "OrderedDict[BucketKey, TokenBucket]" = OrderedDict()
+        self._stats: Dict[str, _ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, provider: str, account_id: str, cost: float = 1.0) -> float:
+        """
+        Reserve cost tokens, sleeping until they are available.
+        Returns the time waited in seconds.
+        """
+        with self._lock:
+            now = self._clock()
+            stats = self._stats_for(provider)
+            buckets = [self._bucket(provider, account_id, now)]
+            if provider in self.provider_limits:
+                buckets.append(self._bucket(provider, "*", now))
+
+            wait = max(bucket.wait_time(cost, now) for bucket in buckets)
+
+            if wait > self.max_wait:
+                stats.rejected += 1
+                raise RateLimitExceeded(
+                    f"{provider} rate limit exceeded", retry_after=wait
+                )
+
+            for bucket in buckets:
+                bucket.take(cost)
+
+            stats.acquired += 1
+            if wait > 0:
+                stats.queued += 1
+                stats.wait_seconds += wait
+
+        if wait > 0:
+            self._sleep(wait)
+
+        return wait
+
+    def backoff(
+        self,
+        provider: str,
+        account_id: str,
+        attempt: int,
+        retry_after: float = 0.0,
+    ) -> float:
+        """
+        Pause the account after a rate-limit response on the given retry
+        attempt (0-based). Returns the pause in seconds.
+        """
+        delay = max(retry_after, self.backoff_delay(attempt))
+
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(provider, account_id, now)
+            bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            self._stats_for(provider).backoffs += 1
+
+        return delay
+
+    def backoff_delay(self, attempt: int) -> float:
+        # Exponential with "equal jitter": half fixed, half random
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return ceiling / 2 + self._rng.uniform(0, ceiling / 2)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            blocked = sum(
+                1 for bucket in self._buckets.values()
+                if bucket.blocked_until > now
+            )
+            return {
+                "buckets": len(self._buckets),
+                "blocked_buckets": blocked,
+                "providers": {
+                    provider: {
+                        "acquired": stats.acquired,
+                        "queued": stats.queued,
+                        "wait_seconds": round(stats.wait_seconds, 6),
+                        "rejected": stats.rejected,
+                        "backoffs": stats.backoffs,
+                    }
+                    for provider, stats in self._stats.items()
+                },
+            }
+
+    def bucket_state(self, provider: str, account_id: str) -> Dict[str, float]:
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(provider, account_id, now)
+            bucket._refill(now)
+            return {
+                "tokens": round(bucket.tokens, 3),
+                "blocked_for": round(max(0.0, bucket.blocked_until - now), 3),
+            }
+
+    def _bucket(self, provider: str, account_id: str, now: float) -> TokenBucket:
+        key = (provider, account_id)
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            limits = self.provider_limits if account_id == "*" else self.account_limits
+            bucket = TokenBucket(limits.get(provider), now)
+            self._buckets[key] = bucket
+
+            while len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+
+        self._buckets.move_to_end(key)
+        return bucket
+
+    def _stats_for(self, provider: str) -> _ProviderStats:
+        stats = self._stats.get(provider)
+        if stats is None:
+            stats = self._stats[provider] = _ProviderStats()
+        return stats
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date).
+    Missing, unparsable or non-finite values count as 0.
+    """
+    if not value:
+        return 0.0
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else 0.0
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
@@ -0,0 +1,106 @@
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List
+
+from omnibridge.connectors.base import BaseConnector
+
+ENTRY_POINT_GROUP = "omnibridge.connectors"
+
+# Source name -> "module:factory", available even when the package is not
+# installed (entry points only exist for installed distributions)
+BUILTIN_CONNECTORS: Dict[str, str] = {
+    "gmail": "omnibridge.connectors.gmail:create_connector",
+}
+
+ConnectorFactory = Callable[..., BaseConnector]
+
+
+class UnknownConnectorError(KeyError):
+    """Raised when no connector is registered under the requested name."""
+
+
+class ConnectorRegistry:
+    """
+    Source name -> connector, with one shared instance per source.
+
+    Connectors come from BUILTIN_CONNECTORS, from `omnibridge.connectors`
+    entry points of installed packages (which may also replace a
+    built-in), or from register(). Factories are referenced as
+    "module:attr" strings and only imported on the first get() for their
+    source, so a provider's SDK is not loaded until something uses it.
+    Each factory is called with the shared dependencies the registry was
+    built with (token store, refresher, transport, rate limiter, bridge).
+    """
+
+    def __init__(
+        self,
+        builtins: Dict[str, str] | None = None,
+        group: str | None = ENTRY_POINT_GROUP,
+        **shared: Any,
+    ):
+        self._factories: Dict[str, str | ConnectorFactory] = dict(
+            BUILTIN_CONNECTORS if builtins is None else builtins
+        )
+        self._group = group
+        self._discovered = group is None
+        self._shared = shared
+        self._instances: Dict[str, BaseConnector] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: str | ConnectorFactory) -> None:
+        with self._lock:
+            self._discover()
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._discover()
+            self._factories.pop(name, None)
+            self._instances.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Registered source names, without importing any connector."""
+        with self._lock:
+            self._discover()
+            return list(self._factories)
+
+    def get(self, name: str) -> BaseConnector:
+        connector = self._instances.get(name)
+        if connector is not None:
+            return connector
+
+        with self._lock:
+            connector = self._instances.get(name)
+            if connector is None:
+                self._discover()
+                try:
+                    factory = self._factories[name]
+                except KeyError:
+                    raise UnknownConnectorError(name) from None
+
+                if isinstance(factory, str):
+                    factory = _load(factory)
+                connector = self._instances[name] = factory(**self._shared)
+
+            return connector
+
+    def loaded(self) -> Dict[str, BaseConnector]:
+        """Connectors instantiated so far."""
+        with self._lock:
+            return dict(self._instances)
+
+    def _discover(self) -> None:
+        # Scanning installed distributions costs a few ms: do it on first use
+        if self._discovered:
+            return
+        self._discovered = True
+
+        for entry_point in entry_points(group=self._group):
+            self._factories[entry_point.name] = entry_point.value
+
+
+def _load(reference: str) -> ConnectorFactory:
+    module_name, _, attr = reference.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from omnibridge.accounts.models import Account
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class _Entry:
+    access_token: str
+    idle: List[Any] = field(default_factory=list)
+
+
+class ServiceCache:
+    """
+    Bounded LRU cache of built provider API clients, keyed by account.
+
+    Clients are leased rather than shared: the underlying HTTP objects are
+    not thread-safe, so concurrent calls for the same account each get
+    their own client and return it to a small idle pool afterwards.
+    An entry is dropped as soon as the account's access token changes.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Account], Any],
+        max_accounts: int = 256,
+        max_idle_per_account: int = 2,
+    ):
+        self._factory = factory
+        self._max_accounts = max_accounts
+        self._max_idle = max_idle_per_account
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def lease(self, account: Account) -> Iterator[Any]:
+        key = (account.user_id, account.provider)
+        service = self._checkout(key, account.access_token)
+
+        if service is None:
+            service = self._factory(account)
+
+        try:
+            yield service
+        finally:
+            self._checkin(key, account.access_token, service)
+
+    def invalidate(self, user_id: str, provider: str) -> None:
+        with self._lock:
+            self._entries.pop((user_id, provider), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _checkout(self, key: CacheKey, access_token: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry.access_token != access_token:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+
+            if not entry.idle:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry.idle.pop()
+
+    def _checkin(self, key: CacheKey, access_token: str, service: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                entry = _Entry(access_token=access_token)
+                self._entries[key] = entry
+            elif entry.access_token != access_token:
+                # Token was replaced while this client was in use
+                return
+
+            self._entries.move_to_end(key)
+
+            if len(entry.idle) < self._max_idle:
+                entry.idle.append(service)
+
+            while len(self._entries) > self._max_accounts:
+                self._entries.popitem(last=False)
+                self.evictions += 1
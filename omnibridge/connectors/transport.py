@@ -0,0 +1,213 @@
+import importlib.util
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+if TYPE_CHECKING:
+    import httplib2
+
+HostKey = Tuple[str, str, int]  # (scheme, host, port)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional h2 package is installed
+    return importlib.util.find_spec("h2") is not None
+
+
+class _HostPool:
+    """
+    One keep-alive httpx client for a single provider host, plus the
+    bookkeeping behind HttpTransport.stats().
+    """
+
+    def __init__(self, client: httpx.Client, max_connections: int):
+        self.client = client
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.lock = threading.Lock()
+
+        self.in_use = 0
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+
+class HttpTransport:
+    """
+    Shared, pooled HTTP transport for provider API calls.
+
+    Each provider host gets its own httpx client with a bounded pool of
+    keep-alive connections (HTTP/2 when available), so requests for any
+    account reuse warm connections instead of paying a new TCP+TLS
+    handshake each time. Callers past the pool limit wait for a free
+    connection; the time they spend waiting is reported by stats().
+
+    The transport is thread-safe and meant to be shared by every
+    connector in the process; close() releases all connections.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        pool_timeout: float = 10.0,
+        http2: bool = True,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.http2 = http2 and http2_available()
+
+        self._pools: Dict[HostKey, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        content: Any = None,
+        headers: Dict[str, str] | None = None,
+    ) -> httpx.Response:
+        pool = self._pool_for(url)
+
+        started = time.perf_counter()
+        if not pool.slots.acquire(timeout=self.pool_timeout):
+            raise httpx.PoolTimeout(f"No free connection to {url}")
+        waited = time.perf_counter() - started
+
+        with pool.lock:
+            pool.in_use += 1
+            pool.requests += 1
+            if waited > 0.001:
+                pool.waits += 1
+            pool.wait_seconds += waited
+            pool.max_wait_seconds = max(pool.max_wait_seconds, waited)
+
+        try:
+            response = pool.client.request(
+                method, url, content=content, headers=headers
+            )
+            # Read the body now so the connection goes back to the pool
+            response.read()
+            return response
+        finally:
+            with pool.lock:
+                pool.in_use -= 1
+            pool.slots.release()
+
+    def authorized(self, access_token: str) -> "AuthorizedHttp":
+        return AuthorizedHttp(self, access_token)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Pool metrics per host: open/idle/in-use connections, request
+        count and time spent waiting for a free connection.
+        """
+        with self._lock:
+            pools = dict(self._pools)
+
+        stats = {}
+        for (scheme, host, port), pool in pools.items():
+            connections = _pool_connections(pool.client)
+            with pool.lock:
+                stats[f"{scheme}://{host}:{port}"] = {
+                    "open": len(connections),
+                    "idle": sum(1 for c in connections if c.is_idle()),
+                    "in_use": pool.in_use,
+                    "requests": pool.requests,
+                    "waits": pool.waits,
+                    "wait_seconds": round(pool.wait_seconds, 6),
+                    "max_wait_seconds": round(pool.max_wait_seconds, 6),
+                }
+
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+
+        for pool in pools:
+            pool.client.close()
+
+    def _pool_for(self, url: str) -> _HostPool:
+        parts = urlsplit(url)
+        key = (
+            parts.scheme,
+            parts.hostname or "",
+            parts.port or DEFAULT_PORTS.get(parts.scheme, 0),
+        )
+
+        with self._lock:
+            pool = self._pools.get(key)
+
+            if pool is None:
+                client = httpx.Client(
+                    http2=self.http2,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                )
+                pool = _HostPool(client, self.max_connections)
+                self._pools[key] = pool
+
+            return pool
+
+
+class AuthorizedHttp:
+    """
+    httplib2.Http look-alike for googleapiclient that sends requests
+    through a shared HttpTransport with one account's bearer token.
+    """
+
+    def __init__(self, transport: HttpTransport, access_token: str):
+        self.transport = transport
+        self._authorization = f"Bearer {access_token}"
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Dict[str, str] | None = None,
+        **kwargs,
+    ) -> Tuple["httplib2.Response", bytes]:
+        # Deferred: only googleapiclient-based connectors need it
+        import httplib2
+
+        headers = dict(headers or {})
+        headers["authorization"] = self._authorization
+
+        response = self.transport.request(
+            method, uri, content=body, headers=headers
+        )
+
+        info = dict(response.headers)
+        info["status"] = response.status_code
+        resp = httplib2.Response(info)
+        resp.reason = response.reason_phrase
+
+        return resp, response.content
+
+    def close(self) -> None:
+        # Connections belong to the shared transport
+        pass
+
+
+def _pool_connections(client: httpx.Client) -> list:
+    # httpx does not expose pool state publicly; read it off httpcore
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    return list(getattr(pool, "connections", []))
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict
+
+from omnibridge.core.metrics import registry
+
+SHED_QUEUE_FULL = "queue_full"
+SHED_USER_LIMIT = "user_limit"
+SHED_DEADLINE = "deadline"
+SHED_TIMEOUT = "timeout"
+
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "omnibridge_admission_queue_wait_seconds",
+    "Time admitted requests waited in the admission queue.",
+    labelnames=("route",),
+)
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of admitted. reason is one of
+    the SHED_* constants; retry_after is a hint in seconds.
+    """
+
+    def __init__(self, route: str, reason: str, retry_after: float):
+        super().__init__(f"{route} is overloaded ({reason}), retry later")
+        self.route = route
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Deadline:
+    """The point by which a request must be answered."""
+
+    __slots__ = ("at", "_clock")
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.at = clock() + timeout
+
+    def time_left(self) -> float:
+        return max(0.0, self.at - self._clock())
+
+
+class AdmissionController:
+    """
+    Concurrency limit for one route, with a bounded wait queue.
+
+    Up to max_concurrency requests run at once and up to max_queue more
+    wait. Waiters are queued per user and served round-robin across
+    users, and a user may hold at most max_per_user running or queued
+    requests, so one heavy user cannot crowd everyone else out.
+
+    Requests are shed with AdmissionRejected rather than queued when the
+    queue is full, when the user is at their limit, or when the expected
+    wait (queue length times a moving average of service time) would
+    already overrun their deadline; a request whose deadline passes while
+    it is queued is shed too. Single event loop only.
+    """
+
+    def __init__(
+        self,
+        route: str,
+        max_concurrency: int,
+        max_queue: int,
+        max_per_user: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.route = route
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self._clock = clock
+
+        self._active = 0
+        self._queued = 0
+        # user_id -> requests running or queued
+        self._per_user: Dict[str, int] = {}
+        # user_id -> waiters, in the order users are served next
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        # Moving average of how long an admitted request holds its slot
+        self._service_time: float | None = None
+
+        self.admitted = 0
+        self.shed: Dict[str, int] = {}
+
+    def estimated_wait(self) -> float:
+        """Rough queueing delay for a request arriving now."""
+        if self._active < self.max_concurrency and not self._queued:
+            return 0.0
+        if self._service_time is None:
+            return 0.0
+        return (self._queued / self.max_concurrency + 1) * self._service_time
+
+    async def acquire(self, user_id: str, deadline: Deadline) -> None:
+        held = self._per_user.get(user_id, 0)
+        if held >= self.max_per_user:
+            self._reject(SHED_USER_LIMIT, self.estimated_wait())
+
+        if self._active < self.max_concurrency and not self._queued:
+            self._admit(user_id)
+            return
+
+        if self._queued >= self.max_queue:
+            self._reject(SHED_QUEUE_FULL, self.estimated_wait())
+
+        wait = self.estimated_wait()
+        if wait > deadline.time_left():
+            self._reject(SHED_DEADLINE, wait)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self._queued += 1
+        self._per_user[user_id] = held + 1
+        queued_at = self._clock()
+
+        try:
+            await asyncio.wait_for(waiter, deadline.time_left())
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we gave up: pass it on
+                self.release(user_id)
+            else:
+                self._dequeue(user_id, waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._reject(SHED_TIMEOUT, self.estimated_wait())
+            raise
+
+        # release() moved the slot (and the per-user count) to us
+        self.admitted += 1
+        QUEUE_WAIT_SECONDS.observe(self._clock() - queued_at, self.route)
+
+    def release(self, user_id: str, service_time: float | None = None) -> None:
+        if service_time is not None:
+            if self._service_time is None:
+                self._service_time = service_time
+            else:
+                self._service_time += 0.2 * (service_time - self._service_time)
+
+        self._forget(user_id)
+
+        # Hand the slot straight to the next user's oldest waiter
+        while self._queues:
+            next_user, waiters = next(iter(self._queues.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                self._queues.move_to_end(next_user)
+            else:
+                del self._queues[next_user]
+
+            self._queued -= 1
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+            # Cancelled before it was handed a slot
+            self._forget(next_user)
+
+        self._active -= 1
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "service_time": self._service_time or 0.0,
+        }
+
+    def _admit(self, user_id: str) -> None:
+        self._active += 1
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        self.admitted += 1
+
+    def _forget(self, user_id: str) -> None:
+        held = self._per_user.get(user_id, 0) - 1
+        if held > 0:
+            self._per_user[user_id] = held
+        else:
+            self._per_user.pop(user_id, None)
+
+    def _dequeue(self, user_id: str, waiter: asyncio.Future) -> None:
+        waiters = self._queues.get(user_id)
+        if waiters is None or waiter not in waiters:
+            return
+
+        waiters.remove(waiter)
+        if not waiters:
+            del self._queues[user_id]
+        self._queued -= 1
+        self._forget(user_id)
+
+    def _reject(self, reason: str, retry_after: float) -> None:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        raise AdmissionRejected(self.route, reason, retry_after)
@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a provider whose circuit is open.
+    retry_after is the time in seconds until a trial call is allowed.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is temporarily unavailable")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def _always_failure(exc: Exception) -> bool:
+    return True
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for one provider.
+
+    The outcome of the last `window_size` calls is kept; once at least
+    `minimum_calls` are recorded, the circuit opens when the share of
+    failures reaches `failure_rate_threshold` or the share of calls slower
+    than `slow_call_seconds` reaches `slow_call_rate_threshold`. An open
+    circuit rejects calls for `open_seconds`, then lets `half_open_calls`
+    trial calls through: if they all succeed quickly it closes again,
+    otherwise it reopens.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 3.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        is_failure: Callable[[Exception], bool] = _always_failure,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        # Whether an error counts against provider health; others (e.g. an
+        # unlinked account) are passed through without a verdict
+        self.is_failure = is_failure
+        self._clock = clock
+
+        # (failed, slow) per call, newest last
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._current_state() != STATE_OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - self._clock())
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.before_call()
+
+        started = self._clock()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Gave up waiting: no verdict
+            self.release()
+            raise
+        except Exception as exc:
+            if self.is_failure(exc):
+                self.record(self._clock() - started, failed=True)
+            else:
+                self.release()
+            raise
+
+        self.record(self._clock() - started, failed=False)
+        return result
+
+    def before_call(self) -> None:
+        """
+        Reserve permission for one call; raises CircuitOpenError if the
+        circuit is open or all half-open trial slots are taken.
+        """
+        with self._lock:
+            state = self._current_state()
+
+            if state == STATE_HALF_OPEN:
+                if self._trials < self.half_open_calls:
+                    self._trials += 1
+                    return
+            elif state == STATE_CLOSED:
+                return
+
+            self.rejected += 1
+            retry_after = max(
+                0.0, self._opened_at + self.open_seconds - self._clock()
+            )
+
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, elapsed: float, failed: bool) -> None:
+        slow = elapsed >= self.slow_call_seconds
+
+        with self._lock:
+            state = self._current_state()
+
+            if state == STATE_HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                    return
+
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._state = STATE_CLOSED
+                    self._window.clear()
+                return
+
+            if state == STATE_OPEN:
+                # A call that started before the circuit opened
+                return
+
+            self._window.append((failed, slow))
+
+            if len(self._window) >= self.minimum_calls:
+                total = len(self._window)
+                failures = sum(1 for f, _ in self._window if f)
+                slow_calls = sum(1 for _, s in self._window if s)
+
+                if (
+                    failures / total >= self.failure_rate_threshold
+                    or slow_calls / total >= self.slow_call_rate_threshold
+                ):
+                    self._open()
+
+    def release(self) -> None:
+        """Give back a call slot without recording an outcome."""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN and self._trials > self._trial_successes:
+                self._trials -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = len(self._window)
+            return {
+                "state": self._current_state(),
+                "calls": total,
+                "failures": sum(1 for f, _ in self._window if f),
+                "slow_calls": sum(1 for _, s in self._window if s),
+                "rejected": self.rejected,
+                "opened": self.opened,
+            }
+
+    def _current_state(self) -> str:
+        if (
+            self._state == STATE_OPEN
+            and self._clock() >= self._opened_at + self.open_seconds
+        ):
+            self._state = STATE_HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+
+        return self._state
+
+    def _open(self) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = self._clock()
+        self._window.clear()
+        self.opened += 1
+
+
+class CircuitBreakers:
+    """
+    One CircuitBreaker per provider, created on first use with shared
+    settings (overridable per provider).
+    """
+
+    def __init__(
+        self,
+        overrides: Dict[str, Dict[str, Any]] | None = None,
+        **defaults: Any,
+    ):
+        self._overrides = overrides or {}
+        self._defaults = defaults
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_provider(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+
+            if breaker is None:
+                settings = {**self._defaults, **self._overrides.get(name, {})}
+                breaker = CircuitBreaker(name, **settings)
+                self._breakers[name] = breaker
+
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
@@ -0,0 +1,147 @@
+import os
+
+# Token store backend: "memory" (per process, lost on restart) or "sqlite"
+# (durable, shared by every worker pointed at the same file)
+TOKEN_STORE_BACKEND = os.environ.get("OMNIBRIDGE_TOKEN_STORE", "memory")
+TOKEN_STORE_SQLITE_PATH = os.environ.get(
+    "OMNIBRIDGE_TOKEN_STORE_PATH", "omnibridge.db"
+)
+
+# Gmail REST root; unset means Google's. Point it at a proxy or at a local
+# fake server (see benchmarks/load_test.py).
+GMAIL_API_ENDPOINT = os.environ.get("OMNIBRIDGE_GMAIL_API_ENDPOINT") or None
+
+# Gmail push notifications
+# With a Pub/Sub topic set, every synced mailbox is watched and Gmail pushes
+# changes to POST /notifications/gmail; a watched mailbox is served from its
+# last sync without asking Gmail for up to MAX_STALENESS (in case a
+# notification is lost). The endpoint is only mounted when the
+# verification token is set; Pub/Sub must pass it as ?token=.
+GMAIL_PUSH_TOPIC = os.environ.get("OMNIBRIDGE_GMAIL_PUSH_TOPIC") or None
+GMAIL_PUSH_VERIFICATION_TOKEN = (
+    os.environ.get("OMNIBRIDGE_GMAIL_PUSH_VERIFICATION_TOKEN") or None
+)
+GMAIL_PUSH_MAX_STALENESS_SECONDS = 300.0
+
+# Unified search fan-out
+# Every connector gets its own deadline; whatever finishes in time is returned.
+SEARCH_DEFAULT_DEADLINE_SECONDS = 5.0
+SEARCH_CONNECTOR_DEADLINES: dict[str, float] = {
+    # "gmail": 3.0,
+}
+
+# Unified search result cache
+SEARCH_CACHE_DEFAULT_TTL_SECONDS = 30.0
+SEARCH_CACHE_TTL_SECONDS: dict[str, float] = {
+    "gmail": 60.0,
+}
+SEARCH_CACHE_MAX_ENTRIES = 1024
+# Shared tier behind each worker's cache: "memory" (none, per process) or
+# "sqlite" (a file on local disk every worker on the node reads and writes).
+# A worker re-checks the shared tier after LOCAL_TTL, so results another
+# worker replaced or invalidated are served for at most that long.
+SEARCH_CACHE_BACKEND = os.environ.get("OMNIBRIDGE_RESULT_CACHE", "memory")
+SEARCH_CACHE_SQLITE_PATH = os.environ.get(
+    "OMNIBRIDGE_RESULT_CACHE_PATH", "omnibridge-cache.db"
+)
+SEARCH_CACHE_SHARED_MAX_ENTRIES = 100000
+SEARCH_CACHE_LOCAL_TTL_SECONDS = 5.0
+
+# Local search index
+# A source's snapshot counts as fresh for its result cache TTL; after that
+# /search answers from the index and refreshes the source in the background.
+SEARCH_RESULT_LIMIT = 50
+SEARCH_INDEX_MAX_USERS = 1000
+
+# Background prefetch for recently active users
+# Users are ranked by request frequency (halving every HALF_LIFE); every
+# INTERVAL the top ones get sources that would go stale before the next
+# round fetched ahead of time, within CALLS_PER_MINUTE connector fetches
+# (0 disables prefetching) and MAX_CONCURRENCY at once. A round looks at
+# no more than MAX_USERS_PER_ROUND users.
+PREFETCH_INTERVAL_SECONDS = 20.0
+PREFETCH_CALLS_PER_MINUTE = float(
+    os.environ.get("OMNIBRIDGE_PREFETCH_CALLS_PER_MINUTE", "60")
+)
+PREFETCH_MAX_CONCURRENCY = 4
+PREFETCH_MAX_USERS = 10000
+PREFETCH_MAX_USERS_PER_ROUND = 500
+PREFETCH_HALF_LIFE_SECONDS = 600.0
+PREFETCH_IDLE_AFTER_SECONDS = 3600.0
+
+# OAuth token refresh
+# Tokens are refreshed this long before they expire, in the background
+TOKEN_REFRESH_LEAD_SECONDS = 300.0
+TOKEN_REFRESH_RETRY_SECONDS = 60.0
+GOOGLE_OAUTH_TOKEN_URI = os.environ.get(
+    "OMNIBRIDGE_GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token"
+)
+GOOGLE_OAUTH_CLIENT_ID = os.environ.get("OMNIBRIDGE_GOOGLE_CLIENT_ID", "")
+GOOGLE_OAUTH_CLIENT_SECRET = os.environ.get("OMNIBRIDGE_GOOGLE_CLIENT_SECRET", "")
+
+# Pagination
+# Page sizes for /sources and for deep /search pages fetched from providers
+SOURCES_DEFAULT_PAGE_SIZE = 20
+SOURCES_MAX_PAGE_SIZE = 100
+
+# Shared HTTP transport for provider APIs
+# One keep-alive pool per provider host, shared by every connector.
+# HTTP/2 is used when the optional h2 package is installed.
+HTTP_POOL_MAX_CONNECTIONS = 20
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS = 30.0
+HTTP_POOL_TIMEOUT_SECONDS = 10.0
+HTTP_REQUEST_TIMEOUT_SECONDS = 10.0
+HTTP_ENABLE_HTTP2 = True
+
+# Provider rate limits
+# Token buckets as (tokens per second, burst), in provider quota units.
+# Gmail allows 250 units per user per second; the project-wide quota is
+# left to Google unless set here.
+RATE_LIMITS_PER_ACCOUNT: dict[str, tuple[float, float]] = {
+    "google": (250.0, 250.0),
+}
+RATE_LIMITS_PER_PROVIDER: dict[str, tuple[float, float]] = {
+    # "google": (20000.0, 20000.0),
+}
+# Callers queue this long for quota before the call fails as rate limited
+RATE_LIMIT_MAX_WAIT_SECONDS = 2.0
+# Retries after a provider 429/403 rateLimitExceeded, with jittered backoff
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 0.5
+RATE_LIMIT_BACKOFF_MAX_SECONDS = 30.0
+
+# Circuit breakers around connector calls, one per source
+# A source whose recent calls mostly fail (or are mostly slow) is skipped
+# for CIRCUIT_OPEN_SECONDS; /search and /sources answer "degraded" with
+# the last data they have instead of waiting on it.
+CIRCUIT_FAILURE_RATE_THRESHOLD = 0.5
+CIRCUIT_SLOW_CALL_SECONDS = 3.0
+CIRCUIT_SLOW_CALL_RATE_THRESHOLD = 0.8
+CIRCUIT_WINDOW_SIZE = 20
+CIRCUIT_MINIMUM_CALLS = 5
+CIRCUIT_OPEN_SECONDS = 30.0
+CIRCUIT_HALF_OPEN_CALLS = 1
+CIRCUIT_OVERRIDES: dict[str, dict] = {
+    # "gmail": {"open_seconds": 10.0},
+}
+
+# Admission control for /search and /sources
+# Per route: requests running at once and how many more may queue. Queued
+# requests are served round-robin across users, and one user may hold at
+# most MAX_PER_USER running or queued requests per route. A request is shed
+# with 503 + Retry-After when the queue is full or its expected wait would
+# overrun its deadline: the client's X-Request-Timeout header (seconds),
+# else DEFAULT_TIMEOUT, capped at MAX_TIMEOUT. Connector calls made for the
+# request get no more than the time it has left.
+ADMISSION_LIMITS: dict[str, dict] = {
+    "search": {"max_concurrency": 64, "max_queue": 128},
+    "sources": {"max_concurrency": 64, "max_queue": 128},
+}
+ADMISSION_MAX_PER_USER = 8
+ADMISSION_DEFAULT_TIMEOUT_SECONDS = 10.0
+ADMISSION_MAX_TIMEOUT_SECONDS = 60.0
+
+# Sync connectors run on their own bounded thread pool when called from
+# async handlers, instead of competing for FastAPI's default threadpool
+CONNECTOR_BRIDGE_MAX_WORKERS = 32
@@ -0,0 +1,54 @@
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Dict
+
+from omnibridge.auth.config import CURSOR_SECRET_KEY
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(body: str) -> str:
+    digest = hmac.new(CURSOR_SECRET_KEY.encode(), body.encode(), hashlib.sha256)
+    return _b64encode(digest.digest()[:16])
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Opaque, tamper-proof continuation cursor: base64url JSON plus an
+    HMAC-SHA256 tag. Callers should include the user id in `data` and
+    check it on decode so cursors cannot be replayed across users.
+    """
+    body = _b64encode(json.dumps(data, separators=(",", ":")).encode())
+    return f"{body}.{_sign(body)}"
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    body, _, signature = cursor.partition(".")
+
+    # compare_digest only accepts ASCII str: compare bytes instead
+    if not body or not hmac.compare_digest(
+        signature.encode(), _sign(body).encode()
+    ):
+        raise InvalidCursorError("Invalid cursor")
+
+    try:
+        data = json.loads(_b64decode(body))
+    except ValueError:
+        raise InvalidCursorError("Invalid cursor")
+
+    if not isinstance(data, dict):
+        raise InvalidCursorError("Invalid cursor")
+
+    return data
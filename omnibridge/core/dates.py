@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_tz
+from typing import Dict, List, Sequence
+
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun",
+         "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+# Obsolete zone names still allowed by RFC 2822 (section 4.3), in minutes
+ZONE_NAMES = {
+    "ut": 0, "utc": 0, "gmt": 0, "z": 0,
+    "est": -300, "edt": -240, "cst": -360, "cdt": -300,
+    "mst": -420, "mdt": -360, "pst": -480, "pdt": -420,
+}
+
+# Zone as written ("+0530", "EST") -> offset, built as zones are first seen
+_OFFSETS: Dict[str, timedelta] = {}
+
+
+def _digits(text: str) -> bool:
+    # str.isdigit() alone also accepts "²" or "١", which int() may reject
+    return text.isascii() and text.isdigit()
+
+
+def _offset_minutes(zone: str) -> int | None:
+    if zone[:1] in "+-" and len(zone) == 5 and _digits(zone[1:]):
+        minutes = int(zone[1:3]) * 60 + int(zone[3:5])
+        return -minutes if zone[0] == "-" else minutes
+
+    return ZONE_NAMES.get(zone.lower())
+
+
+def _parse(value: str) -> datetime | None:
+    """
+    Hand-written parser for the common shape of an RFC 2822 date:
+    "[Mon, ]15 Jan 2024 12:34[:56] +0530 [(IST)]". Returns a UTC datetime,
+    or None for anything else (handled by the slower fallback).
+    """
+    parts = value.split()
+    # Optional day of week, with or without its comma
+    if parts and not parts[0][:1].isdigit():
+        del parts[0]
+    if len(parts) < 5:
+        return None
+
+    day, month, year, clock, zone = parts[:5]
+    offset = _OFFSETS.get(zone)
+    if offset is None:
+        minutes = _offset_minutes(zone)
+        if minutes is None:
+            return None
+        offset = _OFFSETS[zone] = timedelta(minutes=minutes)
+
+    month_number = MONTHS.get(month[:3].lower())
+    if month_number is None or not _digits(day) or not _digits(year):
+        return None
+
+    year_number = int(year)
+    if len(year) == 2:
+        # Obsolete two-digit years (RFC 2822 section 4.3)
+        year_number += 2000 if year_number < 50 else 1900
+    elif len(year) == 3:
+        year_number += 1900
+
+    if len(clock) == 8 and clock[2] == ":" and clock[5] == ":":
+        hour, minute, second = clock[:2], clock[3:5], clock[6:]
+    else:
+        fields = clock.split(":")
+        if not 2 <= len(fields) <= 3:
+            return None
+        hour, minute = fields[:2]
+        second = fields[2] if len(fields) == 3 else "0"
+    if not (_digits(hour) and _digits(minute) and _digits(second)):
+        return None
+
+    try:
+        return datetime(
+            year_number,
+            month_number,
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            tzinfo=timezone.utc,
+        ) - offset
+    except (ValueError, OverflowError):
+        # 31 Feb, 25:00, a leap second, or out of range once shifted
+        return None
+
+
+def _parse_fallback(value: str) -> datetime | None:
+    # Slow but lenient: odd spacing, dashes, missing zone...
+    try:
+        parsed = parsedate_tz(value)
+    except (ValueError, TypeError, IndexError):
+        return None
+    if parsed is None:
+        return None
+
+    try:
+        moment = datetime(*parsed[:6], tzinfo=timezone.utc)
+        return moment - timedelta(seconds=parsed[9] or 0)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _parse_header(value: str) -> datetime | None:
+    # A hostile header must not fail the whole batch: anything the fast
+    # path chokes on goes to the fallback
+    try:
+        parsed = _parse(value)
+    except (ValueError, OverflowError):
+        parsed = None
+
+    return parsed or _parse_fallback(value)
+
+
+def parse_rfc2822(value: str | None) -> datetime | None:
+    """An RFC 2822 date header as an aware UTC datetime, or None."""
+    if not value:
+        return None
+
+    return _parse_header(value)
+
+
+def from_epoch_millis(value: str | int | None) -> datetime | None:
+    """Gmail's internalDate (milliseconds since the epoch, as a string)."""
+    try:
+        seconds = int(value) // 1000
+    except (TypeError, ValueError):
+        return None
+
+    try:
+        return datetime.fromtimestamp(seconds, timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def normalize_timestamps(
+    date_headers: Sequence[str | None],
+    internal_dates: Sequence[str | int | None],
+) -> List[str | None]:
+    """
+    ISO 8601 UTC timestamps ("2024-01-15T07:04:56+00:00") for a batch of
+    messages, from each one's Date header or, when that is missing or
+    unparseable, its internalDate. Every value shares one offset, so the
+    strings sort chronologically.
+    """
+    timestamps: List[str | None] = []
+    append = timestamps.append
+    parse = _parse_header
+
+    for header, internal_date in zip(date_headers, internal_dates):
+        moment = None
+        if header:
+            moment = parse(header)
+        if moment is None:
+            moment = from_epoch_millis(internal_date)
+
+        append(moment.isoformat() if moment is not None else None)
+
+    return timestamps
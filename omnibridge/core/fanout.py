@@ -0,0 +1,131 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from omnibridge.connectors.base import AccountNotLinkedError
+from omnibridge.connectors.rate_limit import RateLimitExceeded
+from omnibridge.core.circuit_breaker import CircuitOpenError
+from omnibridge.core.metrics import registry
+
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_NOT_LINKED = "not_linked"
+STATUS_RATE_LIMITED = "rate_limited"
+STATUS_DEGRADED = "degraded"
+
+# A source call: a coroutine function returning the source's results
+SourceCall = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+SOURCE_SECONDS = registry.histogram(
+    "omnibridge_source_call_duration_seconds",
+    "Time until a fanned-out source call finished, by outcome.",
+    labelnames=("source", "status"),
+)
+
+
+@dataclass
+class SourceOutcome:
+    source: str
+    status: str
+    elapsed_ms: float
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+    cached: bool = False
+    retry_after: float | None = None
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "cached": self.cached,
+        }
+        if self.error:
+            summary["error"] = self.error
+        if self.retry_after is not None:
+            summary["retry_after"] = round(self.retry_after, 3)
+        return summary
+
+
+async def run_source(
+    source: str,
+    call: SourceCall,
+    deadline: float,
+) -> SourceOutcome:
+    """
+    Run one connector call on the event loop, bounded by deadline.
+
+    A call that overruns its deadline is cancelled and reported as a
+    timeout.
+    """
+    started = time.perf_counter()
+    retry_after = None
+
+    try:
+        results = await asyncio.wait_for(call(), timeout=deadline)
+        status, error = STATUS_OK, None
+    except asyncio.TimeoutError:
+        results, status, error = [], STATUS_TIMEOUT, None
+    except AccountNotLinkedError:
+        results, status, error = [], STATUS_NOT_LINKED, None
+    except RateLimitExceeded as exc:
+        results, status, error = [], STATUS_RATE_LIMITED, str(exc)
+        retry_after = exc.retry_after
+    except CircuitOpenError as exc:
+        results, status, error = [], STATUS_DEGRADED, str(exc)
+        retry_after = exc.retry_after
+    except Exception as exc:
+        results, status, error = [], STATUS_ERROR, str(exc)
+
+    elapsed = time.perf_counter() - started
+    SOURCE_SECONDS.observe(elapsed, source, status)
+
+    return SourceOutcome(
+        source=source,
+        status=status,
+        elapsed_ms=elapsed * 1000,
+        results=results,
+        error=error,
+        retry_after=retry_after,
+    )
+
+
+async def fan_out(
+    calls: Dict[str, SourceCall],
+    deadlines: Dict[str, float],
+) -> List[SourceOutcome]:
+    """
+    Run every source call concurrently and collect outcomes in input order.
+
+    Total latency is bounded by the largest deadline, not the sum of calls.
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                run_source(source, call, deadlines[source])
+                for source, call in calls.items()
+            )
+        )
+    )
+
+
+async def fan_out_as_completed(
+    calls: Dict[str, SourceCall],
+    deadlines: Dict[str, float],
+) -> AsyncIterator[SourceOutcome]:
+    """
+    Like fan_out, but yields each outcome as soon as its source finishes.
+    """
+    tasks = [
+        asyncio.create_task(run_source(source, call, deadlines[source]))
+        for source, call in calls.items()
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: stop waiting on the rest
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,230 @@
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Seconds; spans from sub-millisecond cache hits to multi-second provider calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+@dataclass
+class MetricFamily:
+    """
+    One metric as rendered on /metrics: a name, a Prometheus type
+    ("counter", "gauge" or "histogram") and its labelled samples.
+    """
+
+    name: str
+    type: str
+    help: str
+    # (sample name, labels, value); histograms add _bucket/_sum/_count
+    samples: List[Tuple[str, Dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: str) -> None:
+        self.samples.append((self.name + suffix, labels, value))
+
+
+Collector = Callable[[], List[MetricFamily]]
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[MetricFamily]:
+        family = MetricFamily(self.name, "counter", self.help)
+        with self._lock:
+            for labels, value in self._values.items():
+                family.add(value, **dict(zip(self.labelnames, labels)))
+        return [family]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, one series per label tuple. observe()
+    is a bisect and three additions under a lock, cheap enough for every
+    request and every span.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [
+                    [0] * (len(self.buckets) + 1), 0.0, 0
+                ]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, *labels: str) -> Dict[str, float]:
+        """Count and sum of one series (zeros if never observed)."""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": series[2], "sum": series[1]}
+
+    def collect(self) -> List[MetricFamily]:
+        family = MetricFamily(self.name, "histogram", self.help)
+
+        with self._lock:
+            series = [
+                (labels, list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+        for labels, counts, total, count in series:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                family.add(cumulative, "_bucket", **base, le=_format_value(bound))
+            family.add(count, "_bucket", **base, le="+Inf")
+            family.add(total, "_sum", **base)
+            family.add(count, "_count", **base)
+
+        return [family]
+
+
+class MetricsRegistry:
+    """
+    Metrics owned by the app plus collectors that report other
+    components' stats() at scrape time, rendered in the Prometheus text
+    exposition format.
+    """
+
+    def __init__(self):
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        counter = Counter(name, help, labelnames)
+        self.register(counter.collect)
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, help, labelnames, buckets)
+        self.register(histogram.collect)
+        return histogram
+
+    def register(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            collectors = list(self._collectors)
+
+        families: List[MetricFamily] = []
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape_help(family.help)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+
+            for name, labels, value in family.samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# SINGLE registry for the process, scraped by GET /metrics
+registry = MetricsRegistry()
+
+SPAN_SECONDS = registry.histogram(
+    "omnibridge_span_duration_seconds",
+    "Time spent in one stage of request handling.",
+    labelnames=("span",),
+)
+
+
+class span:
+    """
+    Times the enclosed block as stage `name` (e.g. "jwt.verify",
+    "gmail.messages.list"), including blocks that raise. A plain class
+    rather than @contextmanager: it runs around every stage of every
+    request, and skipping the generator machinery nearly halves its cost.
+    """
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> "span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        SPAN_SECONDS.observe(time.perf_counter() - self.started, self.name)
+
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (user_id, source)
+WarmJob = Tuple[str, str]
+
+
+class ActivityTracker:
+    """
+    Recently active users, ranked by how often they make requests.
+
+    Every request adds 1 to its user's score, and scores halve every
+    half_life seconds: a user who searches all day outranks one who made
+    a single request a minute ago, and both fade once they stop (a mix of
+    LFU and LRU). Users idle for longer than idle_after are not ranked;
+    past max_users the least recently seen user is forgotten.
+    """
+
+    def __init__(
+        self,
+        max_users: int,
+        half_life: float,
+        idle_after: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_users = max_users
+        self._half_life = half_life
+        self._idle_after = idle_after
+        self._clock = clock
+        # user_id -> [score as of last_seen, last_seen], oldest first
+        self._users: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def touch(self, user_id: str) -> None:
+        now = self._clock()
+
+        with self._lock:
+            entry = self._users.get(user_id)
+
+            if entry is None:
+                self._users[user_id] = [1.0, now]
+                if len(self._users) > self._max_users:
+                    self._users.popitem(last=False)
+                return
+
+            entry[0] = self._decayed(entry, now) + 1.0
+            entry[1] = now
+            self._users.move_to_end(user_id)
+
+    def ranked(self) -> List[str]:
+        """Users active within idle_after, highest score first."""
+        now = self._clock()
+
+        with self._lock:
+            scores = {
+                user_id: self._decayed(entry, now)
+                for user_id, entry in self._users.items()
+                if now - entry[1] <= self._idle_after
+            }
+
+        return sorted(scores, key=scores.__getitem__, reverse=True)
+
+    def forget(self, user_id: str) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def _decayed(self, entry: List[float], now: float) -> float:
+        return entry[0] * 0.5 ** ((now - entry[1]) / self._half_life)
+
+
+class Prefetcher:
+    """
+    Keeps the most active users' sources warm before they come back.
+
+    Every `interval` seconds it walks the tracker's ranking and asks
+    targets(user_id) which of that user's sources need fetching (linked,
+    healthy, and about to go stale), then runs warm(user_id, source) for
+    them, at most max_concurrency at a time. Each round may start
+    calls_per_minute * interval / 60 fetches; whatever does not fit is
+    left for the next round, so upstream traffic stays within budget and
+    goes to the highest-ranked users first. The walk stops once the
+    budget is filled or max_users_per_round users were looked at, and
+    runs in a worker thread since targets() may hit the token store.
+    """
+
+    def __init__(
+        self,
+        activity: ActivityTracker,
+        targets: Callable[[str], List[str]],
+        warm: Callable[[str, str], Awaitable[bool]],
+        interval: float,
+        calls_per_minute: float,
+        max_concurrency: int,
+        max_users_per_round: int = 500,
+    ):
+        self.activity = activity
+        self.targets = targets
+        self.warm = warm
+        self.interval = interval
+        self.calls_per_minute = calls_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_users_per_round = max_users_per_round
+        self._task: asyncio.Task | None = None
+
+        self.rounds = 0
+        self.warmed = 0
+        self.failed = 0
+        self.deferred = 0
+
+    @property
+    def budget(self) -> int:
+        """Fetches each round may start."""
+        return int(self.calls_per_minute * self.interval / 60)
+
+    def plan(self) -> Tuple[List[WarmJob], int]:
+        """
+        This round's fetches in priority order, and how many wanted
+        fetches did not fit in the budget.
+        """
+        budget = self.budget
+        jobs: List[WarmJob] = []
+        deferred = 0
+
+        for user_id in self.activity.ranked()[:self.max_users_per_round]:
+            for source in self.targets(user_id):
+                if len(jobs) < budget:
+                    jobs.append((user_id, source))
+                else:
+                    deferred += 1
+
+            if len(jobs) >= budget:
+                break
+
+        return jobs, deferred
+
+    async def run_once(self) -> int:
+        """Run one round. Returns the number of sources warmed."""
+        jobs, deferred = await asyncio.to_thread(self.plan)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(user_id: str, source: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.warm(user_id, source)
+                except Exception:
+                    logger.exception("Prefetching %s for %s failed", source, user_id)
+                    return False
+
+        results = await asyncio.gather(*(run(*job) for job in jobs))
+        warmed = sum(results)
+
+        self.rounds += 1
+        self.warmed += warmed
+        self.failed += len(results) - warmed
+        self.deferred += deferred
+
+        return warmed
+
+    def start(self) -> None:
+        if self._task is not None or self.budget <= 0:
+            return
+
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked_users": len(self.activity),
+            "rounds": self.rounds,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "deferred": self.deferred,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Prefetch round failed")
@@ -0,0 +1,477 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from omnibridge.connectors.base import Page
+
+# (user_id, normalized query, source)
+CacheKey = Tuple[str, str, str]
+
+# Serialized results at least this large are zlib-compressed
+COMPRESS_MIN_BYTES = 512
+
+
+def normalize_query(query: str | None) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Shallow copy that keeps a Page's continuation token
+    next_page_token = getattr(results, "next_page_token", None)
+    if next_page_token:
+        return Page(results, next_page_token=next_page_token)
+    return list(results)
+
+
+def encode_results(results: List[Dict[str, Any]]) -> bytes:
+    """
+    Compact JSON, compressed when large enough to pay off. The first byte
+    says which (JSON rather than pickle: the shared file must not be able
+    to run code in the workers that read it). A Page's next_page_token
+    is kept alongside the records.
+    """
+    payload: Any = list(results)
+    next_page_token = getattr(results, "next_page_token", None)
+    if next_page_token:
+        payload = {"r": payload, "t": next_page_token}
+
+    data = json.dumps(payload, separators=(",", ":")).encode()
+
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(data, 1)
+    return b"j" + data
+
+
+def decode_results(blob: bytes) -> List[Dict[str, Any]]:
+    data = blob[1:]
+    if blob[:1] == b"z":
+        data = zlib.decompress(data)
+
+    payload = json.loads(data)
+    if isinstance(payload, dict):
+        return Page(payload["r"], next_page_token=payload["t"])
+    return payload
+
+
+@dataclass
+class _Entry:
+    results: List[Dict[str, Any]]
+    expires_at: float
+    # When the results were put, on the wall clock: a later put is newer
+    stored_at: float = 0.0
+    # Re-read the shared tier after this (inf: there is none)
+    check_at: float = float("inf")
+
+
+SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    user_id    TEXT NOT NULL,
+    query      TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    results    BLOB NOT NULL,
+    stored_at  REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, query, source)
+) WITHOUT ROWID
+"""
+
+SHARED_EXPIRY_INDEX = """
+CREATE INDEX IF NOT EXISTS result_cache_by_expiry ON result_cache (expires_at)
+"""
+
+# Files created before stored_at existed
+ADD_STORED_AT = (
+    "ALTER TABLE result_cache ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+)
+
+SELECT_ENTRY = (
+    "SELECT results, expires_at, stored_at FROM result_cache "
+    "WHERE user_id = ? AND query = ? AND source = ? AND expires_at > ?"
+)
+UPSERT_ENTRY = """
+INSERT INTO result_cache (user_id, query, source, expires_at, results, stored_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id, query, source) DO UPDATE SET
+    expires_at = excluded.expires_at,
+    results    = excluded.results,
+    stored_at  = excluded.stored_at
+"""
+DELETE_USER = "DELETE FROM result_cache WHERE user_id = ?"
+DELETE_EXPIRED = "DELETE FROM result_cache WHERE expires_at <= ?"
+# Past max_entries, drop the entries closest to expiring
+DELETE_OVERFLOW = """
+DELETE FROM result_cache WHERE expires_at <= (
+    SELECT expires_at FROM result_cache ORDER BY expires_at LIMIT 1 OFFSET ?
+)
+"""
+
+
+class SqliteResultStore:
+    """
+    Shared cache tier: results in a SQLite file (WAL mode) on local disk
+    that every worker process on the node opens.
+
+    Values are stored with encode_results(). Expiry times are wall-clock
+    seconds, since workers do not share a monotonic clock. Expired rows
+    are purged every `purge_every` writes, together with the entries
+    closest to expiring if there are more than max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int,
+        purge_every: int = 256,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self._max_entries = max_entries
+        self._purge_every = purge_every
+        self._clock = clock
+        self._writes = 0
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute(SHARED_SCHEMA)
+            conn.execute(SHARED_EXPIRY_INDEX)
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(result_cache)")
+            }
+            if "stored_at" not in columns:
+                conn.execute(ADD_STORED_AT)
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            "SELECT count(*) FROM result_cache"
+        ).fetchone()[0]
+
+    def get(
+        self,
+        key: CacheKey,
+    ) -> Tuple[List[Dict[str, Any]], float, float] | None:
+        """(results, expires_at, stored_at) of a live entry, or None."""
+        row = self._connection().execute(
+            SELECT_ENTRY, (*key, self._clock())
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return decode_results(row[0]), row[1], row[2]
+
+    def put(
+        self,
+        key: CacheKey,
+        results: List[Dict[str, Any]],
+        expires_at: float,
+        stored_at: float = 0.0,
+    ) -> None:
+        blob = encode_results(results)
+        self._connection().execute(
+            UPSERT_ENTRY, (*key, expires_at, blob, stored_at)
+        )
+
+        self._writes += 1
+        if self._writes % self._purge_every == 0:
+            self.purge()
+
+    def delete_user(self, user_id: str) -> int:
+        return self._connection().execute(DELETE_USER, (user_id,)).rowcount
+
+    def purge(self) -> None:
+        conn = self._connection()
+
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(DELETE_EXPIRED, (self._clock(),))
+            overflow = len(self) - self._max_entries
+            if overflow > 0:
+                conn.execute(DELETE_OVERFLOW, (overflow - 1,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM result_cache")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            # Autocommit mode; each statement is its own transaction
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,
+                cached_statements=64,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # A lost write after a power failure only costs a cache miss
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+
+        return conn
+
+
+class ResultCache:
+    """
+    LRU cache of connector results with a per-source TTL.
+
+    Entries are stored per source, so a search over several sources reuses
+    whatever each source already has cached and every source expires on
+    its own schedule.
+
+    With a `shared` store (e.g. SqliteResultStore) this LRU is the
+    in-process tier in front of it: writes go to both, and misses are
+    read through from the shared tier, so every worker on the node sees
+    results any of them fetched. A local copy is trusted for local_ttl
+    seconds before the shared tier is checked again, which bounds how
+    long a worker serves results another worker replaced or invalidated.
+    Expiry times come from the wall clock so that they mean the same in
+    every worker.
+
+    Each entry remembers when it was put (stored_at), so a worker can
+    tell whether the entry is newer than what it built from an earlier
+    one; aget_entry() returns it with the results.
+
+    The shared tier blocks on disk (and on other workers' writes), so
+    code on the event loop uses aget() and aput(), which only leave the
+    loop when they have to go to the shared store.
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        default_ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+        shared: SqliteResultStore | None = None,
+        local_ttl: float = 5.0,
+    ):
+        self._ttls = ttls
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._shared = shared
+        self._local_ttl = local_ttl
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, source: str) -> float:
+        return self._ttls.get(source, self._default_ttl)
+
+    def get(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+    ) -> List[Dict[str, Any]] | None:
+        key = (user_id, normalize_query(query), source)
+        now = self._clock()
+
+        entry = self._local(key, now)
+        if entry is None and self._shared is not None:
+            entry = self._read_through(key, now)
+
+        return self._count(entry)
+
+    async def aget(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+    ) -> List[Dict[str, Any]] | None:
+        found = await self.aget_entry(user_id, query, source)
+        return None if found is None else found[0]
+
+    async def aget_entry(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+    ) -> Tuple[List[Dict[str, Any]], float] | None:
+        """(results, stored_at) of a live entry, or None."""
+        key = (user_id, normalize_query(query), source)
+        now = self._clock()
+
+        entry = self._local(key, now)
+        if entry is None and self._shared is not None:
+            entry = await asyncio.to_thread(self._read_through, key, now)
+
+        results = self._count(entry)
+        return None if results is None else (results, entry.stored_at)
+
+    def expires_in(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+    ) -> float | None:
+        """
+        Seconds until the entry expires, or None if there is no live
+        entry. Does not count as a lookup.
+        """
+        key = (user_id, normalize_query(query), source)
+        now = self._clock()
+
+        entry = self._local(key, now)
+        if entry is None and self._shared is not None:
+            entry = self._read_through(key, now)
+
+        if entry is None:
+            return None
+
+        remaining = entry.expires_at - now
+        return remaining if remaining > 0 else None
+
+    def put(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        key = (user_id, normalize_query(query), source)
+        now = self._clock()
+        expires_at = now + self.ttl_for(source)
+
+        if self._shared is not None:
+            self._shared.put(key, results, expires_at, now)
+
+        self._store(key, _copy(results), expires_at, now, now)
+
+    async def aput(
+        self,
+        user_id: str,
+        query: str | None,
+        source: str,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        key = (user_id, normalize_query(query), source)
+        now = self._clock()
+        expires_at = now + self.ttl_for(source)
+
+        self._store(key, _copy(results), expires_at, now, now)
+
+        if self._shared is not None:
+            await asyncio.to_thread(
+                self._shared.put, key, results, expires_at, now
+            )
+
+    def invalidate_user(self, user_id: str) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == user_id]
+            for key in stale:
+                del self._entries[key]
+
+        removed = len(stale)
+        if self._shared is not None:
+            # Local entries are copies of shared rows; count those instead
+            removed = self._shared.delete_user(user_id)
+
+        with self._lock:
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+        if self._shared is not None:
+            self._shared.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _local(self, key: CacheKey, now: float) -> _Entry | None:
+        """The local entry, if it can be used without asking the shared tier."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is not None and entry.check_at > now:
+                self._entries.move_to_end(key)
+                return entry
+
+        return None
+
+    def _read_through(self, key: CacheKey, now: float) -> _Entry | None:
+        # Local miss, or a local copy due for a check: ask the shared tier
+        found = self._shared.get(key)
+
+        if found is None:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        results, expires_at, stored_at = found
+        with self._lock:
+            self.shared_hits += 1
+        return self._store(key, results, expires_at, stored_at, now)
+
+    def _count(self, entry: _Entry | None) -> List[Dict[str, Any]] | None:
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return _copy(entry.results)
+
+    def _store(
+        self,
+        key: CacheKey,
+        results: List[Dict[str, Any]],
+        expires_at: float,
+        stored_at: float,
+        now: float,
+    ) -> _Entry:
+        check_at = float("inf") if self._shared is None else now + self._local_ttl
+        entry = _Entry(
+            results=results,
+            expires_at=expires_at,
+            stored_at=stored_at,
+            check_at=check_at,
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
@@ -0,0 +1,264 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Normalized record fields that are searchable
+INDEXED_FIELDS = ("subject", "title", "from", "to", "snippet")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+DocKey = Tuple[str, str]  # (source, record id)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase alphanumeric tokens; e-mail addresses split on punctuation,
+    so "alice@example.com" matches "alice" and "example".
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def record_terms(record: Dict[str, Any]) -> Counter:
+    terms: Counter = Counter()
+
+    for name in INDEXED_FIELDS:
+        value = record.get(name)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = " ".join(str(v) for v in value if v)
+        terms.update(tokenize(str(value)))
+
+    return terms
+
+
+class UserIndex:
+    """
+    Inverted index over one user's normalized records, ranked with BM25.
+
+    Documents are keyed by (source, id). Each source is replaced as a
+    whole whenever its connector returns a fresh snapshot; unchanged
+    records are left in place.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._next_doc = 0
+
+        self._keys: Dict[DocKey, int] = {}
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._terms: Dict[int, Counter] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+        # term -> {doc: term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+
+        # source -> when the indexed snapshot was stored (wall clock, so
+        # it compares with result cache entries written by other workers)
+        self.indexed_at: Dict[str, float] = {}
+
+        # source -> provider token for the page after the snapshot
+        self.next_page_tokens: Dict[str, str | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def has_source(self, source: str) -> bool:
+        return source in self.indexed_at
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            key = (record["source"], str(record["id"]))
+            if key in self._keys:
+                self._remove_doc(self._keys[key])
+
+            doc = self._next_doc
+            self._next_doc += 1
+
+            terms = record_terms(record)
+            length = sum(terms.values())
+
+            self._keys[key] = doc
+            self._records[doc] = record
+            self._terms[doc] = terms
+            self._lengths[doc] = length
+            self._total_length += length
+
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[doc] = frequency
+
+    def remove(self, source: str, record_id: str) -> None:
+        with self._lock:
+            doc = self._keys.get((source, str(record_id)))
+            if doc is not None:
+                self._remove_doc(doc)
+
+    def replace_source(
+        self,
+        source: str,
+        records: Iterable[Dict[str, Any]],
+        now: float | None = None,
+        next_page_token: str | None = None,
+    ) -> None:
+        with self._lock:
+            fresh = {str(record["id"]): record for record in records}
+
+            stale = [
+                key for key in self._keys
+                if key[0] == source and key[1] not in fresh
+            ]
+            for key in stale:
+                self._remove_doc(self._keys[key])
+
+            for record_id, record in fresh.items():
+                doc = self._keys.get((source, record_id))
+                if doc is not None and self._records[doc] == record:
+                    continue
+                self.add({**record, "source": source})
+
+            self.indexed_at[source] = time.time() if now is None else now
+            self.next_page_tokens[source] = next_page_token
+
+    def extend_source(
+        self,
+        source: str,
+        records: Iterable[Dict[str, Any]],
+    ) -> None:
+        """
+        Add records from a deeper page without touching the rest of the
+        source; they last until the next snapshot replaces it.
+        """
+        with self._lock:
+            for record in records:
+                self.add({**record, "source": source})
+
+    def drop_source(self, source: str) -> None:
+        with self._lock:
+            for key in [k for k in self._keys if k[0] == source]:
+                self._remove_doc(self._keys[key])
+            self.indexed_at.pop(source, None)
+            self.next_page_tokens.pop(source, None)
+
+    def search(
+        self,
+        query: str,
+        sources: Iterable[str] | None = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        allowed = set(sources) if sources is not None else None
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        with self._lock:
+            if not self._records:
+                return []
+            if not terms:
+                return self._newest(allowed, limit)
+
+            scores: Dict[int, float] = {}
+            total_docs = len(self._records)
+            average_length = self._total_length / total_docs
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(
+                    1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+
+                for doc, frequency in postings.items():
+                    source = self._records[doc]["source"]
+                    if allowed is not None and source not in allowed:
+                        continue
+
+                    norm = BM25_K1 * (
+                        1 - BM25_B + BM25_B * self._lengths[doc] / average_length
+                    )
+                    scores[doc] = scores.get(doc, 0.0) + idf * (
+                        frequency * (BM25_K1 + 1) / (frequency + norm)
+                    )
+
+            # Ties go to the most recent record
+            top = heapq.nlargest(
+                limit,
+                scores.items(),
+                key=lambda item: (item[1], self._timestamp(item[0])),
+            )
+
+            return [self._records[doc] for doc, _ in top]
+
+    def _timestamp(self, doc: int) -> str:
+        return self._records[doc].get("timestamp") or ""
+
+    def _newest(self, allowed: set | None, limit: int) -> List[Dict[str, Any]]:
+        records = (
+            record for record in self._records.values()
+            if allowed is None or record["source"] in allowed
+        )
+        return heapq.nlargest(
+            limit, records, key=lambda record: record.get("timestamp") or ""
+        )
+
+    def _remove_doc(self, doc: int) -> None:
+        record = self._records.pop(doc)
+        del self._keys[(record["source"], str(record["id"]))]
+
+        self._total_length -= self._lengths.pop(doc)
+
+        for term in self._terms.pop(doc):
+            postings = self._postings[term]
+            del postings[doc]
+            if not postings:
+                del self._postings[term]
+
+
+class SearchIndex:
+    """
+    Per-user UserIndex registry, bounded by LRU over users.
+    """
+
+    def __init__(
+        self,
+        max_users: int,
+        index_factory: Callable[[], UserIndex] = UserIndex,
+    ):
+        self._max_users = max_users
+        self._index_factory = index_factory
+        self._indexes: "OrderedDict[str, UserIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def for_user(self, user_id: str) -> UserIndex:
+        with self._lock:
+            index = self._indexes.get(user_id)
+
+            if index is None:
+                index = self._index_factory()
+                self._indexes[user_id] = index
+
+            self._indexes.move_to_end(user_id)
+
+            while len(self._indexes) > self._max_users:
+                self._indexes.popitem(last=False)
+
+            return index
+
+    def drop_user(self, user_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight block and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+        self.calls = 0       # do() invocations
+        self.executions = 0  # times fn actually ran
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            self.calls += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Call counts; coalescing_ratio is the share of calls that were
+        served by another caller's execution.
+        """
+        with self._lock:
+            shared = self.calls - self.executions
+            return {
+                "in_flight": len(self._calls),
+                "calls": self.calls,
+                "executions": self.executions,
+                "shared": shared,
+                "coalescing_ratio": round(shared / self.calls, 4) if self.calls else 0.0,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines; calls only coalesce within one event loop.
+
+    The first caller's coroutine runs as a task; callers arriving while
+    it is in flight await the same task. A caller that is cancelled (for
+    example by its deadline) stops waiting without cancelling the shared
+    call for everyone else.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # A task can only be awaited from the loop that runs it
+        key = (asyncio.get_running_loop(), key)
+
+        self.calls += 1
+        task = self._calls.get(key)
+
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        shared = self.calls - self.executions
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": shared,
+            "coalescing_ratio": round(shared / self.calls, 4) if self.calls else 0.0,
+        }
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the error as seen even if every waiter gave up on it
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,40 @@
+import json
+from typing import Any
+
+NDJSON = "ndjson"
+SSE = "sse"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    SSE: "text/event-stream",
+}
+
+_ACCEPTED = {
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "text/event-stream": SSE,
+}
+
+
+def negotiate_stream_format(accept: str | None) -> str | None:
+    """
+    Streaming format requested by an Accept header, or None for plain JSON.
+    """
+    if not accept:
+        return None
+
+    for media_range in accept.split(","):
+        media_type = media_range.split(";", 1)[0].strip().lower()
+        if media_type in _ACCEPTED:
+            return _ACCEPTED[media_type]
+
+    return None
+
+
+def encode_frame(stream_format: str, event: str, data: Any) -> str:
+    body = json.dumps(data, default=str, separators=(",", ":"))
+
+    if stream_format == SSE:
+        return f"event: {event}\ndata: {body}\n\n"
+
+    return f'{{"type":"{event}","data":{body}}}\n'
@@ -1,18 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from omnibridge.accounts.dependencies import token_refresher
+from omnibridge.connectors.dependencies import connector_bridge, http_transport
 from omnibridge.api.protected_routes import router as protected_router
 from omnibridge.api.auth_routes import router as auth_router
 from omnibridge.accounts.routes import router as accounts_router
 from omnibridge.api.sources import router as sources_router
-from omnibridge.api.search import router as search_router
+from omnibridge.api.search import prefetcher, router as search_router
+from omnibridge.api.notifications import include_push_routes
+from omnibridge.api.metrics import RequestMetricsMiddleware, router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    token_refresher.start()
+    prefetcher.start()
+    yield
+    await prefetcher.stop()
+    token_refresher.stop()
+    connector_bridge.shutdown()
+    http_transport.close()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(protected_router)
 app.include_router(accounts_router)
 app.include_router(sources_router)
 app.include_router(search_router)
+include_push_routes(app)
+app.include_router(metrics_router)
 
 
 @app.get("/health")
@@ -0,0 +1,332 @@
+import json
+import random
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MESSAGES_PATH = "/gmail/v1/users/me/messages"
+MESSAGE_PATH = re.compile(r"^/gmail/v1/users/me/messages/([^/]+)$")
+HISTORY_PATH = "/gmail/v1/users/me/history"
+PROFILE_PATH = "/gmail/v1/users/me/profile"
+WATCH_PATH = "/gmail/v1/users/me/watch"
+
+# Gmail watches expire after 7 days
+WATCH_SECONDS = 7 * 24 * 3600
+
+
+def make_message(index: int, history_id: int = 1) -> dict:
+    return {
+        "id": f"msg-{index}",
+        "threadId": f"thread-{index}",
+        "historyId": str(history_id),
+        "snippet": f"Snippet {index}",
+        "internalDate": str(1705322096000 + index * 60000),
+        "payload": {
+            "headers": [
+                {"name": "From", "value": f"sender{index}@example.com"},
+                {"name": "To", "value": "user@example.com"},
+                {"name": "Subject", "value": f"Subject {index}"},
+                {"name": "Date", "value": "Mon, 15 Jan 2024 12:34:56 +0000"},
+            ]
+        },
+    }
+
+
+class FakeGmailServer:
+    """
+    Minimal local stand-in for the Gmail REST API.
+
+    Serves messages.list, messages.get, history.list, getProfile, watch
+    and the multipart batch endpoint, records every HTTP round trip it
+    receives in `requests` and counts TCP connections in `connections`.
+
+    `latency` (seconds) delays every HTTP round trip and `error_rate`
+    fails that share of API calls (batch sub-requests included) with a
+    500 backendError, for load tests against a misbehaving provider.
+    """
+
+    def __init__(
+        self,
+        message_count: int = 20,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+        # Newest first, like Gmail
+        self.history_id = message_count
+        self.messages = [
+            make_message(i, history_id=message_count - i)
+            for i in range(message_count)
+        ]
+        self.missing_ids: set[str] = set()
+        # Upcoming API calls (batch sub-requests included) to reject
+        self.throttled: list[tuple[int, str | None, str | None]] = []
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        # Request bodies of users.watch calls
+        self.watches: list[dict] = []
+
+        # history records newer than the initial mailbox, oldest first
+        self.history: list[dict] = []
+        self.oldest_history_id = 1
+        self._next_index = message_count
+
+        self._server = self._make_server()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeGmailServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGmailServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Mailbox mutations
+    # ------------------------------------------------------------------
+
+    def add_message(self) -> dict:
+        self.history_id += 1
+        message = make_message(self._next_index, history_id=self.history_id)
+        self._next_index += 1
+
+        self.messages.insert(0, message)
+        self.history.append({
+            "id": str(self.history_id),
+            "messagesAdded": [
+                {"message": {"id": message["id"], "threadId": message["threadId"]}}
+            ],
+        })
+        return message
+
+    def delete_message(self, message_id: str) -> None:
+        self.history_id += 1
+        self.messages = [m for m in self.messages if m["id"] != message_id]
+        self.history.append({
+            "id": str(self.history_id),
+            "messagesDeleted": [{"message": {"id": message_id}}],
+        })
+
+    def rate_limit(
+        self,
+        count: int = 1,
+        status: int = 429,
+        reason: str | None = "rateLimitExceeded",
+        retry_after: str | None = None,
+    ) -> None:
+        self.throttled.extend([(status, reason, retry_after)] * count)
+
+    def expire_history(self) -> None:
+        # Gmail only keeps history for a limited time
+        self.oldest_history_id = self.history_id
+        self.history = []
+
+    # ------------------------------------------------------------------
+    # Gmail semantics
+    # ------------------------------------------------------------------
+
+    def handle(self, method: str, target: str) -> tuple[int, dict, dict]:
+        if self.throttled:
+            status, reason, retry_after = self.throttled.pop(0)
+            error = {"code": status, "message": "Rate Limit Exceeded"}
+            if reason:
+                error["errors"] = [{"reason": reason, "domain": "usageLimits"}]
+            headers = {"Retry-After": retry_after} if retry_after else {}
+            return status, {"error": error}, headers
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return 500, {
+                "error": {
+                    "code": 500,
+                    "message": "Backend Error",
+                    "errors": [{"reason": "backendError"}],
+                }
+            }, {}
+
+        code, payload = self._handle(method, target)
+        return code, payload, {}
+
+    def _handle(self, method: str, target: str) -> tuple[int, dict]:
+        parts = urlsplit(target)
+        params = parse_qs(parts.query)
+
+        if method == "GET" and parts.path == PROFILE_PATH:
+            return 200, {
+                "emailAddress": "user@gmail.com",
+                "messagesTotal": len(self.messages),
+                "historyId": str(self.history_id),
+            }
+
+        if method == "POST" and parts.path == WATCH_PATH:
+            expiration = int((time.time() + WATCH_SECONDS) * 1000)
+            return 200, {
+                "historyId": str(self.history_id),
+                "expiration": str(expiration),
+            }
+
+        if method == "GET" and parts.path == HISTORY_PATH:
+            start = int(params["startHistoryId"][0])
+            if start < self.oldest_history_id:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+            records = [h for h in self.history if int(h["id"]) > start]
+            response = {"historyId": str(self.history_id)}
+            if records:
+                response["history"] = records
+            return 200, response
+
+        if method == "GET" and parts.path == MESSAGES_PATH:
+            max_results = int(params.get("maxResults", ["100"])[0])
+            # Like Gmail's, a page token points after a given message,
+            # not at a position: new mail doesn't shift later pages
+            offset = 0
+            if "pageToken" in params:
+                ids = [m["id"] for m in self.messages]
+                after = params["pageToken"][0]
+                offset = ids.index(after) + 1 if after in ids else len(ids)
+            page = self.messages[offset:offset + max_results]
+
+            response = {
+                "messages": [
+                    {"id": m["id"], "threadId": m["threadId"]} for m in page
+                ],
+                "resultSizeEstimate": len(page),
+            }
+            if offset + max_results < len(self.messages):
+                response["nextPageToken"] = page[-1]["id"]
+            return 200, response
+
+        match = MESSAGE_PATH.match(parts.path)
+        if method == "GET" and match:
+            message_id = match.group(1)
+            for message in self.messages:
+                if message["id"] == message_id and message_id not in self.missing_ids:
+                    return 200, message
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+        return 404, {"error": {"code": 404, "message": "Unknown path"}}
+
+    def handle_batch(self, content_type: str, body: bytes) -> tuple[str, bytes]:
+        envelope = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+
+        boundary = "batch_fake_gmail"
+        chunks: list[str] = []
+
+        for part in envelope.iter_parts():
+            content_id = part["Content-ID"].strip()[1:-1]
+            request_line = part.get_payload().lstrip().split("\r\n", 1)[0]
+            request_line = request_line.split("\n", 1)[0]
+            method, target, _ = request_line.split(" ", 2)
+
+            code, payload, headers = self.handle(method, target)
+            extra = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            chunks.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n"
+                "\r\n"
+                f"HTTP/1.1 {code} {'OK' if code == 200 else 'Error'}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n"
+                f"{extra}"
+                "\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+
+        chunks.append(f"--{boundary}--\r\n")
+        return f"multipart/mixed; boundary={boundary}", "".join(chunks).encode()
+
+    # ------------------------------------------------------------------
+    # HTTP plumbing
+    # ------------------------------------------------------------------
+
+    def _make_server(self) -> ThreadingHTTPServer:
+        fake = self
+
+        class Server(ThreadingHTTPServer):
+            def process_request(self, request, client_address):
+                fake.connections += 1
+                super().process_request(request, client_address)
+
+        return Server(("127.0.0.1", 0), self._handler())
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(
+                self,
+                code: int,
+                content_type: str,
+                body: bytes,
+                headers: dict | None = None,
+            ) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                fake.requests.append(("GET", self.path))
+                if fake.latency:
+                    time.sleep(fake.latency)
+                code, payload, headers = fake.handle("GET", self.path)
+                self._send(
+                    code, "application/json", json.dumps(payload).encode(), headers
+                )
+
+            def do_POST(self):
+                fake.requests.append(("POST", self.path))
+                if fake.latency:
+                    time.sleep(fake.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+
+                path = urlsplit(self.path).path
+                if path == "/batch":
+                    content_type, payload = fake.handle_batch(
+                        self.headers["Content-Type"], body
+                    )
+                    self._send(200, content_type, payload)
+                    return
+
+                if path == WATCH_PATH:
+                    fake.watches.append(json.loads(body or b"{}"))
+
+                code, payload, headers = fake.handle("POST", self.path)
+                self._send(
+                    code, "application/json", json.dumps(payload).encode(), headers
+                )
+
+        return Handler
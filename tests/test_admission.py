@@ -0,0 +1,210 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from omnibridge.api.admission import (
+    admission_controllers,
+    request_timeout,
+    retry_after_header,
+)
+from omnibridge.connectors.base import Page
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.core.admission import (
+    SHED_DEADLINE,
+    SHED_QUEUE_FULL,
+    SHED_TIMEOUT,
+    SHED_USER_LIMIT,
+    AdmissionController,
+    AdmissionRejected,
+    Deadline,
+)
+from omnibridge.main import app
+
+client = TestClient(app)
+gmail_connector = connectors.get("gmail")
+
+
+@pytest.fixture(autouse=True)
+def closed_circuits():
+    circuit_breakers.reset()
+    fetch_flights.reset()
+
+
+def make_controller(**limits) -> AdmissionController:
+    options = {"max_concurrency": 1, "max_queue": 10, "max_per_user": 10}
+    options.update(limits)
+    return AdmissionController("search", **options)
+
+
+async def shed_reason(controller, user_id, timeout=5.0) -> str:
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire(user_id, Deadline(timeout))
+    return exc_info.value.reason
+
+
+def test_waiters_are_served_round_robin_across_users():
+    controller = make_controller()
+    served = []
+
+    async def request(user_id):
+        await controller.acquire(user_id, Deadline(5.0))
+        served.append(user_id)
+        await asyncio.sleep(0)
+        controller.release(user_id, 0.01)
+
+    async def main():
+        await controller.acquire("holder", Deadline(5.0))
+        # A heavy user queues first, then two others arrive
+        tasks = [asyncio.create_task(request("heavy")) for _ in range(3)]
+        tasks += [asyncio.create_task(request(u)) for u in ("alice", "bob")]
+        await asyncio.sleep(0)
+        controller.release("holder", 0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert served == ["heavy", "alice", "bob", "heavy", "heavy"]
+    assert controller.stats()["active"] == 0
+    assert controller.stats()["queued"] == 0
+
+
+def test_requests_are_shed_when_queue_or_user_limit_is_full():
+    controller = make_controller(max_queue=1, max_per_user=2)
+
+    async def main():
+        await controller.acquire("alice", Deadline(5.0))
+        waiting = asyncio.create_task(controller.acquire("alice", Deadline(5.0)))
+        await asyncio.sleep(0)
+
+        reasons = [
+            await shed_reason(controller, "alice"),
+            await shed_reason(controller, "bob"),
+        ]
+        waiting.cancel()
+        return reasons
+
+    assert asyncio.run(main()) == [SHED_USER_LIMIT, SHED_QUEUE_FULL]
+    assert controller.stats()["queued"] == 0
+
+
+def test_request_is_shed_early_when_expected_wait_exceeds_deadline():
+    controller = make_controller()
+
+    async def main():
+        await controller.acquire("alice", Deadline(5.0))
+        controller.release("alice", 2.0)  # requests take ~2s
+        await controller.acquire("alice", Deadline(5.0))
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("bob", Deadline(1.0))
+        return exc_info.value
+
+    rejected = asyncio.run(main())
+
+    assert rejected.reason == SHED_DEADLINE
+    assert rejected.retry_after == pytest.approx(2.0)
+    assert controller.stats()["queued"] == 0
+
+
+def test_request_is_shed_when_deadline_passes_in_queue():
+    controller = make_controller()
+
+    async def main():
+        await controller.acquire("alice", Deadline(5.0))
+        reason = await shed_reason(controller, "bob", timeout=0.02)
+        # The slot goes to nobody once the holder is done
+        controller.release("alice", 0.1)
+        return reason
+
+    assert asyncio.run(main()) == SHED_TIMEOUT
+    assert controller.stats()["active"] == 0
+    assert controller.stats()["shed"] == {SHED_TIMEOUT: 1}
+
+
+def test_request_timeout_header_is_bounded():
+    assert request_timeout(None) == 10.0
+    assert request_timeout("2.5") == 2.5
+    assert request_timeout("soon") == 10.0
+    assert request_timeout("-1") == 0.0
+    assert request_timeout("3600") == 60.0
+    assert request_timeout("nan") == 10.0
+
+
+def test_retry_after_header_is_at_least_one_second():
+    assert retry_after_header(0.0) == "1"
+    assert retry_after_header(0.2) == "1"
+    assert retry_after_header(2.5) == "3"
+    assert retry_after_header(float("inf")) == "1"
+
+
+def get_token(email: str) -> str:
+    return client.post("/auth/token", params={"email": email}).json()["access_token"]
+
+
+def test_overloaded_sources_route_answers_503_with_retry_after(mocker, monkeypatch):
+    controller = make_controller(max_queue=0)
+    monkeypatch.setitem(admission_controllers, "sources", controller)
+    token = get_token("busy@example.com")
+    release = threading.Event()
+
+    def slow_fetch(**kwargs):
+        release.wait(timeout=5)
+        return Page([{"id": "msg-1", "source": "gmail"}])
+
+    mocker.patch.object(gmail_connector, "fetch", side_effect=slow_fetch)
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            headers = {"Authorization": f"Bearer {token}"}
+            first = asyncio.ensure_future(
+                async_client.get("/sources/gmail/messages", headers=headers)
+            )
+            while controller.stats()["active"] == 0:
+                await asyncio.sleep(0.005)
+
+            second = await async_client.get("/sources/gmail/messages", headers=headers)
+            release.set()
+            return await first, second
+
+    first, second = asyncio.run(asyncio.wait_for(burst(), timeout=5))
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert int(second.headers["Retry-After"]) >= 1
+
+    metrics = client.get("/metrics").text
+    assert (
+        'omnibridge_admission_shed_total{route="sources",reason="queue_full"} 1'
+        in metrics
+    )
+
+
+def test_request_deadline_bounds_the_gmail_call(mocker):
+    token = get_token("hurried@example.com")
+    release = threading.Event()
+
+    def slow_fetch(**kwargs):
+        release.wait(timeout=5)
+        return Page([])
+
+    mocker.patch.object(gmail_connector, "fetch", side_effect=slow_fetch)
+
+    try:
+        response = client.get(
+            "/sources/gmail/messages",
+            headers={"Authorization": f"Bearer {token}", "X-Request-Timeout": "0.1"},
+        )
+    finally:
+        release.set()
+
+    assert response.status_code == 504
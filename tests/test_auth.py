@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 from omnibridge.main import app
+from omnibridge.auth import dependencies
+from omnibridge.auth.token_cache import VerifiedTokenCache
 
 client = TestClient(app)
 
@@ -43,3 +45,47 @@ def test_issue_token_and_access_protected_endpoint():
 
     assert response.status_code == 200
     assert response.json()["user_id"] == "user@example.com"
+
+
+def test_repeat_requests_skip_signature_verification(mocker):
+    dependencies.verified_tokens.clear()
+    token = client.post(
+        "/auth/token", params={"email": "cached@example.com"}
+    ).json()["access_token"]
+    verify = mocker.spy(dependencies, "verify_jwt")
+
+    for _ in range(3):
+        response = client.get(
+            "/protected",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.json()["user_id"] == "cached@example.com"
+
+    assert verify.call_count == 1
+
+
+def test_verified_token_cache_expires_with_token():
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=300, clock=lambda: now[0])
+
+    cache.put("token", {"user_id": "a", "exp": 1060})
+    assert cache.get("token") == {"user_id": "a", "exp": 1060}
+
+    now[0] = 1060.0
+    assert cache.get("token") is None
+
+
+def test_verified_token_cache_caps_ttl_and_size():
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_entries=2, max_ttl=30, clock=lambda: now[0])
+
+    cache.put("a", {"exp": 5000})
+    cache.put("b", {"exp": 5000})
+    cache.put("c", {"exp": 5000})
+    cache.put("no-exp", {"user_id": "x"})
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+
+    now[0] = 1031.0
+    assert cache.get("c") is None
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+from omnibridge.accounts.store import InMemoryTokenStore
+from omnibridge.connectors.base import BaseConnector
+from omnibridge.connectors.bridge import SyncBridge
+
+
+class SlowConnector(BaseConnector):
+    provider = "slow"
+
+    def __init__(self, delay=0.0, **kwargs):
+        super().__init__(InMemoryTokenStore(), **kwargs)
+        self.delay = delay
+        self.threads = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, user_id, query=None, options=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return [{"id": "1", "user": user_id, "options": options}]
+
+
+def test_afetch_runs_sync_connector_on_bridge():
+    bridge = SyncBridge(max_workers=2, name="bridge-test")
+    connector = SlowConnector(bridge=bridge)
+
+    results = asyncio.run(
+        connector.afetch("user@example.com", options={"page_size": 5})
+    )
+
+    assert results == [
+        {"id": "1", "user": "user@example.com", "options": {"page_size": 5}}
+    ]
+    assert connector.threads[0].startswith("bridge-test")
+    assert bridge.stats()["completed"] == 1
+    bridge.shutdown()
+
+
+def test_blocking_fetch_does_not_block_event_loop():
+    bridge = SyncBridge(max_workers=2)
+    connector = SlowConnector(delay=0.2, bridge=bridge)
+
+    async def ticker():
+        ticks = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < 0.2:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        return ticks
+
+    async def main():
+        return await asyncio.gather(connector.afetch("user@example.com"), ticker())
+
+    _, ticks = asyncio.run(main())
+
+    assert ticks >= 10
+    bridge.shutdown()
+
+
+def test_bridge_limits_concurrent_sync_calls():
+    bridge = SyncBridge(max_workers=2)
+    connector = SlowConnector(delay=0.05, bridge=bridge)
+
+    async def main():
+        calls = [connector.afetch(f"user{i}@example.com") for i in range(6)]
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(main())
+
+    assert len(results) == 6
+    assert connector.max_active == 2
+    assert bridge.stats() == {
+        "max_workers": 2,
+        "active": 0,
+        "queued": 0,
+        "completed": 6,
+    }
+    bridge.shutdown()
@@ -0,0 +1,210 @@
+import asyncio
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from omnibridge.accounts.refresh import TokenRefreshError
+from omnibridge.connectors.base import AccountNotLinkedError
+from omnibridge.connectors.dependencies import is_provider_failure
+from omnibridge.core.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **kwargs):
+    settings = {
+        "failure_rate_threshold": 0.5,
+        "slow_call_seconds": 1.0,
+        "slow_call_rate_threshold": 0.5,
+        "window_size": 4,
+        "minimum_calls": 4,
+        "open_seconds": 10.0,
+        "is_failure": is_provider_failure,
+        "clock": clock,
+    }
+    settings.update(kwargs)
+    return CircuitBreaker("gmail", **settings)
+
+
+def call(breaker, fn):
+    return asyncio.run(breaker.acall(fn))
+
+
+async def ok():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("provider down")
+
+
+def slow(clock, seconds):
+    async def call():
+        clock.now += seconds
+        return ["ok"]
+
+    return call
+
+
+def trip(breaker):
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            call(breaker, fail)
+
+
+def test_circuit_opens_on_failure_rate():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    call(breaker, ok)
+    call(breaker, ok)
+    with pytest.raises(RuntimeError):
+        call(breaker, fail)
+
+    # Below minimum_calls: still closed
+    assert breaker.state == STATE_CLOSED
+
+    with pytest.raises(RuntimeError):
+        call(breaker, fail)
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_circuit_opens_on_slow_calls():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(4):
+        call(breaker, slow(clock, 2.0))
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_open_circuit_fails_fast():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 4.0
+
+    called = []
+
+    async def record():
+        called.append(True)
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        call(breaker, record)
+
+    assert called == []
+    assert exc_info.value.retry_after == pytest.approx(6.0)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_trial_success_closes_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 10.0
+
+    assert breaker.state == STATE_HALF_OPEN
+    assert call(breaker, ok) == "ok"
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_allows_limited_trials():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 10.0
+
+    breaker.before_call()
+
+    # The single trial slot is taken until it reports back
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_trial_failure_reopens_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 10.0
+
+    with pytest.raises(RuntimeError):
+        call(breaker, fail)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_after() == pytest.approx(10.0)
+    assert breaker.stats()["opened"] == 2
+
+
+def test_ignored_exceptions_do_not_count():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    async def unlinked():
+        raise AccountNotLinkedError()
+
+    for _ in range(6):
+        with pytest.raises(AccountNotLinkedError):
+            call(breaker, unlinked)
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()["calls"] == 0
+
+
+def test_one_users_auth_failures_do_not_open_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    async def revoked():
+        raise TokenRefreshError("gmail token refresh failed: 400")
+
+    async def unauthorized():
+        raise HttpError(httplib2.Response({"status": 401}), b"{}")
+
+    for _ in range(3):
+        with pytest.raises(TokenRefreshError):
+            call(breaker, revoked)
+        with pytest.raises(HttpError):
+            call(breaker, unauthorized)
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()["calls"] == 0
+
+
+def test_server_errors_open_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    async def unavailable():
+        raise HttpError(httplib2.Response({"status": 503}), b"{}")
+
+    for _ in range(4):
+        with pytest.raises(HttpError):
+            call(breaker, unavailable)
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_registry_applies_per_provider_overrides():
+    breakers = CircuitBreakers(
+        overrides={"gmail": {"open_seconds": 5.0}}, open_seconds=30.0
+    )
+
+    assert breakers.for_provider("gmail").open_seconds == 5.0
+    assert breakers.for_provider("drive").open_seconds == 30.0
+    assert breakers.for_provider("gmail") is breakers.for_provider("gmail")
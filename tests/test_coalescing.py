@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from omnibridge.connectors.base import Page
+from omnibridge.connectors.coalescing import FetchCoalescer, fetch_key
+
+
+def test_concurrent_identical_fetches_share_one_upstream_call():
+    coalescer = FetchCoalescer()
+    upstream_calls = []
+
+    async def upstream():
+        upstream_calls.append(1)
+        await asyncio.sleep(0.05)
+        return Page([{"id": "msg-1"}], next_page_token="next")
+
+    async def main():
+        return await asyncio.gather(*(
+            coalescer.ado("gmail", "user@example.com", None, {"page_size": 20}, upstream)
+            for _ in range(8)
+        ))
+
+    results = asyncio.run(main())
+
+    assert len(upstream_calls) == 1
+    assert all(r == [{"id": "msg-1"}] for r in results)
+    assert all(r.next_page_token == "next" for r in results)
+    # Each caller gets its own list
+    assert len({id(r) for r in results}) == 8
+
+    stats = coalescer.stats()["gmail"]
+    assert stats["executions"] == 1
+    assert stats["shared"] == 7
+    assert stats["coalescing_ratio"] == 0.875
+
+
+def test_failure_is_shared_by_waiting_callers():
+    coalescer = FetchCoalescer()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("Gmail is down")
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                coalescer.ado("gmail", "user@example.com", None, None, upstream)
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(main())
+
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert coalescer.stats()["gmail"]["executions"] == 1
+
+
+def test_sequential_fetches_are_not_coalesced():
+    coalescer = FetchCoalescer()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        return []
+
+    async def main():
+        for _ in range(2):
+            await coalescer.ado("gmail", "user@example.com", None, None, upstream)
+
+    asyncio.run(main())
+
+    assert len(calls) == 2
+    assert coalescer.stats()["gmail"]["coalescing_ratio"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "a, b, same",
+    [
+        (("u", "Invoice  2024", {"page_size": 20}), ("u", "invoice 2024", {"page_size": 20}), True),
+        (("u", None, {"a": 1, "b": 2}), ("u", None, {"b": 2, "a": 1}), True),
+        (("u", None, None), ("u", None, {}), True),
+        (("u", None, {"page_size": 20}), ("u", None, {"page_size": 50}), False),
+        (("u", None, None), ("v", None, None), False),
+    ],
+)
+def test_fetch_key(a, b, same):
+    assert (fetch_key(*a) == fetch_key(*b)) is same
+
+
+def test_cancelled_waiter_does_not_cancel_shared_fetch():
+    coalescer = FetchCoalescer()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return [{"id": "msg-1"}]
+
+    async def main():
+        impatient = asyncio.ensure_future(
+            coalescer.ado("gmail", "user@example.com", None, None, upstream)
+        )
+        patient = asyncio.ensure_future(
+            coalescer.ado("gmail", "user@example.com", None, None, upstream)
+        )
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(main()) == [{"id": "msg-1"}]
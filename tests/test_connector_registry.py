@@ -0,0 +1,97 @@
+import subprocess
+import sys
+
+import pytest
+
+from omnibridge.accounts.store import InMemoryTokenStore
+from omnibridge.connectors.base import BaseConnector
+from omnibridge.connectors.dependencies import connectors
+from omnibridge.connectors.gmail import GmailConnector
+from omnibridge.connectors.registry import ConnectorRegistry, UnknownConnectorError
+
+
+class FakeConnector(BaseConnector):
+    def __init__(self, token_store, **shared):
+        self.token_store = token_store
+        self.shared = shared
+
+    def fetch(self, user_id: str, options=None):
+        return []
+
+
+def test_app_startup_does_not_import_provider_sdks():
+    # Fresh interpreter: this test process has imported them already
+    script = (
+        "import sys, omnibridge.main; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} "
+        "& {'google', 'googleapiclient', 'httplib2'}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_connector_is_imported_and_built_on_first_get():
+    store = InMemoryTokenStore()
+    registry = ConnectorRegistry(
+        builtins={"fake": "test_connector_registry:FakeConnector"},
+        group=None,
+        token_store=store,
+        bridge="bridge",
+    )
+
+    assert registry.names() == ["fake"]
+    assert registry.loaded() == {}
+
+    connector = registry.get("fake")
+
+    assert isinstance(connector, FakeConnector)
+    assert connector.token_store is store
+    assert connector.shared == {"bridge": "bridge"}
+    assert registry.loaded() == {"fake": connector}
+
+
+def test_registry_returns_one_shared_instance():
+    registry = ConnectorRegistry(builtins={}, group=None, token_store=None)
+    registry.register("fake", FakeConnector)
+
+    assert registry.get("fake") is registry.get("fake")
+
+
+def test_register_replaces_a_connector():
+    registry = ConnectorRegistry(
+        builtins={"fake": "test_connector_registry:FakeConnector"},
+        group=None,
+        token_store=None,
+    )
+    original = registry.get("fake")
+
+    registry.register("fake", FakeConnector)
+
+    assert registry.get("fake") is not original
+
+
+def test_unregister_removes_a_connector():
+    registry = ConnectorRegistry(builtins={}, group=None, token_store=None)
+    registry.register("fake", FakeConnector)
+    registry.get("fake")
+
+    registry.unregister("fake")
+
+    assert registry.names() == []
+    assert registry.loaded() == {}
+
+
+def test_unknown_connector_raises():
+    registry = ConnectorRegistry(builtins={}, group=None)
+
+    with pytest.raises(UnknownConnectorError):
+        registry.get("dropbox")
+
+
+def test_app_registry_serves_one_gmail_connector():
+    assert "gmail" in connectors.names()
+    assert isinstance(connectors.get("gmail"), GmailConnector)
+    assert connectors.get("gmail") is connectors.get("gmail")
@@ -0,0 +1,34 @@
+import pytest
+
+from omnibridge.core.cursors import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor({"u": "user@example.com", "t": "page-2"})
+
+    assert decode_cursor(cursor) == {"u": "user@example.com", "t": "page-2"}
+
+
+def test_cursor_is_opaque():
+    cursor = encode_cursor({"u": "user@example.com", "t": "page-2"})
+
+    assert "page-2" not in cursor
+    assert "user@example.com" not in cursor
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda c: c[:-2] + ("AA" if not c.endswith("AA") else "BB"),
+        lambda c: "e30" + c[c.index("."):],  # "{}" with the original tag
+        lambda c: c.split(".")[0],
+        lambda c: "not-a-cursor",
+        lambda c: c.split(".")[0] + ".é",
+        lambda c: "é." + c.split(".")[1],
+    ],
+)
+def test_tampered_cursor_is_rejected(tamper):
+    cursor = encode_cursor({"u": "user@example.com", "t": "page-2"})
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(tamper(cursor))
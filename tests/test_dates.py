@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from omnibridge.core.dates import from_epoch_millis, normalize_timestamps, parse_rfc2822
+
+
+def utc(*fields) -> datetime:
+    return datetime(*fields, tzinfo=timezone.utc)
+
+
+def test_numeric_offsets_are_converted_to_utc():
+    assert parse_rfc2822("Mon, 15 Jan 2024 12:34:56 +0530") == utc(2024, 1, 15, 7, 4, 56)
+    assert parse_rfc2822("Mon, 15 Jan 2024 22:00:00 -0800") == utc(2024, 1, 16, 6, 0, 0)
+    assert parse_rfc2822("Mon, 15 Jan 2024 12:34:56 +0000 (UTC)") == utc(2024, 1, 15, 12, 34, 56)
+
+
+def test_obsolete_forms_are_accepted():
+    # Named zones, two-digit years, no weekday, no seconds
+    assert parse_rfc2822("Mon, 15 Jan 2024 12:34:56 EDT") == utc(2024, 1, 15, 16, 34, 56)
+    assert parse_rfc2822("15 Jan 24 12:34:56 GMT") == utc(2024, 1, 15, 12, 34, 56)
+    assert parse_rfc2822("Mon 15 Jan 2024 12:34 +0100") == utc(2024, 1, 15, 11, 34, 0)
+    assert parse_rfc2822("1 Jan 99 00:00:00 +0000") == utc(1999, 1, 1, 0, 0, 0)
+
+
+def test_non_ascii_zone_digits_do_not_reach_the_fast_path():
+    # Left to email.utils, which ignores a zone it cannot read
+    assert parse_rfc2822("Mon, 15 Jan 2024 12:34:56 +²⁰00") == utc(2024, 1, 15, 12, 34, 56)
+
+
+def test_irregular_headers_go_through_the_fallback():
+    assert parse_rfc2822("Mon,  15  Jan  2024  12:34:56  +0100") == utc(2024, 1, 15, 11, 34, 56)
+    assert parse_rfc2822("15-Jan-2024 12:34:56 +0100") == utc(2024, 1, 15, 11, 34, 56)
+
+
+def test_invalid_dates_are_rejected():
+    assert parse_rfc2822(None) is None
+    assert parse_rfc2822("") is None
+    assert parse_rfc2822("yesterday") is None
+    assert parse_rfc2822("Fri, 31 Feb 2024 12:00:00 +0000") is None
+    # Unicode digits that str.isdigit() accepts but int() does not
+    assert parse_rfc2822("Mon, 15 Jan ²⁰²⁴ 12:34:56 +0000") is None
+    assert parse_rfc2822("Mon, 15 Jan 2024 1²:34:56 +0000") is None
+
+
+def test_internal_date_fills_in_for_missing_or_broken_headers():
+    timestamps = normalize_timestamps(
+        [
+            "Mon, 15 Jan 2024 12:34:56 +0530",
+            None,
+            "not a date",
+            None,
+            "Mon, 15 Jan ²⁰²⁴ 12:34:56 +0000",
+        ],
+        ["1705322096000", "1705322096000", "1705322156999", "junk", "1705322096000"],
+    )
+
+    assert timestamps == [
+        "2024-01-15T07:04:56+00:00",
+        "2024-01-15T12:34:56+00:00",
+        "2024-01-15T12:35:56+00:00",
+        None,
+        "2024-01-15T12:34:56+00:00",
+    ]
+    assert from_epoch_millis(1705322096000) == utc(2024, 1, 15, 12, 34, 56)
+
+
+def test_normalized_timestamps_sort_chronologically():
+    headers = [
+        "Mon, 15 Jan 2024 09:00:00 -0500",  # 14:00 UTC
+        "Mon, 15 Jan 2024 18:30:00 +0530",  # 13:00 UTC
+        "Mon, 15 Jan 2024 13:30:00 +0000",  # 13:30 UTC
+    ]
+
+    timestamps = normalize_timestamps(headers, [None] * len(headers))
+
+    assert sorted(timestamps) == [timestamps[1], timestamps[2], timestamps[0]]
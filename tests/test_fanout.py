@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+from omnibridge.connectors.base import AccountNotLinkedError
+from omnibridge.connectors.rate_limit import RateLimitExceeded
+from omnibridge.core.fanout import fan_out, fan_out_as_completed
+
+
+def sleeper(seconds, results):
+    async def call():
+        await asyncio.sleep(seconds)
+        return results
+
+    return call
+
+
+def raiser(exc):
+    async def call():
+        raise exc
+
+    return call
+
+
+def test_fan_out_runs_sources_concurrently():
+    started = time.perf_counter()
+
+    outcomes = asyncio.run(
+        fan_out(
+            calls={
+                "a": sleeper(0.2, [{"id": "a1"}]),
+                "b": sleeper(0.2, [{"id": "b1"}]),
+                "c": sleeper(0.2, [{"id": "c1"}]),
+            },
+            deadlines={"a": 1.0, "b": 1.0, "c": 1.0},
+        )
+    )
+
+    elapsed = time.perf_counter() - started
+
+    assert [o.status for o in outcomes] == ["ok", "ok", "ok"]
+    assert elapsed < 0.5
+
+
+def test_fan_out_returns_partial_results_on_timeout():
+    async def search():
+        started = time.perf_counter()
+        outcomes = await fan_out(
+            calls={
+                "fast": sleeper(0.0, [{"id": "f1"}]),
+                "slow": sleeper(1.0, [{"id": "s1"}]),
+            },
+            deadlines={"fast": 0.5, "slow": 0.1},
+        )
+        return outcomes, time.perf_counter() - started
+
+    outcomes, elapsed = asyncio.run(search())
+    by_source = {o.source: o for o in outcomes}
+
+    assert by_source["fast"].status == "ok"
+    assert by_source["fast"].results == [{"id": "f1"}]
+    assert by_source["slow"].status == "timeout"
+    assert by_source["slow"].results == []
+    assert elapsed < 0.5
+
+
+def test_fan_out_classifies_failures():
+    outcomes = asyncio.run(
+        fan_out(
+            calls={
+                "unlinked": raiser(AccountNotLinkedError("not linked")),
+                "broken": raiser(RuntimeError("boom")),
+                "throttled": raiser(RateLimitExceeded("slow down", retry_after=2.5)),
+            },
+            deadlines={"unlinked": 1.0, "broken": 1.0, "throttled": 1.0},
+        )
+    )
+
+    by_source = {o.source: o for o in outcomes}
+
+    assert by_source["unlinked"].status == "not_linked"
+    assert by_source["broken"].status == "error"
+    assert by_source["broken"].summary()["error"] == "boom"
+    assert by_source["throttled"].status == "rate_limited"
+    assert by_source["throttled"].summary()["retry_after"] == 2.5
+
+
+def test_fan_out_as_completed_yields_fastest_source_first():
+    async def collect():
+        return [
+            outcome.source
+            async for outcome in fan_out_as_completed(
+                calls={
+                    "slow": sleeper(0.2, []),
+                    "fast": sleeper(0.0, []),
+                },
+                deadlines={"slow": 1.0, "fast": 1.0},
+            )
+        ]
+
+    assert asyncio.run(collect()) == ["fast", "slow"]
+
+
+def test_fan_out_awaits_coroutine_calls():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return [{"id": "a1"}]
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    outcomes = asyncio.run(
+        fan_out(
+            calls={"async": fetch, "hung": hang},
+            deadlines={"async": 1.0, "hung": 0.05},
+        )
+    )
+
+    by_source = {o.source: o for o in outcomes}
+
+    assert by_source["async"].results == [{"id": "a1"}]
+    assert by_source["hung"].status == "timeout"
@@ -1,5 +1,13 @@
 from datetime import datetime, timedelta, timezone
+
+import pytest
+from fake_gmail import FakeGmailServer
+from googleapiclient.errors import HttpError
+
 from omnibridge.accounts.models import Account
+from omnibridge.accounts.store import InMemoryTokenStore
+from omnibridge.connectors.gmail import GmailConnector
+from omnibridge.connectors.rate_limit import RateLimiter, RateLimitExceeded
 
 
 def make_google_account(user_id="user@example.com"):
@@ -15,11 +23,6 @@ def make_google_account(user_id="user@example.com"):
     )
 
 
-import pytest
-from omnibridge.connectors.gmail import GmailConnector
-from omnibridge.accounts.store import InMemoryTokenStore
-
-
 def test_gmail_connector_fails_if_account_not_linked():
     store = InMemoryTokenStore()
     connector = GmailConnector(token_store=store)
@@ -86,3 +89,385 @@ def test_gmail_connector_accepts_query(mocker):
 
     mock.assert_called_once()
 
+
+def test_gmail_connector_batches_metadata_lookups():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=20) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+
+        results = connector.fetch(user_id="user@example.com")
+
+        # One list call + one batch call, instead of 1 + N
+        assert len(server.requests) == 2
+        assert server.requests[1][0] == "POST"
+
+    assert [r["id"] for r in results] == [f"msg-{i}" for i in range(20)]
+    assert results[0]["subject"] == "Subject 0"
+    assert results[0]["source"] == "gmail"
+    assert results[0]["timestamp"] == "2024-01-15T12:34:56+00:00"
+
+
+def test_gmail_batch_reports_per_item_errors_separately():
+    store = InMemoryTokenStore()
+
+    with FakeGmailServer(message_count=3) as server:
+        server.missing_ids.add("msg-1")
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        account = make_google_account()
+        service = connector._build_service(account)
+
+        details, errors = connector._batch_get_metadata(
+            account, service, ["msg-0", "msg-1", "msg-2"]
+        )
+
+    assert [d["id"] for d in details] == ["msg-0", "msg-2"]
+    assert [e["id"] for e in errors] == ["msg-1"]
+
+
+def test_gmail_connector_reuses_built_service(mocker):
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+    build = mocker.spy(GmailConnector, "_build_service")
+
+    with FakeGmailServer(message_count=2) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+
+        connector.fetch(user_id="user@example.com")
+        connector.fetch(user_id="user@example.com")
+
+    assert build.call_count == 1
+    assert connector.services.stats()["hits"] == 1
+
+
+def test_gmail_service_cache_invalidated_when_token_replaced():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=2) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        connector.fetch(user_id="user@example.com")
+
+        assert len(connector.services) == 1
+
+        refreshed = make_google_account()
+        refreshed.access_token = "new-access-token"
+        store.save_account(refreshed)
+
+        assert len(connector.services) == 0
+
+
+def test_gmail_connector_syncs_incrementally_from_history():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=5) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        connector.fetch(user_id="user@example.com")
+
+        # Nothing changed: one history.list call, empty delta
+        server.requests.clear()
+        unchanged = connector.fetch(user_id="user@example.com")
+
+        assert len(server.requests) == 1
+        assert server.requests[0][1].startswith("/gmail/v1/users/me/history")
+        assert [m["id"] for m in unchanged] == [f"msg-{i}" for i in range(5)]
+
+        # One new message, one deleted: history.list + one batch get
+        new_message = server.add_message()
+        server.delete_message("msg-2")
+        server.requests.clear()
+
+        results = connector.fetch(user_id="user@example.com")
+
+        assert len(server.requests) == 2
+
+    assert [m["id"] for m in results] == [
+        new_message["id"], "msg-0", "msg-1", "msg-3", "msg-4",
+    ]
+
+
+def test_gmail_connector_full_resync_when_history_expired():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=3) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        connector.fetch(user_id="user@example.com")
+
+        new_message = server.add_message()
+        server.expire_history()
+        server.requests.clear()
+
+        results = connector.fetch(user_id="user@example.com")
+
+        # failed history.list, then list + batch
+        assert [method for method, _ in server.requests] == ["GET", "GET", "POST"]
+
+    assert results[0]["id"] == new_message["id"]
+
+
+def test_gmail_connector_pages_through_mailbox():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=5) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+
+        first = connector.fetch(user_id="user@example.com", options={"page_size": 2})
+        second = connector.fetch(
+            user_id="user@example.com",
+            options={"page_size": 2, "page_token": first.next_page_token},
+        )
+        last = connector.fetch(
+            user_id="user@example.com",
+            options={"page_size": 2, "page_token": second.next_page_token},
+        )
+
+    assert [m["id"] for m in first] == ["msg-0", "msg-1"]
+    assert [m["id"] for m in second] == ["msg-2", "msg-3"]
+    assert [m["id"] for m in last] == ["msg-4"]
+    assert last.next_page_token is None
+    assert all(m["source"] == "gmail" for m in second)
+
+
+def test_gmail_page_token_continues_snapshot_after_new_mail():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=6) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        connector.fetch(user_id="user@example.com", options={"page_size": 3})
+
+        newer = server.add_message()
+        newest = server.add_message()
+
+        first = connector.fetch(user_id="user@example.com", options={"page_size": 3})
+        second = connector.fetch(
+            user_id="user@example.com",
+            options={"page_size": 3, "page_token": first.next_page_token},
+        )
+
+    assert [m["id"] for m in first] == [newest["id"], newer["id"], "msg-0"]
+    assert [m["id"] for m in second] == ["msg-1", "msg-2", "msg-3"]
+
+
+def test_gmail_alternating_page_sizes_share_one_snapshot():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=6) as server:
+        connector = GmailConnector(token_store=store, api_endpoint=server.url)
+        connector.fetch(user_id="user@example.com", options={"page_size": 3})
+
+        server.requests.clear()
+        for _ in range(2):
+            small = connector.fetch(
+                user_id="user@example.com", options={"page_size": 2}
+            )
+            large = connector.fetch(
+                user_id="user@example.com", options={"page_size": 3}
+            )
+
+        # No full sync again: history.list per fetch, plus one ids-only
+        # list for the smaller page's token
+        assert [method for method, _ in server.requests] == ["GET"] * 5
+
+        second = connector.fetch(
+            user_id="user@example.com",
+            options={"page_size": 2, "page_token": small.next_page_token},
+        )
+
+    assert [m["id"] for m in small] == ["msg-0", "msg-1"]
+    assert [m["id"] for m in large] == ["msg-0", "msg-1", "msg-2"]
+    assert [m["id"] for m in second] == ["msg-2", "msg-3"]
+
+
+def fast_backoff_limiter():
+    # Real backoff bookkeeping, without actually sleeping
+    return RateLimiter(sleep=lambda seconds: None, max_wait=60.0)
+
+
+def test_gmail_connector_retries_after_rate_limit():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+    limiter = fast_backoff_limiter()
+
+    with FakeGmailServer(message_count=3) as server:
+        server.rate_limit(count=2, retry_after="2")
+        connector = GmailConnector(
+            token_store=store, api_endpoint=server.url, rate_limiter=limiter
+        )
+
+        results = connector.fetch(user_id="user@example.com")
+
+    assert [r["id"] for r in results] == ["msg-0", "msg-1", "msg-2"]
+    assert limiter.stats()["providers"]["google"]["backoffs"] == 2
+    assert limiter.bucket_state("google", "user@gmail.com")["blocked_for"] > 1.0
+
+
+def test_gmail_batch_retries_rate_limited_items():
+    store = InMemoryTokenStore()
+    limiter = fast_backoff_limiter()
+
+    with FakeGmailServer(message_count=3) as server:
+        connector = GmailConnector(
+            token_store=store, api_endpoint=server.url, rate_limiter=limiter
+        )
+        account = make_google_account()
+        service = connector._build_service(account)
+
+        # Gmail reports quota errors per sub-request inside a batch
+        server.rate_limit(count=2, status=403, reason="userRateLimitExceeded")
+
+        details, errors = connector._batch_get_metadata(
+            account, service, ["msg-0", "msg-1", "msg-2"]
+        )
+
+        batches = [r for r in server.requests if r[0] == "POST"]
+
+    assert [d["id"] for d in details] == ["msg-0", "msg-1", "msg-2"]
+    assert errors == []
+    assert len(batches) == 2
+
+
+def test_gmail_connector_gives_up_after_repeated_rate_limits():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+    limiter = fast_backoff_limiter()
+
+    with FakeGmailServer(message_count=3) as server:
+        server.rate_limit(count=10)
+        connector = GmailConnector(
+            token_store=store, api_endpoint=server.url, rate_limiter=limiter
+        )
+
+        with pytest.raises(RateLimitExceeded):
+            connector.fetch(user_id="user@example.com")
+
+        # One attempt plus max_retries
+        assert len(server.requests) == limiter.max_retries + 1
+
+
+def test_gmail_connector_does_not_retry_permission_errors():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=3) as server:
+        server.rate_limit(count=1, status=403, reason="insufficientPermissions")
+        connector = GmailConnector(
+            token_store=store,
+            api_endpoint=server.url,
+            rate_limiter=fast_backoff_limiter(),
+        )
+
+        with pytest.raises(HttpError):
+            connector.fetch(user_id="user@example.com")
+
+        assert len(server.requests) == 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_push_connector(store, server, clock):
+    return GmailConnector(
+        token_store=store,
+        api_endpoint=server.url,
+        push_topic="projects/omnibridge/topics/gmail",
+        push_max_staleness=300.0,
+        clock=clock,
+    )
+
+
+def test_watched_mailbox_is_served_without_polling():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+    clock = FakeClock()
+
+    with FakeGmailServer(message_count=5) as server:
+        connector = make_push_connector(store, server, clock)
+        connector.fetch(user_id="user@example.com")
+
+        assert server.watches == [{"topicName": "projects/omnibridge/topics/gmail"}]
+
+        # Gmail pushes changes to us: no calls until the staleness bound
+        server.requests.clear()
+        clock.now += 299
+        results = connector.fetch(user_id="user@example.com")
+
+        assert server.requests == []
+        assert [m["id"] for m in results] == [f"msg-{i}" for i in range(5)]
+
+        clock.now += 1
+        connector.fetch(user_id="user@example.com")
+
+        assert len(server.requests) == 1
+        assert server.requests[0][1].startswith("/gmail/v1/users/me/history")
+
+
+def test_push_notification_syncs_mailbox_snapshot():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+    clock = FakeClock()
+
+    with FakeGmailServer(message_count=3) as server:
+        connector = make_push_connector(store, server, clock)
+        connector.fetch(user_id="user@example.com")
+
+        new_message = server.add_message()
+        server.requests.clear()
+
+        assert connector.apply_notification("user@example.com", str(server.history_id))
+        # history.list + one batch get for the new message
+        assert len(server.requests) == 2
+
+        # Already applied, or older than the snapshot: nothing to do
+        server.requests.clear()
+        assert not connector.apply_notification(
+            "user@example.com", str(server.history_id)
+        )
+        assert server.requests == []
+
+        results = connector.fetch(user_id="user@example.com")
+
+    assert [m["id"] for m in results] == [
+        new_message["id"], "msg-0", "msg-1", "msg-2",
+    ]
+
+
+def test_push_notification_without_snapshot_is_ignored():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=3) as server:
+        connector = make_push_connector(store, server, FakeClock())
+
+        assert not connector.apply_notification("user@example.com", "99")
+        assert server.requests == []
+
+
+def test_failed_watch_falls_back_to_polling():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    with FakeGmailServer(message_count=3) as server:
+        connector = make_push_connector(store, server, FakeClock())
+        # Topic not publishable by Gmail: watch is refused
+        server.rate_limit(status=403, reason="forbidden")
+
+        results = connector.fetch(user_id="user@example.com")
+        assert len(results) == 3
+
+        server.requests.clear()
+        connector.fetch(user_id="user@example.com")
+
+        # Polls history, and does not retry the watch right away
+        assert len(server.requests) == 1
+        assert server.requests[0][1].startswith("/gmail/v1/users/me/history")
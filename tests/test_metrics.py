@@ -0,0 +1,101 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from omnibridge.api.metrics import REQUEST_SECONDS
+from omnibridge.auth import dependencies
+from omnibridge.core.metrics import SPAN_SECONDS, Histogram, MetricsRegistry, span
+from omnibridge.main import app
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "test_seconds", "Test latency.", labelnames=("route",), buckets=(0.1, 1.0)
+    )
+
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    assert registry.render().splitlines() == [
+        "# HELP test_seconds Test latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 2',
+        'test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_seconds_sum{route="/a"} 5.55',
+        'test_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_counter_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Things.", labelnames=("name",))
+
+    counter.inc('say "hi"')
+    counter.inc('say "hi"', amount=2)
+
+    assert 'test_total{name="say \\"hi\\""} 3' in registry.render()
+
+
+def test_span_records_blocks_that_raise():
+    before = SPAN_SECONDS.snapshot("test.failing")["count"]
+
+    with pytest.raises(ValueError):
+        with span("test.failing"):
+            raise ValueError("boom")
+
+    assert SPAN_SECONDS.snapshot("test.failing")["count"] == before + 1
+
+
+def test_histogram_snapshot_of_unknown_series_is_empty():
+    histogram = Histogram("test_seconds", "Test latency.")
+
+    assert histogram.snapshot() == {"count": 0, "sum": 0.0}
+
+
+def test_requests_are_recorded_by_route_template():
+    dependencies.verified_tokens.clear()
+    token = client.post("/auth/token", params={"email": "metrics@example.com"})
+    token = token.json()["access_token"]
+
+    before = REQUEST_SECONDS.snapshot("GET", "/accounts/{provider}", "200")["count"]
+    verify_before = SPAN_SECONDS.snapshot("jwt.verify")["count"]
+
+    response = client.get(
+        "/accounts/google", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.json() == {"linked": False}
+    after = REQUEST_SECONDS.snapshot("GET", "/accounts/{provider}", "200")
+    assert after["count"] == before + 1
+    assert after["sum"] > 0
+    assert SPAN_SECONDS.snapshot("jwt.verify")["count"] == verify_before + 1
+
+
+def test_unmatched_paths_share_one_label():
+    before = REQUEST_SECONDS.snapshot("GET", "unmatched", "404")["count"]
+
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+
+    assert REQUEST_SECONDS.snapshot("GET", "unmatched", "404")["count"] == before + 2
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE omnibridge_http_request_duration_seconds histogram" in body
+    assert (
+        'omnibridge_http_request_duration_seconds_count'
+        '{method="GET",route="/health",status="200"}'
+    ) in body
+    assert 'omnibridge_connector_bridge_calls{state="active"}' in body
+    assert 'omnibridge_cache_entries{cache="jwt"}' in body
@@ -0,0 +1,158 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fake_gmail import FakeGmailServer
+from omnibridge.api import notifications, search
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.main import app
+
+PUSH_TOKEN = "s3cret"
+
+client = TestClient(app)
+
+# The app only mounts the push route with a verification token configured
+push_app = FastAPI()
+push_app.include_router(notifications.router)
+push_client = TestClient(push_app)
+
+
+def post_notification(envelope, token=PUSH_TOKEN):
+    return push_client.post(
+        "/notifications/gmail", params={"token": token}, json=envelope
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_search_state(monkeypatch):
+    monkeypatch.setattr(notifications, "GMAIL_PUSH_VERIFICATION_TOKEN", PUSH_TOKEN)
+    search.result_cache.clear()
+    search.search_index.clear()
+    circuit_breakers.reset()
+    fetch_flights.reset()
+
+
+@pytest.fixture
+def fake_gmail(monkeypatch):
+    with FakeGmailServer(message_count=3) as server:
+        connector = connectors.get("gmail")
+        monkeypatch.setattr(connector, "api_endpoint", server.url)
+        monkeypatch.setattr(connector, "push_topic", "projects/p/topics/gmail")
+        yield server
+
+
+def push_envelope(email: str, history_id) -> dict:
+    data = json.dumps({"emailAddress": email, "historyId": history_id})
+    return {
+        "message": {
+            "data": base64.b64encode(data.encode()).decode(),
+            "messageId": "1",
+            "publishTime": "2024-01-15T12:34:56Z",
+        },
+        "subscription": "projects/p/subscriptions/omnibridge",
+    }
+
+
+def link_gmail(user: str, mailbox: str) -> str:
+    token = client.post("/auth/token", params={"email": user}).json()["access_token"]
+    client.post(
+        "/accounts/link",
+        json={
+            "provider": "google",
+            "provider_account_id": mailbox,
+            "access_token": "fake",
+            "expires_in": 3600,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return token
+
+
+def test_notification_for_unknown_mailbox_is_acknowledged():
+    response = post_notification(push_envelope("nobody@gmail.com", 5))
+
+    assert response.status_code == 204
+
+
+def test_malformed_notification_is_rejected():
+    response = post_notification({"message": {"data": "not base64!"}})
+
+    assert response.status_code == 400
+
+
+def test_notification_requires_verification_token():
+    envelope = push_envelope("nobody@gmail.com", 5)
+
+    assert post_notification(envelope, token="wrong").status_code == 403
+    assert post_notification(envelope, token="é").status_code == 403
+    assert push_client.post("/notifications/gmail", json=envelope).status_code == 403
+    assert post_notification(envelope).status_code == 204
+
+
+def test_push_route_is_not_mounted_without_verification_token(monkeypatch):
+    monkeypatch.setattr(notifications, "GMAIL_PUSH_VERIFICATION_TOKEN", None)
+    bare_app = FastAPI()
+
+    assert not notifications.include_push_routes(bare_app)
+    assert TestClient(bare_app).post(
+        "/notifications/gmail", json=push_envelope("nobody@gmail.com", 5)
+    ).status_code == 404
+
+
+def test_notification_updates_only_that_users_search_results(fake_gmail):
+    token = link_gmail("pushed@example.com", "pushed@gmail.com")
+    other = link_gmail("bystander@example.com", "bystander@gmail.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/search?q=subject", headers=headers)
+    client.get("/search?q=subject", headers={"Authorization": f"Bearer {other}"})
+    other_snapshot = search.result_cache.get("bystander@example.com", None, "gmail")
+
+    new_message = fake_gmail.add_message()
+    fake_gmail.requests.clear()
+
+    response = post_notification(
+        push_envelope("pushed@gmail.com", fake_gmail.history_id)
+    )
+
+    assert response.status_code == 204
+    # One incremental sync for the notified mailbox only
+    assert [path.split("?")[0] for _, path in fake_gmail.requests] == [
+        "/gmail/v1/users/me/history",
+        "/batch",
+    ]
+
+    snapshot = search.result_cache.get("pushed@example.com", None, "gmail")
+    assert snapshot[0]["id"] == new_message["id"]
+    assert search.result_cache.get("bystander@example.com", None, "gmail") == (
+        other_snapshot
+    )
+
+    # The new message is searchable without another call to Gmail
+    fake_gmail.requests.clear()
+    results = client.get(
+        f"/search?q={new_message['id']}", headers=headers
+    ).json()["results"]
+
+    assert fake_gmail.requests == []
+    assert [r["id"] for r in results] == [new_message["id"]]
+
+
+def test_sync_without_snapshot_leaves_search_results_alone(mocker):
+    connector = connectors.get("gmail")
+    mocker.patch.object(connector, "apply_notification", return_value=True)
+    mocker.patch.object(connector, "cached", return_value=None)
+    store_snapshot = mocker.patch.object(search, "store_snapshot")
+
+    result = asyncio.run(notifications.sync_gmail_user("user@example.com", "7"))
+
+    assert result == "synced"
+    store_snapshot.assert_not_called()
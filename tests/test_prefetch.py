@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from omnibridge.api import search
+from omnibridge.auth.dependencies import user_activity
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.core.prefetch import ActivityTracker, Prefetcher
+from omnibridge.main import app
+
+client = TestClient(app)
+gmail_connector = connectors.get("gmail")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_tracker(clock, max_users=10):
+    return ActivityTracker(
+        max_users=max_users, half_life=60.0, idle_after=600.0, clock=clock
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_search_state():
+    search.result_cache.clear()
+    search.search_index.clear()
+    circuit_breakers.reset()
+    fetch_flights.reset()
+    user_activity.clear()
+
+
+def test_frequent_users_outrank_a_single_recent_request():
+    clock = FakeClock()
+    tracker = make_tracker(clock)
+
+    for _ in range(5):
+        tracker.touch("regular")
+    clock.now = 30.0
+    tracker.touch("one-off")
+
+    assert tracker.ranked() == ["regular", "one-off"]
+
+    # Scores halve every minute: the regular fades once they stop
+    clock.now = 300.0
+    for _ in range(2):
+        tracker.touch("one-off")
+
+    assert tracker.ranked() == ["one-off", "regular"]
+
+
+def test_idle_users_are_not_ranked_and_least_recent_are_evicted():
+    clock = FakeClock()
+    tracker = make_tracker(clock, max_users=2)
+
+    tracker.touch("idle")
+    clock.now = 500.0
+    tracker.touch("alice")
+    tracker.touch("bob")
+
+    # "idle" was evicted to make room; nobody else is idle yet
+    assert sorted(tracker.ranked()) == ["alice", "bob"]
+
+    clock.now = 1200.0
+    assert tracker.ranked() == []
+
+
+def test_prefetch_round_stays_within_budget_in_rank_order():
+    clock = FakeClock()
+    tracker = make_tracker(clock)
+    for user, requests in (("low", 1), ("high", 3), ("mid", 2)):
+        for _ in range(requests):
+            tracker.touch(user)
+
+    warmed = []
+    running = 0
+    peak = 0
+
+    async def warm(user_id, source):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        warmed.append((user_id, source))
+        return True
+
+    prefetcher = Prefetcher(
+        tracker,
+        targets=lambda user_id: ["gmail", "drive"],
+        warm=warm,
+        interval=30.0,
+        calls_per_minute=6,  # 3 fetches per round
+        max_concurrency=2,
+    )
+
+    assert asyncio.run(prefetcher.run_once()) == 3
+
+    assert sorted(warmed) == [("high", "drive"), ("high", "gmail"), ("mid", "gmail")]
+    assert peak == 2
+    assert prefetcher.stats()["warmed"] == 3
+    assert prefetcher.stats()["deferred"] == 1
+
+
+def test_prefetch_plan_stops_looking_up_users_when_done():
+    tracker = make_tracker(FakeClock(), max_users=100)
+    for index in range(20):
+        tracker.touch(f"user-{index}")
+    looked_up = []
+
+    def targets(user_id):
+        looked_up.append(user_id)
+        # Most active users are already warm
+        return ["gmail"] if len(looked_up) % 5 == 0 else []
+
+    def make_prefetcher(calls_per_minute, max_users_per_round):
+        return Prefetcher(
+            tracker,
+            targets=targets,
+            warm=None,
+            interval=60.0,
+            calls_per_minute=calls_per_minute,
+            max_concurrency=1,
+            max_users_per_round=max_users_per_round,
+        )
+
+    # Budget filled after the 10th user
+    jobs, _ = make_prefetcher(calls_per_minute=2, max_users_per_round=100).plan()
+    assert len(jobs) == 2
+    assert len(looked_up) == 10
+
+    # Budget never filled: the walk is still bounded
+    looked_up.clear()
+    jobs, _ = make_prefetcher(calls_per_minute=50, max_users_per_round=8).plan()
+    assert len(jobs) == 1
+    assert len(looked_up) == 8
+
+
+def test_failed_prefetch_is_counted_and_does_not_stop_the_round():
+    tracker = make_tracker(FakeClock())
+    tracker.touch("alice")
+    tracker.touch("bob")
+
+    async def warm(user_id, source):
+        if user_id == "alice":
+            raise RuntimeError("provider down")
+        return True
+
+    prefetcher = Prefetcher(
+        tracker,
+        targets=lambda user_id: ["gmail"],
+        warm=warm,
+        interval=60.0,
+        calls_per_minute=10,
+        max_concurrency=4,
+    )
+
+    assert asyncio.run(prefetcher.run_once()) == 1
+    assert prefetcher.stats()["failed"] == 1
+
+
+def link_gmail(email: str) -> dict:
+    token = client.post("/auth/token", params={"email": email}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post(
+        "/accounts/link",
+        json={
+            "provider": "google",
+            "provider_account_id": email,
+            "access_token": "fake",
+            "expires_in": 3600,
+        },
+        headers=headers,
+    )
+    return headers
+
+
+def test_active_users_search_is_served_from_prefetched_snapshot(mocker):
+    headers = link_gmail("warm@example.com")
+    assert user_activity.ranked() == ["warm@example.com"]
+    assert search.prefetch_targets("warm@example.com") == ["gmail"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[{"id": "msg-1", "source": "gmail", "title": "Invoice"}],
+    )
+
+    assert asyncio.run(search.prefetcher.run_once()) == 1
+    # Fresh now: nothing left to prefetch for this user
+    assert search.prefetch_targets("warm@example.com") == []
+
+    fetch.reset_mock()
+    response = client.get("/search?q=invoice", headers=headers)
+
+    assert fetch.call_count == 0
+    assert response.json()["sources"]["gmail"]["cached"] is True
+    assert [r["id"] for r in response.json()["results"]] == ["msg-1"]
+
+
+def test_users_without_linked_sources_are_not_prefetched():
+    client.post("/auth/token", params={"email": "nolink@example.com"})
+
+    assert search.prefetch_targets("nolink@example.com") == []
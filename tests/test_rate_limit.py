@@ -0,0 +1,120 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from omnibridge.connectors.rate_limit import (
+    RateLimit,
+    RateLimitExceeded,
+    RateLimiter,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock, **kwargs):
+    kwargs.setdefault("account_limits", {"google": RateLimit(rate=10.0, burst=2.0)})
+    return RateLimiter(
+        clock=clock, sleep=clock.sleep, rng=random.Random(0), **kwargs
+    )
+
+
+def test_bucket_allows_burst_then_queues():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    waits = [limiter.acquire("google", "a") for _ in range(3)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1)
+    assert limiter.stats()["providers"]["google"]["queued"] == 1
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    limiter.acquire("google", "a", cost=2)
+    clock.now += 0.2
+
+    assert limiter.acquire("google", "a", cost=2) == 0.0
+
+
+def test_accounts_have_separate_buckets():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    limiter.acquire("google", "a", cost=2)
+
+    assert limiter.acquire("google", "b", cost=2) == 0.0
+
+
+def test_provider_bucket_is_shared_by_accounts():
+    clock = FakeClock()
+    limiter = make_limiter(
+        clock, provider_limits={"google": RateLimit(rate=10.0, burst=2.0)}
+    )
+
+    limiter.acquire("google", "a", cost=2)
+
+    assert limiter.acquire("google", "b", cost=1) == pytest.approx(0.1)
+
+
+def test_rejects_when_queueing_would_take_too_long():
+    clock = FakeClock()
+    limiter = make_limiter(clock, max_wait=0.5)
+
+    limiter.acquire("google", "a", cost=2)
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.acquire("google", "a", cost=10)
+
+    assert exc_info.value.retry_after == pytest.approx(1.0)
+    assert clock.sleeps == []
+    assert limiter.stats()["providers"]["google"]["rejected"] == 1
+
+
+def test_backoff_pauses_only_that_account():
+    clock = FakeClock()
+    limiter = make_limiter(clock, account_limits={}, backoff_base=0.5)
+
+    delay = limiter.backoff("google", "a", attempt=0, retry_after=1.5)
+
+    assert delay == 1.5
+    assert limiter.bucket_state("google", "a")["blocked_for"] == 1.5
+    assert limiter.acquire("google", "b") == 0.0
+    assert limiter.acquire("google", "a") == pytest.approx(1.5)
+    assert limiter.stats()["providers"]["google"]["backoffs"] == 1
+
+
+def test_backoff_delay_grows_with_jitter_and_cap():
+    limiter = RateLimiter(backoff_base=1.0, backoff_max=8.0, rng=random.Random(1))
+
+    for attempt, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (6, 8.0)]:
+        delays = {limiter.backoff_delay(attempt) for _ in range(20)}
+
+        assert all(ceiling / 2 <= d <= ceiling for d in delays)
+        assert len(delays) > 1
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Mon, 15 Jan 2024 12:00:05 GMT", now=now) == 5.0
+    assert parse_retry_after(None) == 0.0
+    assert parse_retry_after("soon") == 0.0
+    assert parse_retry_after("inf") == 0.0
+    assert parse_retry_after("nan") == 0.0
@@ -0,0 +1,208 @@
+import asyncio
+import threading
+
+from omnibridge.connectors.base import Page
+from omnibridge.core.result_cache import (
+    ResultCache,
+    SqliteResultStore,
+    decode_results,
+    encode_results,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(clock=None, max_entries=10, shared=None):
+    return ResultCache(
+        ttls={"gmail": 60.0},
+        default_ttl=10.0,
+        max_entries=max_entries,
+        clock=clock or FakeClock(),
+        shared=shared,
+        local_ttl=5.0,
+    )
+
+
+def make_workers(tmp_path, clock, count=2):
+    """Caches of separate workers sharing one SQLite file."""
+    path = str(tmp_path / "cache.db")
+    return [
+        make_cache(clock=clock, shared=SqliteResultStore(path, 100, clock=clock))
+        for _ in range(count)
+    ]
+
+
+def test_cache_hit_uses_normalized_query():
+    cache = make_cache()
+
+    cache.put("alice", "  Invoice  Due ", "gmail", [{"id": "g1"}])
+
+    assert cache.get("alice", "invoice due", "gmail") == [{"id": "g1"}]
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_is_scoped_per_user_and_source():
+    cache = make_cache()
+
+    cache.put("alice", "invoice", "gmail", [{"id": "g1"}])
+
+    assert cache.get("bob", "invoice", "gmail") is None
+    assert cache.get("alice", "invoice", "drive") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_entries_expire_per_source_ttl():
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+
+    cache.put("alice", "q", "gmail", [{"id": "g1"}])
+    cache.put("alice", "q", "drive", [{"id": "d1"}])
+
+    clock.now = 30.0
+
+    assert cache.get("alice", "q", "gmail") == [{"id": "g1"}]
+    assert cache.get("alice", "q", "drive") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = make_cache(max_entries=2)
+
+    cache.put("alice", "one", "gmail", [])
+    cache.put("alice", "two", "gmail", [])
+    cache.get("alice", "one", "gmail")
+    cache.put("alice", "three", "gmail", [])
+
+    assert cache.get("alice", "two", "gmail") is None
+    assert cache.get("alice", "one", "gmail") == []
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_user_only_drops_that_user():
+    cache = make_cache()
+
+    cache.put("alice", "q", "gmail", [{"id": "a"}])
+    cache.put("bob", "q", "gmail", [{"id": "b"}])
+
+    assert cache.invalidate_user("alice") == 1
+    assert cache.get("alice", "q", "gmail") is None
+    assert cache.get("bob", "q", "gmail") == [{"id": "b"}]
+
+
+def test_results_round_trip_through_compact_encoding():
+    small = [{"id": "g1", "title": "Invoice"}]
+    large = [{"id": f"g{i}", "snippet": "quarterly report " * 5} for i in range(50)]
+
+    assert encode_results(small).startswith(b"j")
+    assert encode_results(large).startswith(b"z")
+    assert len(encode_results(large)) < len(str(large)) / 4
+    assert decode_results(encode_results(small)) == small
+    assert decode_results(encode_results(large)) == large
+
+
+def test_workers_share_results_through_shared_tier(tmp_path):
+    clock = FakeClock()
+    first, second = make_workers(tmp_path, clock)
+
+    first.put("alice", None, "gmail", [{"id": "g1"}])
+
+    assert second.get("alice", None, "gmail") == [{"id": "g1"}]
+    assert second.stats()["shared_hits"] == 1
+    assert second.expires_in("alice", None, "gmail") == 60.0
+
+    # Expiry is the writer's, not when the reader copied it
+    clock.now = 61.0
+    assert second.get("alice", None, "gmail") is None
+
+
+def test_page_token_survives_both_tiers(tmp_path):
+    clock = FakeClock()
+    first, second = make_workers(tmp_path, clock)
+    page = Page([{"id": "g1"}], next_page_token="gmail-2")
+
+    assert decode_results(encode_results(page)).next_page_token == "gmail-2"
+
+    first.put("alice", None, "gmail", page)
+
+    assert first.get("alice", None, "gmail").next_page_token == "gmail-2"
+    assert second.get("alice", None, "gmail").next_page_token == "gmail-2"
+
+
+def test_async_access_runs_shared_tier_off_the_event_loop(tmp_path, mocker):
+    clock = FakeClock()
+    first, second = make_workers(tmp_path, clock)
+    shared = second._shared
+    threads = []
+
+    def record(method):
+        original = getattr(shared, method)
+
+        def call(*args):
+            threads.append(threading.get_ident())
+            return original(*args)
+
+        mocker.patch.object(shared, method, side_effect=call)
+
+    record("get")
+    record("put")
+
+    async def main():
+        await second.aput("alice", None, "gmail", [{"id": "g1"}])
+        # Trusted local copy: no shared lookup
+        local = await second.aget("alice", None, "gmail")
+        clock.now = 6.0
+        rechecked = await second.aget("alice", None, "gmail")
+        return threading.get_ident(), local, rechecked
+
+    loop_thread, local, rechecked = asyncio.run(main())
+
+    assert local == rechecked == [{"id": "g1"}]
+    assert len(threads) == 2
+    assert loop_thread not in threads
+    assert first.get("alice", None, "gmail") == [{"id": "g1"}]
+
+
+def test_local_copy_is_rechecked_after_local_ttl(tmp_path):
+    clock = FakeClock()
+    first, second = make_workers(tmp_path, clock)
+
+    first.put("alice", None, "gmail", [{"id": "g1"}])
+    second.get("alice", None, "gmail")
+
+    first.put("alice", None, "gmail", [{"id": "g2"}])
+
+    # Served from the local tier until it is due for a check
+    clock.now = 4.0
+    assert second.get("alice", None, "gmail") == [{"id": "g1"}]
+
+    clock.now = 6.0
+    assert second.get("alice", None, "gmail") == [{"id": "g2"}]
+
+    assert first.invalidate_user("alice") == 1
+    clock.now = 12.0
+    assert second.get("alice", None, "gmail") is None
+
+
+def test_shared_tier_purges_expired_and_overflowing_entries(tmp_path):
+    clock = FakeClock()
+    store = SqliteResultStore(
+        str(tmp_path / "cache.db"), max_entries=3, purge_every=1000, clock=clock
+    )
+
+    store.put(("alice", "", "gmail"), [], expires_at=5.0)
+    for i in range(4):
+        store.put((f"user{i}", "", "gmail"), [], expires_at=100.0 + i, stored_at=i)
+
+    clock.now = 10.0
+    store.purge()
+
+    assert len(store) == 3
+    assert store.get(("alice", "", "gmail")) is None
+    assert store.get(("user0", "", "gmail")) is None
+    assert store.get(("user3", "", "gmail")) == ([], 103.0, 3.0)
@@ -1,7 +1,38 @@
+import asyncio
+import json
+import pytest
 from fastapi.testclient import TestClient
 from omnibridge.main import app
+from omnibridge.api import search
+from omnibridge.api.search import result_cache, search_index
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.connectors.base import BaseConnector, Page
+from omnibridge.core.cursors import encode_cursor
+from omnibridge.core.result_cache import ResultCache, SqliteResultStore
+from omnibridge.core.search_index import SearchIndex
 
 client = TestClient(app)
+gmail_connector = connectors.get("gmail")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def empty_result_cache():
+    result_cache.clear()
+    search_index.clear()
+    circuit_breakers.reset()
+    fetch_flights.reset()
 
 
 def test_search_requires_authentication():
@@ -10,7 +41,7 @@ def test_search_requires_authentication():
 
 def test_search_returns_empty_if_no_sources_linked():
     token_response = client.post(
-        "/auth/token", params={"email": "user@example.com"}
+        "/auth/token", params={"email": "unlinked@example.com"}
     )
     token = token_response.json()["access_token"]
 
@@ -20,7 +51,8 @@ def test_search_returns_empty_if_no_sources_linked():
     )
 
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json()["results"] == []
+    assert response.json()["sources"]["gmail"]["status"] == "not_linked"
 
 
 def test_search_aggregates_gmail_results(mocker):
@@ -43,8 +75,9 @@ def test_search_aggregates_gmail_results(mocker):
         headers={"Authorization": f"Bearer {token}"},
     )
 
-    mocker.patch(
-        "omnibridge.api.search.gmail_connector.fetch",
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
         return_value=[
             {
                 "id": "msg-1",
@@ -62,27 +95,44 @@ def test_search_aggregates_gmail_results(mocker):
     )
 
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["source"] == "gmail"
+    assert len(response.json()["results"]) == 1
+    assert response.json()["results"][0]["source"] == "gmail"
+    assert response.json()["sources"]["gmail"]["status"] == "ok"
+
+
+class FakeDriveConnector(BaseConnector):
+    provider = "google"
 
+    def fetch(self, user_id, query=None, options=None):
+        return []
 
-def test_search_aggregates_multiple_sources(mocker):
+
+@pytest.fixture
+def drive_connector():
+    connectors.register("drive", FakeDriveConnector)
+    yield connectors.get("drive")
+    connectors.unregister("drive")
+
+
+def test_search_aggregates_multiple_sources(mocker, drive_connector):
     token_response = client.post(
         "/auth/token", params={"email": "user@example.com"}
     )
     token = token_response.json()["access_token"]
 
-    mocker.patch(
-        "omnibridge.api.search.gmail_connector.fetch",
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
         return_value=[
-            {"id": "g1", "source": "gmail"}
+            {"id": "g1", "source": "gmail", "subject": "test"}
         ],
     )
 
-    mocker.patch(
-        "omnibridge.api.search.drive_connector.fetch",
+    mocker.patch.object(
+        drive_connector,
+        "fetch",
         return_value=[
-            {"id": "d1", "source": "drive"}
+            {"id": "d1", "source": "drive", "subject": "test"}
         ],
     )
 
@@ -91,10 +141,11 @@ def test_search_aggregates_multiple_sources(mocker):
         headers={"Authorization": f"Bearer {token}"},
     )
 
-    data = response.json()
+    data = response.json()["results"]
     sources = {item["source"] for item in data}
 
     assert sources == {"gmail", "drive"}
+    assert response.json()["sources"]["drive"]["status"] == "ok"
 
 
 def test_search_respects_sources_filter(mocker):
@@ -103,8 +154,9 @@ def test_search_respects_sources_filter(mocker):
     )
     token = token_response.json()["access_token"]
 
-    mocker.patch(
-        "omnibridge.api.search.gmail_connector.fetch",
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
         return_value=[{"id": "g1", "source": "gmail"}],
     )
 
@@ -113,6 +165,495 @@ def test_search_respects_sources_filter(mocker):
         headers={"Authorization": f"Bearer {token}"},
     )
 
-    assert all(item["source"] == "gmail" for item in response.json())
+    assert all(item["source"] == "gmail" for item in response.json()["results"])
+
+
+def test_search_reports_connector_errors(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=RuntimeError("quota exceeded"),
+    )
+
+    response = client.get(
+        "/search?q=test",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"] == []
+    assert response.json()["sources"]["gmail"]["status"] == "error"
+    assert response.json()["sources"]["gmail"]["error"] == "quota exceeded"
+
+
+def test_search_serves_repeat_queries_from_cache(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[{"id": "g1", "source": "gmail", "subject": "Invoice"}],
+    )
+
+    first = client.get(
+        "/search?q=Invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    second = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert fetch.call_count == 1
+    assert first.json()["sources"]["gmail"]["cached"] is False
+    assert second.json()["sources"]["gmail"]["cached"] is True
+    assert second.json()["results"] == [
+        {"id": "g1", "source": "gmail", "subject": "Invoice"}
+    ]
+
+
+def test_linking_an_account_invalidates_cached_results(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "relink@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[{"id": "g1", "source": "gmail"}],
+    )
+
+    client.get("/search?q=invoice", headers={"Authorization": f"Bearer {token}"})
+
+    client.post(
+        "/accounts/link",
+        json={
+            "provider": "google",
+            "provider_account_id": "relink@gmail.com",
+            "access_token": "fake",
+            "expires_in": 3600,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    client.get("/search?q=invoice", headers={"Authorization": f"Bearer {token}"})
+
+    assert fetch.call_count == 2
+
+
+def test_search_filters_and_ranks_by_query(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[
+            {"id": "g1", "source": "gmail", "subject": "Lunch plans"},
+            {"id": "g2", "source": "gmail", "subject": "Invoice", "snippet": "invoice due"},
+            {"id": "g3", "source": "gmail", "subject": "Re: invoice"},
+        ],
+    )
+
+    response = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    ids = [item["id"] for item in response.json()["results"]]
+
+    assert ids == ["g2", "g3"]
+    assert response.json()["sources"]["gmail"]["count"] == 2
+
+
+def test_search_answers_from_index_while_refreshing(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[{"id": "g1", "source": "gmail", "subject": "Invoice"}],
+    )
+    schedule_refresh = mocker.patch("omnibridge.api.search.schedule_refresh")
+
+    client.get("/search?q=invoice", headers={"Authorization": f"Bearer {token}"})
+
+    # Snapshot expired: serve the index, refresh in the background
+    result_cache.clear()
+    response = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert [item["id"] for item in response.json()["results"]] == ["g1"]
+    assert response.json()["sources"]["gmail"]["refreshing"] is True
+    schedule_refresh.assert_called_once()
+
+
+def test_search_sees_accounts_linked_through_accounts_api(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "shared@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    client.post(
+        "/accounts/link",
+        json={
+            "provider": "google",
+            "provider_account_id": "shared@gmail.com",
+            "access_token": "fake",
+            "expires_in": 3600,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    fetch_from_api = mocker.patch.object(
+        gmail_connector,
+        "_fetch_from_gmail_api",
+        return_value=[{"id": "g1", "subject": "Invoice"}],
+    )
+
+    response = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json()["sources"]["gmail"]["status"] == "ok"
+    assert fetch_from_api.call_args.args[0].provider_account_id == "shared@gmail.com"
+
+
+def test_search_streams_ndjson_when_requested(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[
+            {"id": "g1", "source": "gmail", "subject": "Invoice 1"},
+            {"id": "g2", "source": "gmail", "subject": "Invoice 2"},
+        ],
+    )
+
+    response = client.get(
+        "/search?q=invoice",
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/x-ndjson",
+        },
+    )
+
+    frames = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [f["type"] for f in frames] == ["result", "result", "summary"]
+    assert {f["data"]["id"] for f in frames[:2]} == {"g1", "g2"}
+    assert frames[-1]["data"]["count"] == 2
+    assert frames[-1]["data"]["sources"]["gmail"]["status"] == "ok"
+
+
+def test_search_streams_server_sent_events(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=RuntimeError("quota exceeded"),
+    )
+
+    response = client.get(
+        "/search?q=invoice",
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Accept": "text/event-stream",
+        },
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: summary\ndata: ")
+
+    summary = json.loads(response.text.split("data: ", 1)[1])
+    assert summary["sources"]["gmail"]["status"] == "error"
+
+
+def test_search_cursor_scrolls_into_deeper_provider_pages(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=[
+            Page(
+                [{"id": "g1", "source": "gmail", "subject": "Invoice 1"}],
+                next_page_token="gmail-2",
+            ),
+            Page([{"id": "g2", "source": "gmail", "subject": "Invoice 2"}]),
+        ],
+    )
+
+    first = client.get(
+        "/search?q=invoice&limit=1",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+    second = client.get(
+        "/search",
+        params={"q": "invoice", "limit": 1, "cursor": first["next_cursor"]},
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+
+    assert [r["id"] for r in first["results"]] == ["g1"]
+    assert [r["id"] for r in second["results"]] == ["g2"]
+    assert second["next_cursor"] is None
+    assert fetch.call_args_list[1].kwargs["options"]["page_token"] == "gmail-2"
+
+
+def test_search_cursor_pages_to_the_end_without_repeats(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    def provider_page(number, next_page_token=None):
+        return Page(
+            [
+                {
+                    "id": f"g{number}-{i}",
+                    "source": "gmail",
+                    "subject": f"Invoice {number} {i}",
+                    # Deeper pages rank first: newer, equally good matches
+                    "timestamp": f"2025-0{number}-0{3 - i}T00:00:00Z",
+                }
+                for i in range(3)
+            ],
+            next_page_token=next_page_token,
+        )
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=[
+            provider_page(1, "gmail-2"),
+            provider_page(2, "gmail-3"),
+            provider_page(3),
+        ],
+    )
+
+    returned = []
+    params = {"q": "invoice", "limit": 2}
+    for _ in range(10):
+        page = client.get(
+            "/search", params=params, headers={"Authorization": f"Bearer {token}"}
+        ).json()
+        returned += [r["id"] for r in page["results"]]
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert len(returned) == len(set(returned))
+    assert sorted(returned) == sorted(
+        f"g{number}-{i}" for number in (1, 2, 3) for i in range(3)
+    )
+
+
+def test_workers_reindex_newer_snapshots_from_the_shared_cache(tmp_path, mocker):
+    clock = FakeClock()
+    path = str(tmp_path / "cache.db")
+    # Two workers: each with its own cache front and index, one shared file
+    first, second = [
+        (
+            ResultCache(
+                ttls={},
+                default_ttl=60.0,
+                max_entries=10,
+                clock=clock,
+                shared=SqliteResultStore(path, 100, clock=clock),
+                local_ttl=0.0,
+            ),
+            SearchIndex(max_users=10),
+        )
+        for _ in range(2)
+    ]
+
+    def on(worker, call):
+        mocker.patch.object(search, "result_cache", worker[0])
+        mocker.patch.object(search, "search_index", worker[1])
+        return asyncio.run(call)
+
+    def indexed(worker):
+        index = worker[1].for_user("user@example.com")
+        return [r["id"] for r in index.search("invoice")]
+
+    clock.now = 1.0
+    on(first, search.store_snapshot(
+        "user@example.com", "gmail", [{"id": "g1", "subject": "Invoice"}]
+    ))
+    on(second, search.plan_sources("user@example.com", {"gmail": gmail_connector}))
+
+    assert indexed(second) == ["g1"]
+
+    clock.now = 2.0
+    on(first, search.store_snapshot(
+        "user@example.com", "gmail", [{"id": "g2", "subject": "Invoice"}]
+    ))
+    on(second, search.plan_sources("user@example.com", {"gmail": gmail_connector}))
+
+    assert indexed(second) == ["g2"]
+
+
+def test_search_cursor_is_bound_to_query():
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    cursor = encode_cursor({"u": "user@example.com", "q": "invoice", "o": 1})
+
+    response = client.get(
+        "/search",
+        params={"q": "lunch", "cursor": cursor},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_rejects_non_ascii_cursor():
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    response = client.get(
+        "/search",
+        params={"q": "invoice", "cursor": "abc.é"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 400
+
+
+def trip_gmail_circuit():
+    breaker = circuit_breakers.for_provider("gmail")
+    for _ in range(breaker.minimum_calls):
+        breaker.record(0.0, failed=True)
+
+
+def test_search_degrades_to_stale_results_when_circuit_open(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        return_value=[{"id": "g1", "source": "gmail", "subject": "Invoice"}],
+    )
+    client.get("/search?q=invoice", headers={"Authorization": f"Bearer {token}"})
+
+    result_cache.clear()
+    trip_gmail_circuit()
+    fetch = mocker.patch.object(gmail_connector, "fetch")
+
+    body = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+
+    assert [r["id"] for r in body["results"]] == ["g1"]
+    assert body["sources"]["gmail"]["status"] == "degraded"
+    assert body["sources"]["gmail"]["stale"] is True
+    assert body["sources"]["gmail"]["retry_after"] > 0
+    fetch.assert_not_called()
+
+
+def test_search_uses_connector_snapshot_when_circuit_open(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    trip_gmail_circuit()
+    fetch = mocker.patch.object(gmail_connector, "fetch")
+    mocker.patch.object(
+        gmail_connector,
+        "cached",
+        return_value=[{"id": "g1", "source": "gmail", "subject": "Invoice"}],
+    )
+
+    body = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+
+    assert [r["id"] for r in body["results"]] == ["g1"]
+    assert body["sources"]["gmail"]["stale"] is True
+    fetch.assert_not_called()
+
+
+def test_search_reports_degraded_source_without_data(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    trip_gmail_circuit()
+    mocker.patch.object(gmail_connector, "cached", return_value=None)
+
+    body = client.get(
+        "/search?q=invoice",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+
+    assert body["results"] == []
+    assert body["sources"]["gmail"]["status"] == "degraded"
+    assert body["sources"]["gmail"]["stale"] is False
+
+
+def test_search_failures_open_the_circuit(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=RuntimeError("Gmail is down"),
+    )
+    mocker.patch.object(gmail_connector, "cached", return_value=None)
 
+    breaker = circuit_breakers.for_provider("gmail")
+    statuses = [
+        client.get(
+            "/search?q=invoice",
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()["sources"]["gmail"]["status"]
+        for _ in range(breaker.minimum_calls + 2)
+    ]
 
+    assert statuses[:breaker.minimum_calls] == ["error"] * breaker.minimum_calls
+    assert statuses[-2:] == ["degraded", "degraded"]
+    assert fetch.call_count == breaker.minimum_calls
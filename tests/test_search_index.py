@@ -0,0 +1,71 @@
+from omnibridge.core.search_index import SearchIndex, UserIndex, tokenize
+
+
+def record(record_id, subject="", source="gmail", **fields):
+    return {"id": record_id, "source": source, "subject": subject, **fields}
+
+
+def test_tokenize_splits_addresses_and_lowercases():
+    assert tokenize("Re: Invoice from Alice@Example.com") == [
+        "re", "invoice", "from", "alice", "example", "com",
+    ]
+
+
+def test_search_matches_all_indexed_fields():
+    index = UserIndex()
+    index.replace_source("gmail", [
+        record("1", subject="Quarterly report"),
+        record("2", **{"from": "bob@acme.io"}),
+        record("3", to=["carol@example.com"]),
+        record("4", snippet="see the attached report"),
+    ])
+
+    assert {r["id"] for r in index.search("report")} == {"1", "4"}
+    assert [r["id"] for r in index.search("acme")] == ["2"]
+    assert [r["id"] for r in index.search("carol")] == ["3"]
+
+
+def test_search_ranks_and_limits_results():
+    index = UserIndex()
+    index.replace_source("gmail", [
+        record("weak", subject="invoice", snippet="lunch on friday with the team"),
+        record("strong", subject="invoice", snippet="invoice overdue"),
+        record("none", subject="lunch"),
+    ])
+
+    assert [r["id"] for r in index.search("invoice")] == ["strong", "weak"]
+    assert [r["id"] for r in index.search("invoice", limit=1)] == ["strong"]
+
+
+def test_empty_query_returns_newest_first():
+    index = UserIndex()
+    index.replace_source("gmail", [
+        record("old", timestamp="2024-01-01T00:00:00+00:00"),
+        record("new", timestamp="2025-01-01T00:00:00+00:00"),
+    ])
+
+    assert [r["id"] for r in index.search("")] == ["new", "old"]
+
+
+def test_replace_source_drops_missing_records_and_keeps_other_sources():
+    index = UserIndex()
+    index.replace_source("gmail", [record("1", "alpha"), record("2", "alpha")])
+    index.replace_source("drive", [record("d", "alpha", source="drive")])
+
+    index.replace_source("gmail", [record("2", "alpha beta")])
+
+    assert {r["id"] for r in index.search("alpha")} == {"2", "d"}
+    assert [r["id"] for r in index.search("beta")] == ["2"]
+    assert [r["id"] for r in index.search("alpha", sources=["drive"])] == ["d"]
+    assert len(index) == 2
+
+
+def test_search_index_is_per_user_and_bounded():
+    indexes = SearchIndex(max_users=2)
+
+    indexes.for_user("alice").replace_source("gmail", [record("1", "secret")])
+    indexes.for_user("bob")
+    indexes.for_user("carol")
+
+    assert len(indexes) == 2
+    assert indexes.for_user("alice").search("secret") == []
@@ -1,7 +1,27 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from omnibridge.main import app
+from omnibridge.connectors.base import Page
+from omnibridge.connectors.dependencies import (
+    circuit_breakers,
+    connectors,
+    fetch_flights,
+)
+from omnibridge.connectors.rate_limit import RateLimitExceeded
+from omnibridge.core.cursors import encode_cursor
 
 client = TestClient(app)
+gmail_connector = connectors.get("gmail")
+
+
+@pytest.fixture(autouse=True)
+def closed_circuits():
+    circuit_breakers.reset()
+    fetch_flights.reset()
 
 
 def test_fetch_gmail_messages_requires_authentication():
@@ -42,8 +62,9 @@ def test_fetch_gmail_messages_success(mocker):
         headers={"Authorization": f"Bearer {token}"},
     )
 
-    mocker.patch(
-        "omnibridge.api.sources.gmail_connector.fetch",
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
         return_value=[
             {
                 "id": "msg-1",
@@ -66,3 +87,182 @@ def test_fetch_gmail_messages_success(mocker):
     assert response.json()[0]["source"] == "gmail"
 
 
+def test_fetch_gmail_messages_returns_continuation_cursor(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "pager@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    fetch = mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=[
+            Page([{"id": "msg-1", "source": "gmail"}], next_page_token="gmail-2"),
+            Page([{"id": "msg-2", "source": "gmail"}]),
+        ],
+    )
+
+    first = client.get(
+        "/sources/gmail/messages?page_size=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(
+        "/sources/gmail/messages",
+        params={"page_size": 1, "cursor": cursor},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert first.json() == [{"id": "msg-1", "source": "gmail"}]
+    assert second.json() == [{"id": "msg-2", "source": "gmail"}]
+    assert "X-Next-Cursor" not in second.headers
+    assert fetch.call_args_list[1].kwargs["options"] == {
+        "page_size": 1,
+        "page_token": "gmail-2",
+    }
+
+
+def test_fetch_gmail_messages_rejects_other_users_cursor():
+    token_response = client.post(
+        "/auth/token", params={"email": "pager@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    stolen = encode_cursor({"u": "someone-else@example.com", "t": "gmail-2"})
+
+    response = client.get(
+        "/sources/gmail/messages",
+        params={"cursor": stolen},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_fetch_gmail_messages_rejects_non_ascii_cursor():
+    token_response = client.post(
+        "/auth/token", params={"email": "pager@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    response = client.get(
+        "/sources/gmail/messages",
+        params={"cursor": "abc.é"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_fetch_gmail_messages_reports_rate_limit(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    mocker.patch.object(
+        gmail_connector,
+        "fetch",
+        side_effect=RateLimitExceeded("Gmail rate limit exceeded", retry_after=1.2),
+    )
+
+    response = client.get(
+        "/sources/gmail/messages",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+
+def trip_gmail_circuit():
+    breaker = circuit_breakers.for_provider("gmail")
+    for _ in range(breaker.minimum_calls):
+        breaker.record(0.0, failed=True)
+
+
+def test_fetch_gmail_messages_serves_stale_page_when_circuit_open(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    trip_gmail_circuit()
+    fetch = mocker.patch.object(gmail_connector, "fetch")
+    mocker.patch.object(
+        gmail_connector,
+        "cached",
+        return_value=Page([{"id": "msg-1", "source": "gmail"}]),
+    )
+
+    response = client.get(
+        "/sources/gmail/messages",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": "msg-1", "source": "gmail"}]
+    assert response.headers["X-Source-Status"] == "degraded"
+    fetch.assert_not_called()
+
+
+def test_fetch_gmail_messages_unavailable_when_circuit_open_without_data(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    trip_gmail_circuit()
+    mocker.patch.object(gmail_connector, "cached", return_value=None)
+
+    response = client.get(
+        "/sources/gmail/messages",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_concurrent_identical_requests_share_one_gmail_fetch(mocker):
+    token_response = client.post(
+        "/auth/token", params={"email": "user@example.com"}
+    )
+    token = token_response.json()["access_token"]
+
+    release = threading.Event()
+
+    def slow_fetch(**kwargs):
+        release.wait(timeout=5)
+        return Page([{"id": "msg-1", "source": "gmail"}])
+
+    fetch = mocker.patch.object(gmail_connector, "fetch", side_effect=slow_fetch)
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            requests = [
+                asyncio.ensure_future(
+                    async_client.get(
+                        "/sources/gmail/messages",
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+                )
+                for _ in range(5)
+            ]
+
+            # Hold the upstream call open until every request has joined it
+            while fetch_flights.stats().get("gmail", {}).get("calls", 0) < 5:
+                await asyncio.sleep(0.005)
+            release.set()
+
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(asyncio.wait_for(burst(), timeout=5))
+
+    assert fetch.call_count == 1
+    assert [r.status_code for r in responses] == [200] * 5
+    assert all(r.json() == [{"id": "msg-1", "source": "gmail"}] for r in responses)
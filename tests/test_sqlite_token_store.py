@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+from omnibridge.accounts.models import Account
+from omnibridge.accounts.store import SqliteTokenStore
+
+
+def make_account(
+    user_id="user@example.com",
+    provider="google",
+    provider_account_id="user@gmail.com",
+    access_token="access-token",
+):
+    return Account(
+        user_id=user_id,
+        provider=provider,
+        provider_account_id=provider_account_id,
+        access_token=access_token,
+        refresh_token="refresh-token",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        scopes=["scope.read"],
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def test_sqlite_store_round_trips_accounts(tmp_path):
+    store = SqliteTokenStore(str(tmp_path / "tokens.db"))
+    account = make_account()
+
+    store.save_account(account)
+
+    assert store.get_account("user@example.com", "google") == account
+    assert store.get_account("user@example.com", "notion") is None
+    assert store.get_account("other@example.com", "google") is None
+
+
+def test_sqlite_store_lists_accounts_per_user(tmp_path):
+    store = SqliteTokenStore(str(tmp_path / "tokens.db"))
+
+    store.save_account(make_account(provider="google"))
+    store.save_account(make_account(provider="notion"))
+    store.save_account(make_account(user_id="bob@example.com"))
+
+    providers = {a.provider for a in store.list_accounts("user@example.com")}
+
+    assert providers == {"google", "notion"}
+    assert len(store.list_all()) == 3
+
+
+def test_sqlite_store_finds_accounts_by_provider_identity(tmp_path):
+    store = SqliteTokenStore(str(tmp_path / "tokens.db"))
+
+    store.save_account(make_account(user_id="alice@example.com"))
+    store.save_account(make_account(user_id="bob@example.com"))
+    store.save_account(make_account(provider_account_id="other@gmail.com"))
+
+    found = store.find_accounts("google", "user@gmail.com")
+
+    assert [a.user_id for a in found] == ["alice@example.com", "bob@example.com"]
+
+
+def test_sqlite_store_uses_wal_mode(tmp_path):
+    store = SqliteTokenStore(str(tmp_path / "tokens.db"))
+
+    mode = store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    SqliteTokenStore(path).save_account(make_account())
+
+    reopened = SqliteTokenStore(path)
+
+    assert reopened.get_account("user@example.com", "google") is not None
+
+
+def test_sqlite_store_sees_writes_from_other_workers(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    worker_a = SqliteTokenStore(path)
+    worker_b = SqliteTokenStore(path)
+
+    worker_a.save_account(make_account(access_token="old"))
+    assert worker_a.get_account("user@example.com", "google").access_token == "old"
+
+    worker_b.save_account(make_account(access_token="new"))
+
+    assert worker_a.get_account("user@example.com", "google").access_token == "new"
+
+
+def test_sqlite_store_notifies_subscribers_with_previous(tmp_path):
+    store = SqliteTokenStore(str(tmp_path / "tokens.db"))
+    events = []
+    store.subscribe(lambda previous, account: events.append((previous, account)))
+
+    first = make_account(access_token="first")
+    second = make_account(access_token="second")
+    store.save_account(first)
+    store.save_account(second)
+
+    assert events == [(None, first), (first, second)]
@@ -0,0 +1,246 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from omnibridge.accounts.models import Account
+from omnibridge.accounts.refresh import (
+    OAuthTokenClient,
+    TokenRefreshError,
+    TokenRefresher,
+)
+from omnibridge.accounts.store import InMemoryTokenStore
+
+
+class FakeTokenEndpoint:
+    """Local OAuth token endpoint that counts refresh-token grants."""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.grants: list[dict] = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                form = parse_qs(self.rfile.read(length).decode())
+                endpoint.grants.append(form)
+                time.sleep(endpoint.delay)
+
+                body = json.dumps({
+                    "access_token": f"access-{len(endpoint.grants)}",
+                    "expires_in": 3600,
+                    "token_type": "Bearer",
+                }).encode()
+                self.send_response(endpoint.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/token"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def endpoint():
+    server = FakeTokenEndpoint()
+    yield server
+    server.close()
+
+
+def make_account(expires_in: timedelta, user_id="user@example.com"):
+    return Account(
+        user_id=user_id,
+        provider="google",
+        provider_account_id="user@gmail.com",
+        access_token="stale-token",
+        refresh_token="refresh-token",
+        expires_at=datetime.now(timezone.utc) + expires_in,
+        scopes=["gmail.readonly"],
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def make_refresher(store, endpoint):
+    return TokenRefresher(
+        store,
+        clients={
+            "google": OAuthTokenClient(
+                token_uri=endpoint.url,
+                client_id="client-id",
+                client_secret="client-secret",
+            )
+        },
+        lead_time=timedelta(minutes=5),
+        retry_after=timedelta(seconds=30),
+    )
+
+
+def test_fresh_token_is_not_refreshed(endpoint):
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    account = make_account(timedelta(hours=1))
+    store.save_account(account)
+
+    assert refresher.ensure_fresh(account) is account
+    assert endpoint.grants == []
+
+
+def test_expiring_token_is_refreshed_and_saved(endpoint):
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    account = make_account(timedelta(minutes=1))
+    store.save_account(account)
+
+    refreshed = refresher.ensure_fresh(account)
+
+    assert refreshed.access_token == "access-1"
+    assert store.get_account("user@example.com", "google").access_token == "access-1"
+    assert endpoint.grants[0]["grant_type"] == ["refresh_token"]
+    assert endpoint.grants[0]["refresh_token"] == ["refresh-token"]
+
+
+def test_concurrent_requests_share_one_refresh(endpoint):
+    endpoint.delay = 0.2
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    account = make_account(timedelta(seconds=-10))
+    store.save_account(account)
+
+    tokens = []
+
+    def request():
+        tokens.append(refresher.ensure_fresh(account).access_token)
+
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(endpoint.grants) == 1
+    assert tokens == ["access-1"] * 10
+
+
+def test_accounts_are_queued_by_expiry(endpoint):
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+
+    late = make_account(timedelta(hours=2), user_id="late@example.com")
+    soon = make_account(timedelta(hours=1), user_id="soon@example.com")
+    store.save_account(late)
+    store.save_account(soon)
+
+    assert refresher.next_due() == soon.expires_at - timedelta(minutes=5)
+
+
+def test_run_due_refreshes_only_due_accounts(endpoint):
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+
+    store.save_account(make_account(timedelta(minutes=2), user_id="due@example.com"))
+    store.save_account(make_account(timedelta(hours=1), user_id="later@example.com"))
+
+    assert refresher.run_due() == 1
+    assert store.get_account("due@example.com", "google").access_token == "access-1"
+    assert store.get_account("later@example.com", "google").access_token == "stale-token"
+
+
+def test_failed_background_refresh_is_retried_later(endpoint):
+    endpoint.status = 500
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    store.save_account(make_account(timedelta(minutes=1)))
+
+    assert refresher.run_due() == 0
+
+    retry_at = refresher.next_due()
+    assert retry_at > datetime.now(timezone.utc) + timedelta(seconds=20)
+
+
+def test_rejected_grant_is_not_retried(endpoint):
+    endpoint.status = 400
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    store.save_account(make_account(timedelta(minutes=1)))
+
+    assert refresher.run_due() == 0
+    assert refresher.next_due() is None
+    assert len(endpoint.grants) == 1
+
+
+def test_failed_inline_refresh_keeps_a_still_valid_token(endpoint):
+    endpoint.status = 400
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    account = make_account(timedelta(minutes=1))
+    store.save_account(account)
+
+    assert refresher.ensure_fresh(account) is account
+    # Backs off instead of calling the token endpoint on every request
+    assert refresher.ensure_fresh(account) is account
+    assert len(endpoint.grants) == 1
+
+
+def test_failed_inline_refresh_of_expired_token_raises(endpoint):
+    endpoint.status = 400
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    account = make_account(timedelta(minutes=-1))
+    store.save_account(account)
+
+    with pytest.raises(TokenRefreshError):
+        refresher.ensure_fresh(account)
+
+
+def test_start_schedules_accounts_already_in_the_store(endpoint):
+    store = InMemoryTokenStore()
+    store.save_account(make_account(timedelta(minutes=1)))
+    # A new process: the refresher never saw the account being saved
+    refresher = make_refresher(store, endpoint)
+    assert refresher.next_due() is None
+
+    refresher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not endpoint.grants and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        refresher.stop()
+
+    assert store.get_account("user@example.com", "google").access_token == "access-1"
+
+
+def test_background_thread_refreshes_before_expiry(endpoint):
+    store = InMemoryTokenStore()
+    refresher = make_refresher(store, endpoint)
+    refresher.start()
+
+    try:
+        store.save_account(make_account(timedelta(minutes=4, seconds=59)))
+
+        deadline = time.monotonic() + 5
+        while not endpoint.grants and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        refresher.stop()
+
+    assert store.get_account("user@example.com", "google").access_token == "access-1"
@@ -1,7 +1,9 @@
+import pytest
 from datetime import datetime, timedelta, timezone
 
 from omnibridge.accounts.models import Account
-from omnibridge.accounts.store import InMemoryTokenStore
+from omnibridge.accounts import dependencies
+from omnibridge.accounts.store import InMemoryTokenStore, SqliteTokenStore
 
 
 def make_account(
@@ -34,6 +36,25 @@ def test_store_and_get_account():
     assert fetched.provider == "google"
     assert fetched.provider_account_id == "user@gmail.com"
 
+def test_find_accounts_by_provider_identity():
+    store = InMemoryTokenStore()
+    store.save_account(make_account(user_id="alice@example.com"))
+    store.save_account(make_account(user_id="bob@example.com"))
+    store.save_account(
+        make_account(user_id="carol@example.com", provider_account_id="carol@gmail.com")
+    )
+
+    # Bob relinks a different mailbox
+    store.save_account(
+        make_account(user_id="bob@example.com", provider_account_id="bob@gmail.com")
+    )
+
+    found = store.find_accounts("google", "user@gmail.com")
+
+    assert [a.user_id for a in found] == ["alice@example.com"]
+    assert store.find_accounts("notion", "user@gmail.com") == []
+
+
 def test_get_account_returns_none_if_not_found():
     store = InMemoryTokenStore()
 
@@ -97,3 +118,41 @@ def test_list_accounts_for_user():
     assert providers == {"google", "notion"}
 
 
+def test_list_all_accounts():
+    store = InMemoryTokenStore()
+
+    store.save_account(make_account(provider="google"))
+    store.save_account(make_account(user_id="bob@example.com"))
+
+    assert {a.user_id for a in store.list_all()} == {
+        "user@example.com",
+        "bob@example.com",
+    }
+
+
+def test_save_account_notifies_subscribers():
+    store = InMemoryTokenStore()
+    events = []
+    store.subscribe(lambda previous, account: events.append((previous, account)))
+
+    first = make_account()
+    second = make_account()
+    store.save_account(first)
+    store.save_account(second)
+
+    assert events == [(None, first), (first, second)]
+
+
+def test_token_store_backend_is_selected_by_name(tmp_path, mocker):
+    mocker.patch.dict(
+        dependencies.TOKEN_STORE_BACKENDS,
+        {"sqlite": lambda: SqliteTokenStore(str(tmp_path / "tokens.db"))},
+    )
+
+    assert isinstance(dependencies.create_token_store("memory"), InMemoryTokenStore)
+    assert isinstance(dependencies.create_token_store("sqlite"), SqliteTokenStore)
+
+
+def test_unknown_token_store_backend_is_rejected():
+    with pytest.raises(ValueError):
+        dependencies.create_token_store("carrier-pigeon")
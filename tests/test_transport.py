@@ -0,0 +1,101 @@
+import threading
+
+from fake_gmail import FakeGmailServer
+from test_gmail_connector import make_google_account
+
+from omnibridge.accounts.store import InMemoryTokenStore
+from omnibridge.connectors.gmail import GmailConnector
+from omnibridge.connectors.transport import HttpTransport
+
+
+def test_connectors_share_keep_alive_connections():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account("alice@example.com"))
+    store.save_account(make_google_account("bob@example.com"))
+
+    transport = HttpTransport()
+
+    with FakeGmailServer(message_count=5) as server:
+        first = GmailConnector(store, api_endpoint=server.url, transport=transport)
+        second = GmailConnector(store, api_endpoint=server.url, transport=transport)
+
+        first.fetch("alice@example.com")
+        first.fetch("bob@example.com")
+        second.fetch("alice@example.com")
+
+        stats = transport.stats()[server.url.rstrip("/")]
+
+        # list + batch + incremental history, all over one connection
+        assert len(server.requests) > 3
+        assert server.connections == 1
+        assert stats["requests"] == len(server.requests)
+        assert stats["open"] == 1
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 0
+
+    transport.close()
+
+
+def test_transport_sends_account_token():
+    store = InMemoryTokenStore()
+    store.save_account(make_google_account())
+
+    transport = HttpTransport()
+    seen = []
+
+    with FakeGmailServer(message_count=1) as server:
+        original = transport.request
+
+        def spy(method, url, content=None, headers=None):
+            seen.append(headers["authorization"])
+            return original(method, url, content=content, headers=headers)
+
+        transport.request = spy
+        GmailConnector(store, api_endpoint=server.url, transport=transport).fetch(
+            "user@example.com"
+        )
+
+    assert seen and set(seen) == {"Bearer fake-access-token"}
+    transport.close()
+
+
+def test_transport_caps_connections_per_host():
+    transport = HttpTransport(max_connections=2)
+
+    with FakeGmailServer(message_count=1) as server:
+        url = server.url + "gmail/v1/users/me/profile"
+
+        threads = [
+            threading.Thread(target=transport.request, args=("GET", url))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = transport.stats()[server.url.rstrip("/")]
+
+        assert server.connections <= 2
+        assert stats["requests"] == 10
+        assert stats["open"] <= 2
+
+    transport.close()
+
+
+def test_transport_reopens_pools_after_close():
+    transport = HttpTransport()
+
+    with FakeGmailServer(message_count=1) as server:
+        url = server.url + "gmail/v1/users/me/profile"
+
+        transport.request("GET", url)
+        transport.close()
+        assert transport.stats() == {}
+
+        response = transport.request("GET", url)
+
+        assert response.status_code == 200
+        assert server.connections == 2
+
+    transport.close()